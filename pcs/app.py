@@ -1,52 +1,49 @@
 import getopt
+import importlib
 import os
+import signal
 import sys
 import logging
 
-from pcs import (
-    acl,
-    booth,
-    cluster,
-    config,
-    constraint,
-    host,
-    node,
-    pcsd,
-    prop,
-    qdevice,
-    quorum,
-    resource,
-    settings,
-    status,
-    stonith,
-    usage,
-    utils,
-    alert,
-)
-
-from pcs.cli.common import (
-    capabilities,
-    completion,
-    parse_args,
-)
+from pcs import settings
+from pcs.cli.common import parse_args
 
 
 logging.basicConfig()
 usefile = False
 filename = ""
-def main(argv=None):
-    if completion.has_applicable_environment(os.environ):
-        print(completion.make_suggestions(
-            os.environ,
-            usage.generate_completion_tree_from_usage()
-        ))
-        sys.exit()
 
+# Modules of commands are imported only when their command is run. Importing
+# all of them takes a significant part of the run time of simple commands.
+_COMMAND_MAP = {
+    "resource": ("pcs.resource", "resource_cmd"),
+    "cluster": ("pcs.cluster", "cluster_cmd"),
+    "stonith": ("pcs.stonith", "stonith_cmd"),
+    "property": ("pcs.prop", "property_cmd"),
+    "constraint": ("pcs.constraint", "constraint_cmd"),
+    "acl": ("pcs.acl", "acl_cmd"),
+    "status": ("pcs.status", "status_cmd"),
+    "config": ("pcs.config", "config_cmd"),
+    "pcsd": ("pcs.pcsd", "pcsd_cmd"),
+    "node": ("pcs.node", "node_cmd"),
+    "quorum": ("pcs.quorum", "quorum_cmd"),
+    "qdevice": ("pcs.qdevice", "qdevice_cmd"),
+    "alert": ("pcs.alert", "alert_cmd"),
+    "booth": ("pcs.booth", "booth_cmd"),
+    "host": ("pcs.host", "host_cmd"),
+}
+
+def _get_command(command):
+    module_name, function_name = _COMMAND_MAP[command]
+    return getattr(importlib.import_module(module_name), function_name)
+
+def main(argv=None):
     argv = argv if argv else sys.argv[1:]
-    utils.subprocess_setup()
+    # Restore the default SIGPIPE action, so that pcs exits quietly when its
+    # output is closed (e.g. piped to head). pcs.utils is not imported yet.
+    signal.signal(signal.SIGPIPE, signal.SIG_DFL)
     global filename, usefile
     orig_argv = argv[:]
-    utils.pcs_options = {}
 
     argv = parse_args.upgrade_args(argv)
 
@@ -63,6 +60,8 @@ def main(argv=None):
         new_argv.append(arg)
     argv = new_argv
 
+    # pcs.usage and pcs.utils import most of pcs, so they are only imported
+    # when they are needed
     try:
         pcs_options, dummy_argv = getopt.gnu_getopt(
             parse_args.filter_out_non_option_negative_numbers(argv),
@@ -71,6 +70,7 @@ def main(argv=None):
         )
     except getopt.GetoptError as err:
         print(err)
+        from pcs import usage
         usage.main()
         sys.exit(1)
     argv = parse_args.filter_out_options(argv)
@@ -81,16 +81,19 @@ def main(argv=None):
             full = True
             break
 
+    option_dict = {}
     for o, a in pcs_options:
-        if not o in utils.pcs_options:
-            utils.pcs_options[o] = a
+        if not o in option_dict:
+            option_dict[o] = a
         else:
             # If any options are a list then they've been entered twice which
             # isn't valid
+            from pcs import utils
             utils.err("%s can only be used once" % o)
 
         if o == "-h" or o == "--help":
             if len(argv) == 0:
+                from pcs import usage
                 usage.main()
                 sys.exit()
             else:
@@ -98,13 +101,15 @@ def main(argv=None):
         elif o == "-f":
             usefile = True
             filename = a
-            utils.usefile = usefile
-            utils.filename = filename
         elif o == "--corosync_conf":
             settings.corosync_conf_file = a
+        elif o == "--debug":
+            # the user asked for the debug output, it must not be cut
+            settings.external_process_report_output_limit = None
         elif o == "--version":
             print(settings.pcs_version)
             if full:
+                from pcs.cli.common import capabilities
                 print(" ".join(
                     sorted([
                         feat["id"]
@@ -113,20 +118,22 @@ def main(argv=None):
                 ))
             sys.exit()
         elif o == "--fullhelp":
+            from pcs import usage
             usage.full_usage()
             sys.exit()
         elif o == "--wait":
-            utils.pcs_options[o] = waitsecs
+            option_dict[o] = waitsecs
         elif o == "--request-timeout":
             request_timeout_valid = False
             try:
                 timeout = int(a)
                 if timeout > 0:
-                    utils.pcs_options[o] = timeout
+                    option_dict[o] = timeout
                     request_timeout_valid = True
             except ValueError:
                 pass
             if not request_timeout_valid:
+                from pcs import utils
                 utils.err(
                     (
                         "'{0}' is not a valid --request-timeout value, use "
@@ -135,6 +142,7 @@ def main(argv=None):
                 )
 
     if len(argv) == 0:
+        from pcs import usage
         usage.main()
         sys.exit(1)
 
@@ -146,32 +154,23 @@ def main(argv=None):
 
     command = argv.pop(0)
     if (command == "-h" or command == "help"):
+        from pcs import usage
         usage.main()
         return
-    cmd_map = {
-        "resource": resource.resource_cmd,
-        "cluster": cluster.cluster_cmd,
-        "stonith": stonith.stonith_cmd,
-        "property": prop.property_cmd,
-        "constraint": constraint.constraint_cmd,
-        "acl": acl.acl_cmd,
-        "status": status.status_cmd,
-        "config": config.config_cmd,
-        "pcsd": pcsd.pcsd_cmd,
-        "node": node.node_cmd,
-        "quorum": quorum.quorum_cmd,
-        "qdevice": qdevice.qdevice_cmd,
-        "alert": alert.alert_cmd,
-        "booth": booth.booth_cmd,
-        "host": host.host_cmd,
-    }
-    if command not in cmd_map:
+    if command not in _COMMAND_MAP:
+        from pcs import usage
         usage.main()
         sys.exit(1)
+    command_function = _get_command(command)
+
+    from pcs import utils
+    utils.pcs_options = option_dict
+    utils.usefile = usefile
+    utils.filename = filename
     # root can run everything directly, also help can be displayed,
     # working on a local file also do not need to run under root
     if (os.getuid() == 0) or (argv and argv[0] == "help") or usefile:
-        cmd_map[command](
+        command_function(
             utils.get_library_wrapper(),
             argv,
             utils.get_input_modifiers(),
@@ -232,7 +231,7 @@ def main(argv=None):
                 sys.stderr.write(std_err)
             sys.exit(exitcode)
             return
-    cmd_map[command](
+    command_function(
         utils.get_library_wrapper(),
         argv,
         utils.get_input_modifiers(),
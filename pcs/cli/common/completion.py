@@ -1,3 +1,9 @@
+import json
+import sys
+
+from pcs import settings
+
+
 def has_applicable_environment(environment):
     """
     dict environment - very likely os.environ
@@ -92,3 +98,37 @@ def _get_subcommands(suggestion_tree, previous_subcommand_list):
             return []
         subcommand_tree = subcommand_tree[subcommand]
     return sorted(list(subcommand_tree.keys()))
+
+def load_tree():
+    """
+    Return the suggestion tree stored when pcs was installed, generate it from
+    the usage if it is not stored or it belongs to another version of pcs
+    """
+    try:
+        with open(settings.completion_tree_file) as tree_file:
+            stored = json.load(tree_file)
+        if stored["version"] == settings.pcs_version:
+            return stored["tree"]
+    except (EnvironmentError, ValueError, TypeError, KeyError):
+        pass
+    # The usage is big, it is imported only when it is needed.
+    from pcs import usage
+    return usage.generate_completion_tree_from_usage()
+
+def save_tree(path, suggestion_tree):
+    """
+    Store the suggestion tree so it can be loaded by load_tree
+
+    string path -- file to store the tree to
+    dict suggestion_tree - {'acl': {'role': {'create': ...}}}...
+    """
+    with open(path, "w") as tree_file:
+        json.dump(
+            {"version": settings.pcs_version, "tree": suggestion_tree},
+            tree_file
+        )
+
+if __name__ == "__main__":
+    # run when pcs is being installed to store the tree to the specified file
+    from pcs import usage
+    save_tree(sys.argv[1], usage.generate_completion_tree_from_usage())
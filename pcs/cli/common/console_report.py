@@ -22,6 +22,7 @@ _type_articles = {
     "ACL permission": "an",
 }
 _file_role_translation = {
+    "AGENT_METADATA_CACHE": "agent metadata cache",
     "BOOTH_CONFIG": "Booth configuration",
     "BOOTH_KEY": "Booth key",
     "COROSYNC_AUTHKEY": "Corosync authkey",
@@ -1174,6 +1175,10 @@ CODE_TO_MESSAGE_BUILDER_MAP = {
         )
     ,
 
+    codes.AGENT_METADATA_CACHE_DISABLED:
+        "Agent metadata cache is disabled"
+    ,
+
     codes.UNABLE_TO_GET_AGENT_METADATA: lambda info:
         (
             "Agent '{agent}' is not installed or does not provide valid"
@@ -7,29 +7,6 @@ from pcs.cli.common.reports import (
     LibraryReportProcessorToConsole,
     process_library_reports
 )
-from pcs.lib.commands import (
-    acl,
-    alert,
-    booth,
-    cib_options,
-    cluster,
-    fencing_topology,
-    node,
-    pcsd,
-    qdevice,
-    quorum,
-    remote_node,
-    resource,
-    resource_agent,
-    sbd,
-    stonith,
-    stonith_agent,
-)
-from pcs.lib.commands.constraint import (
-    colocation as constraint_colocation,
-    order as constraint_order,
-    ticket as constraint_ticket
-)
 from pcs.lib.env import LibraryEnvironment
 from pcs.lib.errors import LibraryEnvError
 
@@ -51,6 +28,7 @@ def cli_env_to_lib_env(cli_env):
         known_hosts_getter=cli_env.known_hosts_getter,
         cluster_conf_data=cli_env.cluster_conf_data,
         request_timeout=cli_env.request_timeout,
+        debug=cli_env.debug,
     )
 
 def lib_env_to_cli_env(lib_env, cli_env):
@@ -111,7 +89,10 @@ def get_module(env, middleware_factory, name):
 
 
 def load_module(env, middleware_factory, name):
+    # Library commands are imported only when they are needed, importing all
+    # of them slows down each run of pcs.
     if name == "acl":
+        from pcs.lib.commands import acl
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -135,6 +116,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "alert":
+        from pcs.lib.commands import alert
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -150,6 +132,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "booth":
+        from pcs.lib.commands import booth
         return bind_all(
             env,
             middleware.build(
@@ -178,6 +161,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "cluster":
+        from pcs.lib.commands import cluster
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -192,6 +176,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "remote_node":
+        from pcs.lib.commands import remote_node
         return bind_all(
             env,
             middleware.build(
@@ -207,6 +192,9 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == 'constraint_colocation':
+        from pcs.lib.commands.constraint import (
+            colocation as constraint_colocation,
+        )
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -217,6 +205,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == 'constraint_order':
+        from pcs.lib.commands.constraint import order as constraint_order
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -227,6 +216,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == 'constraint_ticket':
+        from pcs.lib.commands.constraint import ticket as constraint_ticket
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -239,6 +229,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "fencing_topology":
+        from pcs.lib.commands import fencing_topology
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -253,6 +244,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "node":
+        from pcs.lib.commands import node
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -270,6 +262,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "pcsd":
+        from pcs.lib.commands import pcsd
         return bind_all(
             env,
             middleware.build(),
@@ -279,6 +272,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "qdevice":
+        from pcs.lib.commands import qdevice
         return bind_all(
             env,
             middleware.build(),
@@ -302,6 +296,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "quorum":
+        from pcs.lib.commands import quorum
         return bind_all(
             env,
             middleware.build(middleware_factory.corosync_conf_existing),
@@ -319,20 +314,25 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "resource_agent":
+        from pcs.lib.commands import resource_agent
         return bind_all(
             env,
             middleware.build(),
             {
+                "clear_metadata_cache": resource_agent.clear_metadata_cache,
                 "describe_agent": resource_agent.describe_agent,
                 "list_agents": resource_agent.list_agents,
                 "list_agents_for_standard_and_provider":
                     resource_agent.list_agents_for_standard_and_provider,
                 "list_ocf_providers": resource_agent.list_ocf_providers,
                 "list_standards": resource_agent.list_standards,
+                "rebuild_metadata_cache":
+                    resource_agent.rebuild_metadata_cache,
             }
         )
 
     if name == "resource":
+        from pcs.lib.commands import resource
         return bind_all(
             env,
             middleware.build(
@@ -356,6 +356,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "cib_options":
+        from pcs.lib.commands import cib_options
         return bind_all(
             env,
             middleware.build(
@@ -368,6 +369,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "stonith":
+        from pcs.lib.commands import stonith
         return bind_all(
             env,
             middleware.build(
@@ -382,6 +384,7 @@ def load_module(env, middleware_factory, name):
 
 
     if name == "sbd":
+        from pcs.lib.commands import sbd
         return bind_all(
             env,
             middleware.build(),
@@ -401,6 +404,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "stonith_agent":
+        from pcs.lib.commands import stonith_agent
         return bind_all(
             env,
             middleware.build(),
@@ -1,9 +1,15 @@
-from unittest import TestCase
+import json
+import os.path
+import tempfile
+from unittest import mock, TestCase
 
+from pcs import settings, usage
 from pcs.cli.common.completion import (
     _find_suggestions,
     has_applicable_environment,
+    load_tree,
     make_suggestions,
+    save_tree,
     _split_words,
 )
 
@@ -157,3 +163,51 @@ class SplitWordsTest(TestCase):
             EnvironmentError,
             lambda: _split_words("pcs resource op a ", ["3", "8", "2", "1"])
         )
+
+
+class LoadTreeTest(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tree_file = os.path.join(tmp_dir.name, "completion_tree.json")
+        patcher = mock.patch.object(
+            settings, "completion_tree_file", self.tree_file
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @mock.patch("pcs.usage.generate_completion_tree_from_usage")
+    def test_load_stored_tree(self, mock_generate):
+        save_tree(self.tree_file, tree)
+        self.assertEqual(tree, load_tree())
+        mock_generate.assert_not_called()
+
+    @mock.patch(
+        "pcs.usage.generate_completion_tree_from_usage",
+        lambda: {"generated": {}}
+    )
+    def test_generate_when_not_stored(self):
+        self.assertEqual({"generated": {}}, load_tree())
+
+    @mock.patch(
+        "pcs.usage.generate_completion_tree_from_usage",
+        lambda: {"generated": {}}
+    )
+    def test_generate_when_stored_by_other_version(self):
+        with open(self.tree_file, "w") as tree_file:
+            json.dump({"version": "0.0.1", "tree": tree}, tree_file)
+        self.assertEqual({"generated": {}}, load_tree())
+
+    @mock.patch(
+        "pcs.usage.generate_completion_tree_from_usage",
+        lambda: {"generated": {}}
+    )
+    def test_generate_when_stored_tree_invalid(self):
+        with open(self.tree_file, "w") as tree_file:
+            tree_file.write("[not json")
+        self.assertEqual({"generated": {}}, load_tree())
+
+    def test_stored_tree_equals_generated(self):
+        generated_tree = usage.generate_completion_tree_from_usage()
+        save_tree(self.tree_file, generated_tree)
+        self.assertEqual(generated_tree, load_tree())
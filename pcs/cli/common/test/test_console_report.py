@@ -2861,6 +2861,19 @@ class FileIoError(NameBuildTest):
             }
         )
 
+    def test_success_f(self):
+        self.assert_message_from_info(
+            "Unable to clear agent metadata cache '/var/lib/pcsd/agents': "
+                "Failed"
+            ,
+            {
+                "file_role": "AGENT_METADATA_CACHE",
+                "file_path": "/var/lib/pcsd/agents",
+                "reason": "Failed",
+                "operation": "clear",
+            }
+        )
+
 class UsingDefaultWatchdog(NameBuildTest):
     code = codes.USING_DEFAULT_WATCHDOG
     def test_success(self):
@@ -3035,3 +3048,12 @@ class SbdWatchdogTestError(NameBuildTest):
             "Unable to initialize test of the watchdog: some reason",
             reports.sbd_watchdog_test_error("some reason"),
         )
+
+
+class AgentMetadataCacheDisabled(NameBuildTest):
+    code = codes.AGENT_METADATA_CACHE_DISABLED
+    def test_success(self):
+        self.assert_message_from_report(
+            "Agent metadata cache is disabled",
+            reports.agent_metadata_cache_disabled(),
+        )
@@ -1,7 +1,9 @@
 import base64
 import io
 import re
-from collections import namedtuple
+from collections import defaultdict, deque, namedtuple, OrderedDict
+from functools import lru_cache
+from time import monotonic
 from urllib.parse import urlencode
 
 # We should ignore SIGPIPE when using pycurl.NOSIGNAL - see the libcurl tutorial
@@ -121,6 +123,15 @@ class Request(object):
         """
         self._current_dest = next(self._current_dest_iterator)
 
+    def set_dest(self, dest):
+        """
+        Mark the specified host connection as the one used by the request. It
+        is used when several host connections of the request are tried at once.
+
+        Destination dest -- one of the host connections of the request target
+        """
+        self._current_dest = dest
+
     @property
     def url(self):
         """
@@ -251,29 +262,91 @@ class Response(object):
         )
 
 class NodeCommunicatorFactory(object):
-    def __init__(self, communicator_logger, user, groups, request_timeout):
+    def __init__(
+        self, communicator_logger, user, groups, request_timeout, debug=True
+    ):
+        """
+        bool debug -- capture curl debug output of requests, see Communicator
+        """
         self._logger = communicator_logger
         self._user = user
         self._groups = groups
         self._request_timeout = request_timeout
+        self._debug = debug
+
+    def _get_communicator_kwargs(self, request_timeout):
+        return dict(
+            request_timeout=(
+                request_timeout if request_timeout else self._request_timeout
+            ),
+            debug=self._debug,
+            debug_limit=settings.communicator_debug_limit,
+            max_parallel=settings.communicator_max_parallel_requests,
+            max_parallel_per_host=(
+                settings.communicator_max_parallel_requests_per_host
+            ),
+        )
 
     def get_communicator(self, request_timeout=None):
         return self.get_simple_communicator(request_timeout=request_timeout)
 
     def get_simple_communicator(self, request_timeout=None):
-        timeout = request_timeout if request_timeout else self._request_timeout
         return Communicator(
-            self._logger, self._user, self._groups, request_timeout=timeout
+            self._logger, self._user, self._groups,
+            **self._get_communicator_kwargs(request_timeout)
         )
 
     def get_multiaddress_communicator(self, request_timeout=None):
-        timeout = request_timeout if request_timeout else self._request_timeout
         return MultiaddressCommunicator(
-            self._logger, self._user, self._groups, request_timeout=timeout
-
+            self._logger, self._user, self._groups,
+            address_race_delay=settings.communicator_address_race_delay,
+            **self._get_communicator_kwargs(request_timeout)
         )
 
 
+class _FairQueue(object):
+    """
+    Queue of curl easy handles waiting to be started. Handles are grouped by
+    their target host and the hosts take turns, so many requests to one host
+    do not delay requests to other hosts.
+    """
+    def __init__(self):
+        self._host_queues = OrderedDict()
+
+    def __len__(self):
+        return sum(len(queue) for queue in self._host_queues.values())
+
+    def put(self, host, handle):
+        self._host_queues.setdefault(host, deque()).append(handle)
+
+    def pop(self, can_start_host):
+        """
+        Return the first handle of the first host allowed by can_start_host
+        and move the host to the end of the line. Return None if there is no
+        such handle.
+
+        callable can_start_host -- takes a host, returns True if a request
+            to the host can be started
+        """
+        for host, queue in self._host_queues.items():
+            if can_start_host(host):
+                handle = queue.popleft()
+                del self._host_queues[host]
+                if queue:
+                    self._host_queues[host] = queue
+                return handle
+        return None
+
+    def remove(self, host, handle):
+        queue = self._host_queues.get(host)
+        if queue is not None and handle in queue:
+            queue.remove(handle)
+            if not queue:
+                del self._host_queues[host]
+            return True
+        return False
+
+
 class Communicator(object):
     """
     This class provides simple interface for making parallel requests.
@@ -282,7 +355,26 @@ class Communicator(object):
     """
     curl_multi_select_timeout_default = 0.8 # in seconds
 
-    def __init__(self, communicator_logger, user, groups, request_timeout=None):
+    def __init__(
+        self, communicator_logger, user, groups, request_timeout=None,
+        debug=True, debug_limit=None, max_parallel=None,
+        max_parallel_per_host=None,
+    ):
+        """
+        CommunicatorLoggerInterface communicator_logger -- logs requests and
+            responses
+        string user -- CIB user
+        list groups -- CIB user groups
+        int request_timeout -- request timeout in seconds
+        bool debug -- capture curl debug output of requests, Response.debug is
+            empty if not set
+        int debug_limit -- capture at most this number of bytes of the debug
+            output of each request, None means no limit
+        int max_parallel -- max number of requests running at once, other
+            requests wait in a queue, None means no limit
+        int max_parallel_per_host -- max number of requests running at once
+            against one host, None means no limit
+        """
         self._logger = communicator_logger
         self._auth_cookies = _get_auth_cookies(user, groups)
         self._request_timeout = (
@@ -290,12 +382,25 @@ class Communicator(object):
             if request_timeout is not None
             else settings.default_request_timeout
         )
+        self._debug = debug
+        self._debug_limit = debug_limit
+        self._max_parallel = max_parallel
+        self._max_parallel_per_host = max_parallel_per_host
         self._multi_handle = pycurl.CurlMulti()
+        _set_optional_opts(self._multi_handle, [
+            (
+                pycurl.M_MAXCONNECTS,
+                settings.communicator_max_cached_connections
+            ),
+        ])
         self._is_running = False
         # This is used just for storing references of curl easy handles.
         # We need to have references for all the handles, so they don't be
         # cleaned up by the garbage collector.
         self._easy_handle_list = []
+        self._waiting_queue = _FairQueue()
+        self._running_handles = set()
+        self._running_per_host = defaultdict(int)
 
     def add_requests(self, request_list):
         """
@@ -309,13 +414,9 @@ class Communicator(object):
         list request_list -- Request objects to add to the queue
         """
         for request in request_list:
-            handle = _create_request_handle(
-                request, self._auth_cookies, self._request_timeout,
-            )
-            self._easy_handle_list.append(handle)
-            self._multi_handle.add_handle(handle)
-            if self._is_running:
-                self._logger.log_request_start(request)
+            self._enqueue_handle(self._create_handle(request))
+        if self._is_running:
+            self._start_waiting_handles()
 
     def start_loop(self):
         """
@@ -343,27 +444,96 @@ class Communicator(object):
         if self._is_running:
             raise AssertionError("Method start_loop already running")
         self._is_running = True
-        for handle in self._easy_handle_list:
-            self._logger.log_request_start(handle.request_obj)
 
-        finished_count = 0
-        while finished_count < len(self._easy_handle_list):
+        while self._running_handles or self._waiting_queue:
+            # Slots may have been freed by cancelled handles, fill them so the
+            # loop never waits with requests in the queue and nothing running.
+            self._start_waiting_handles()
+            self._on_loop_iteration()
             self.__multi_perform()
             self.__wait_for_multi_handle()
-            response_list = self.__get_all_ready_responses()
-            for response in response_list:
+            for response in self.__get_all_ready_responses():
+                if response.handle not in self._running_handles:
+                    # the handle has been cancelled while processing previous
+                    # responses
+                    continue
                 # free up memory for next usage of this Communicator instance
-                self._multi_handle.remove_handle(response.handle)
+                self._stop_handle(response.handle)
                 self._logger.log_response(response)
+                self._start_waiting_handles()
                 yield response
                 # if something was added to the queue in the meantime, run it
                 # immediately, so we don't need to wait until all responses will
                 # be processed
                 self.__multi_perform()
-            finished_count += len(response_list)
         self._easy_handle_list = []
         self._is_running = False
 
+    def _create_handle(self, request):
+        return _create_request_handle(
+            request, self._auth_cookies, self._request_timeout,
+            debug=self._debug, debug_limit=self._debug_limit,
+        )
+
+    def _enqueue_handle(self, handle):
+        self._easy_handle_list.append(handle)
+        self._waiting_queue.put(handle.request_obj.host_label, handle)
+
+    def _dequeue_handle(self, handle):
+        """
+        Remove a handle which has not been started yet from the queue. Return
+        True if the handle was waiting in the queue.
+        """
+        return self._waiting_queue.remove(
+            handle.request_obj.host_label, handle
+        )
+
+    def _start_waiting_handles(self):
+        while (
+            self._max_parallel is None
+            or
+            len(self._running_handles) < self._max_parallel
+        ):
+            handle = self._waiting_queue.pop(self.__host_has_free_slot)
+            if handle is None:
+                return
+            self._running_handles.add(handle)
+            self._running_per_host[handle.request_obj.host_label] += 1
+            self._multi_handle.add_handle(handle)
+            self._logger.log_request_start(handle.request_obj)
+            self._on_handle_started(handle)
+
+    def _stop_handle(self, handle):
+        self._multi_handle.remove_handle(handle)
+        self._running_handles.discard(handle)
+        self._running_per_host[handle.request_obj.host_label] -= 1
+
+    def _on_handle_started(self, handle):
+        """
+        Called when a handle has been added to the multi handle
+        """
+        pass
+
+    def _on_loop_iteration(self):
+        """
+        Called before each wait for responses in the main loop
+        """
+        pass
+
+    def _get_wakeup_timeout(self):
+        """
+        Return max time in seconds the main loop may wait for responses, None
+        means no limit
+        """
+        return None
+
+    def __host_has_free_slot(self, host):
+        return (
+            self._max_parallel_per_host is None
+            or
+            self._running_per_host[host] < self._max_parallel_per_host
+        )
+
     def __get_all_ready_responses(self):
         response_list = []
         repeat = True
@@ -402,9 +572,18 @@ class Communicator(object):
                 # curl don't have timeout set, so we can use our default
                 else self.curl_multi_select_timeout_default
             )
+            wakeup_timeout = self._get_wakeup_timeout()
+            if wakeup_timeout is not None:
+                if wakeup_timeout <= 0:
+                    return
+                timeout = min(timeout, wakeup_timeout)
             # when value returned from select is -1, it timed out, so we can
             # wait
-            need_to_wait = (self._multi_handle.select(timeout) == -1)
+            need_to_wait = (
+                self._multi_handle.select(timeout) == -1
+                and
+                wakeup_timeout is None
+            )
 
 
 class MultiaddressCommunicator(Communicator):
@@ -413,21 +592,110 @@ class MultiaddressCommunicator(Communicator):
     it takes advantage of multiple hosts in RequestTarget. So if it is not
     possible to connect to target using first hostname, it will use next one
     until connection will be successful or there is no host left.
+
+    If address_race_delay is set, the next address of a request is tried when
+    the previous one does not respond in address_race_delay seconds, without
+    waiting for the previous attempt to fail. The first successful attempt
+    is used and the other ones are cancelled.
     """
+    def __init__(self, *args, address_race_delay=None, **kwargs):
+        """
+        float address_race_delay -- start an attempt via the next address of
+            a request after this number of seconds, None means an address is
+            tried only after the previous one failed
+        """
+        super(MultiaddressCommunicator, self).__init__(*args, **kwargs)
+        self._address_race_delay = address_race_delay
+        # request -> list of its handles which have not finished yet
+        self._attempts = defaultdict(list)
+        # list of (time, request) when the next address should be tried
+        self._race_schedule = []
+
     def start_loop(self):
         for response in super(MultiaddressCommunicator, self).start_loop():
+            request = response.request
+            self._finish_attempt(response.handle)
             if response.was_connected:
+                self._cancel_attempts(request)
+                request.set_dest(response.handle.request_dest)
                 yield response
                 continue
-            try:
-                previous_dest = response.request.dest
-                response.request.next_dest()
-                self._logger.log_retry(response, previous_dest)
-                self.add_requests([response.request])
-            except StopIteration:
+            if self._attempts.get(request):
+                # Another address of the request is still being tried.
+                self._try_next_dest(response)
+                continue
+            if not self._try_next_dest(response):
                 self._logger.log_no_more_addresses(response)
                 yield response
 
+    def _create_handle(self, request):
+        handle = super(MultiaddressCommunicator, self)._create_handle(request)
+        handle.request_dest = request.dest
+        self._attempts[request].append(handle)
+        return handle
+
+    def _on_handle_started(self, handle):
+        if self._address_race_delay is not None:
+            self._race_schedule.append(
+                (monotonic() + self._address_race_delay, handle.request_obj)
+            )
+
+    def _on_loop_iteration(self):
+        now = monotonic()
+        due_list = [
+            request for time, request in self._race_schedule if time <= now
+        ]
+        self._race_schedule = [
+            (time, request) for time, request in self._race_schedule
+            if time > now
+        ]
+        for request in due_list:
+            if not self._attempts.get(request):
+                # the request has already finished
+                continue
+            try:
+                request.next_dest()
+            except StopIteration:
+                continue
+            self.add_requests([request])
+
+    def _get_wakeup_timeout(self):
+        if not self._race_schedule:
+            return None
+        return min(time for time, _ in self._race_schedule) - monotonic()
+
+    def _try_next_dest(self, response):
+        """
+        Retry the request of the response via its next address. Return False
+        if there is no address left.
+        """
+        try:
+            previous_dest = response.handle.request_dest
+            response.request.next_dest()
+            self._logger.log_retry(response, previous_dest)
+            self.add_requests([response.request])
+            return True
+        except StopIteration:
+            return False
+
+    def _finish_attempt(self, handle):
+        attempt_list = self._attempts.get(handle.request_obj, [])
+        if handle in attempt_list:
+            attempt_list.remove(handle)
+        if not attempt_list:
+            self._attempts.pop(handle.request_obj, None)
+
+    def _cancel_attempts(self, request):
+        for handle in self._attempts.pop(request, []):
+            if not self._dequeue_handle(handle):
+                self._stop_handle(handle)
+        self._race_schedule = [
+            (time, scheduled_request)
+            for time, scheduled_request in self._race_schedule
+            if scheduled_request is not request
+        ]
+        self._start_waiting_handles()
+
 
 class CommunicatorLoggerInterface(object):
     def log_request_start(self, request):
@@ -465,30 +733,78 @@ def _get_auth_cookies(user, group_list):
     return cookies
 
 
-def _create_request_handle(request, cookies, timeout):
+def _set_optional_opts(handle, opt_list):
+    """
+    Set options which may not be supported by the installed libcurl
+
+    pycurl.Curl|pycurl.CurlMulti handle -- handle to set the options to
+    list opt_list -- list of tuples (option, value)
+    """
+    for opt, value in opt_list:
+        try:
+            handle.setopt(opt, value)
+        except pycurl.error:
+            pass
+
+
+@lru_cache()
+def _get_curl_share():
+    """
+    Return a curl share handle common for all communicators in the process.
+
+    Easy handles using it share a DNS cache, TLS sessions and, if supported by
+    libcurl, a cache of open connections. Requests to a host which has been
+    already contacted by any communicator in the process therefore reuse the
+    connection or at least resume the TLS session instead of a full handshake.
+    """
+    share = pycurl.CurlShare()
+    share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_DNS)
+    share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_SSL_SESSION)
+    _set_optional_opts(share, [(pycurl.SH_SHARE, pycurl.LOCK_DATA_CONNECT)])
+    return share
+
+
+_DEBUG_PREFIXES = {
+    pycurl.DEBUG_TEXT: b"* ",
+    pycurl.DEBUG_HEADER_IN: b"< ",
+    pycurl.DEBUG_HEADER_OUT: b"> ",
+    pycurl.DEBUG_DATA_IN: b"<< ",
+    pycurl.DEBUG_DATA_OUT: b">> ",
+}
+
+
+def _create_request_handle(
+    request, cookies, timeout, debug=True, debug_limit=None
+):
     """
     Returns Curl object (easy handle) which is set up witc specified parameters.
 
     Request request -- request specification
     dict cookies -- cookies to add to request
     int timeot -- request timeout
+    bool debug -- capture curl debug output to the debug buffer of the handle
+    int debug_limit -- max number of captured debug bytes, None means no limit
     """
     # it is not possible to take this callback out of this function, because of
     # curl API
     def __debug_callback(data_type, debug_data):
-        prefixes = {
-            pycurl.DEBUG_TEXT: b"* ",
-            pycurl.DEBUG_HEADER_IN: b"< ",
-            pycurl.DEBUG_HEADER_OUT: b"> ",
-            pycurl.DEBUG_DATA_IN: b"<< ",
-            pycurl.DEBUG_DATA_OUT: b">> ",
-        }
-        if data_type in prefixes:
-            debug_output.write(prefixes[data_type])
-            debug_output.write(debug_data)
-            if not debug_data.endswith(b"\n"):
-                debug_output.write(b"\n")
+        nonlocal debug_truncated
+        if data_type not in _DEBUG_PREFIXES:
+            return
+        if debug_limit is not None:
+            remaining = debug_limit - debug_output.tell()
+            if remaining <= 0:
+                if not debug_truncated:
+                    debug_truncated = True
+                    debug_output.write(b"\n* Debug output truncated\n")
+                return
+            debug_data = debug_data[:remaining]
+        debug_output.write(_DEBUG_PREFIXES[data_type])
+        debug_output.write(debug_data)
+        if not debug_data.endswith(b"\n"):
+            debug_output.write(b"\n")
 
+    debug_truncated = False
     output = io.BytesIO()
     debug_output = io.BytesIO()
     cookies.update(request.cookies)
@@ -497,12 +813,19 @@ def _create_request_handle(request, cookies, timeout):
     handle.setopt(pycurl.TIMEOUT, timeout)
     handle.setopt(pycurl.URL, request.url.encode("utf-8"))
     handle.setopt(pycurl.WRITEFUNCTION, output.write)
-    handle.setopt(pycurl.VERBOSE, 1)
-    handle.setopt(pycurl.DEBUGFUNCTION, __debug_callback)
+    if debug:
+        handle.setopt(pycurl.VERBOSE, 1)
+        handle.setopt(pycurl.DEBUGFUNCTION, __debug_callback)
     handle.setopt(pycurl.SSL_VERIFYHOST, 0)
     handle.setopt(pycurl.SSL_VERIFYPEER, 0)
     handle.setopt(pycurl.NOSIGNAL, 1) # required for multi-threading
     handle.setopt(pycurl.HTTPHEADER, ["Expect: "])
+    handle.setopt(pycurl.SHARE, _get_curl_share())
+    handle.setopt(pycurl.TCP_KEEPALIVE, 1)
+    _set_optional_opts(handle, [
+        (pycurl.MAXCONNECTS, settings.communicator_max_cached_connections),
+        (pycurl.MAXAGE_CONN, settings.communicator_connection_max_idle),
+    ])
     if cookies:
         handle.setopt(
             pycurl.COOKIE, _dict_to_cookies(cookies).encode("utf-8")
@@ -18,6 +18,12 @@ required_constants = {
     "DEBUG_SSL_DATA_IN": 5,
     "DEBUG_SSL_DATA_OUT": 6,
     "DEBUG_END": 7,
+    # connection reuse, see
+    # https://curl.haxx.se/libcurl/c/curl_share_setopt.html
+    "LOCK_DATA_CONNECT": 5,
+    "TCP_KEEPALIVE": 213,
+    "MAXAGE_CONN": 288,
+    "M_MAXCONNECTS": 6,
 }
 
 __current_module = sys.modules[__name__]
@@ -27,6 +27,7 @@ SKIP_ACTION_ON_NODES_ERRORS = "SKIP_ACTION_ON_NODES_ERRORS"
 SKIP_UNREADABLE_CONFIG = "SKIP_UNREADABLE_CONFIG"
 SKIP_WATCHDOG_VALIDATION = "SKIP_WATCHDOG_VALIDATION"
 
+AGENT_METADATA_CACHE_DISABLED = "AGENT_METADATA_CACHE_DISABLED"
 AGENT_NAME_GUESS_FOUND_MORE_THAN_ONE = "AGENT_NAME_GUESS_FOUND_MORE_THAN_ONE"
 AGENT_NAME_GUESS_FOUND_NONE = "AGENT_NAME_GUESS_FOUND_NONE"
 AGENT_NAME_GUESSED = "AGENT_NAME_GUESSED"
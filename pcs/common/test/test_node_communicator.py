@@ -336,6 +336,70 @@ class CreateRequestHandleTest(TestCase):
         self.assertEqual("", handle.output_buffer.getvalue().decode("utf-8"))
         self.assertEqual("", handle.debug_buffer.getvalue().decode("utf-8"))
 
+    def test_debug_disabled(self, mock_curl):
+        mock_curl.return_value = MockCurl(
+            None, b"output", [(pycurl.DEBUG_TEXT, b"debug")]
+        )
+        request = lib.Request(
+            lib.RequestTarget("label"), lib.RequestData("action")
+        )
+        handle = lib._create_request_handle(request, {}, 10, debug=False)
+        self.assertNotIn(pycurl.VERBOSE, handle.opts)
+        self.assertNotIn(pycurl.DEBUGFUNCTION, handle.opts)
+        handle.perform()
+        self.assertEqual(
+            "output", handle.output_buffer.getvalue().decode("utf-8")
+        )
+        self.assertEqual("", handle.debug_buffer.getvalue().decode("utf-8"))
+
+    def test_debug_limit(self, mock_curl):
+        mock_curl.return_value = MockCurl(
+            None, b"output", [
+                (pycurl.DEBUG_TEXT, b"debug"),
+                (pycurl.DEBUG_DATA_IN, b"0123456789"),
+                (pycurl.DEBUG_DATA_IN, b"more data"),
+                (pycurl.DEBUG_TEXT, b"end"),
+            ]
+        )
+        request = lib.Request(
+            lib.RequestTarget("label"), lib.RequestData("action")
+        )
+        handle = lib._create_request_handle(request, {}, 10, debug_limit=13)
+        handle.perform()
+        self.assertEqual(
+            "* debug\n<< 01234\n\n* Debug output truncated\n",
+            handle.debug_buffer.getvalue().decode("utf-8")
+        )
+
+    def test_connection_reuse(self, mock_curl):
+        mock_curl.side_effect = lambda: MockCurl(None)
+        request = lib.Request(
+            lib.RequestTarget("label"), lib.RequestData("action")
+        )
+        handle1 = lib._create_request_handle(request, {}, 10)
+        handle2 = lib._create_request_handle(request, {}, 10)
+        self.assertIsNot(handle1, handle2)
+        self.assertIs(handle1.opts[pycurl.SHARE], handle2.opts[pycurl.SHARE])
+        expected_opts = {
+            pycurl.TCP_KEEPALIVE: 1,
+            pycurl.MAXCONNECTS: settings.communicator_max_cached_connections,
+            pycurl.MAXAGE_CONN: settings.communicator_connection_max_idle,
+        }
+        self.assertLessEqual(
+            set(expected_opts.items()), set(handle1.opts.items())
+        )
+
+
+class SetOptionalOptsTest(TestCase):
+    def test_skip_unsupported_option(self):
+        handle = mock.Mock(spec_set=["setopt"])
+        handle.setopt.side_effect = [pycurl.error("unsupported"), None]
+        lib._set_optional_opts(handle, [("opt1", 1), ("opt2", 2)])
+        self.assertEqual(
+            handle.setopt.mock_calls,
+            [mock.call("opt1", 1), mock.call("opt2", 2)]
+        )
+
 
 def fixture_request(host_id=1, action="action"):
     return lib.Request(
@@ -374,7 +438,8 @@ class CommunicatorSimpleTest(CommunicatorBaseTest):
         self.assertIs(handle, response.handle)
         self.assertIs(request, response.request)
         mock_create_handle.assert_called_once_with(
-            request, {}, settings.default_request_timeout
+            request, {}, settings.default_request_timeout,
+            debug=True, debug_limit=None,
         )
         return response
 
@@ -411,8 +476,8 @@ class CommunicatorMultiTest(CommunicatorBaseTest):
     )
     def test_call_start_loop_multiple_times(self, _,  mock_create_handle):
         com = self.get_communicator()
-        mock_create_handle.side_effect = lambda request, _, __: MockCurl(
-            request=request
+        mock_create_handle.side_effect = (
+            lambda request, _, __, **kwargs: MockCurl(request=request)
         )
         com.add_requests([fixture_request(i) for i in range(2)])
         next(com.start_loop())
@@ -505,7 +570,7 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
             expected_response_list.append(response)
             return response
 
-        def _mock_create_request_handle(request, _, __):
+        def _mock_create_request_handle(request, _, __, **kwargs):
             counter["counter"] += 1
             return(
                 MockCurl(request=request)
@@ -538,7 +603,10 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
         self.assertEqual(3, mock_create_handle.call_count)
         self.assertEqual(3, len(expected_response_list))
         mock_create_handle.assert_has_calls([
-            mock.call(request, {}, settings.default_request_timeout)
+            mock.call(
+                request, {}, settings.default_request_timeout,
+                debug=True, debug_limit=None,
+            )
             for _ in range(3)
         ])
         logger_calls = (
@@ -569,8 +637,10 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
 
         mock_con_failure.side_effect = _con_failure
         com = self.get_multiaddress_communicator()
-        mock_create_handle.side_effect = lambda request, _, __: MockCurl(
-            error=(pycurl.E_SEND_ERROR, "reason"), request=request,
+        mock_create_handle.side_effect = (
+            lambda request, _, __, **kwargs: MockCurl(
+                error=(pycurl.E_SEND_ERROR, "reason"), request=request,
+            )
         )
         request = lib.Request(
             lib.RequestTarget(
@@ -592,7 +662,10 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
         mock_con_successful.assert_not_called()
         self.assertEqual(4, len(expected_response_list))
         mock_create_handle.assert_has_calls([
-            mock.call(request, {}, settings.default_request_timeout)
+            mock.call(
+                request, {}, settings.default_request_timeout,
+                debug=True, debug_limit=None,
+            )
             for _ in range(3)
         ])
         logger_calls = (
@@ -616,3 +689,234 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
         )
         self.assertEqual(logger_calls, self.mock_com_log.mock_calls)
         com._multi_handle.assert_no_handle_left()
+
+
+@mock.patch("pcs.common.node_communicator._create_request_handle")
+class CommunicatorParallelLimitTest(CommunicatorBaseTest):
+    def run_requests(self, com, mock_create_handle, request_list):
+        mock_create_handle.side_effect = (
+            lambda request, _, __, **kwargs: MockCurl(request=request)
+        )
+        com.add_requests(request_list)
+        return list(com.start_loop())
+
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMulti([1, 1, 1])
+    )
+    def test_max_parallel(self, _, mock_create_handle):
+        com = lib.Communicator(
+            self.mock_com_log, None, None, max_parallel=2
+        )
+        request_list = [fixture_request(i) for i in range(3)]
+        response_list = self.run_requests(
+            com, mock_create_handle, request_list
+        )
+        self.assertEqual(request_list, [r.request for r in response_list])
+        self.assertEqual(
+            [
+                mock.call.log_request_start(request_list[0]),
+                mock.call.log_request_start(request_list[1]),
+                mock.call.log_response(response_list[0]),
+                mock.call.log_request_start(request_list[2]),
+                mock.call.log_response(response_list[1]),
+                mock.call.log_response(response_list[2]),
+            ],
+            self.mock_com_log.mock_calls
+        )
+        com._multi_handle.assert_no_handle_left()
+
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMulti([1, 1, 1])
+    )
+    def test_max_parallel_per_host(self, _, mock_create_handle):
+        com = lib.Communicator(
+            self.mock_com_log, None, None, max_parallel_per_host=1
+        )
+        request_list = [
+            fixture_request(0, "action1"),
+            fixture_request(0, "action2"),
+            fixture_request(1, "action1"),
+        ]
+        response_list = self.run_requests(
+            com, mock_create_handle, request_list
+        )
+        self.assertEqual(
+            [request_list[0], request_list[2], request_list[1]],
+            [r.request for r in response_list]
+        )
+        self.assertEqual(
+            [
+                mock.call.log_request_start(request_list[0]),
+                mock.call.log_request_start(request_list[2]),
+                mock.call.log_response(response_list[0]),
+                mock.call.log_request_start(request_list[1]),
+                mock.call.log_response(response_list[1]),
+                mock.call.log_response(response_list[2]),
+            ],
+            self.mock_com_log.mock_calls
+        )
+        com._multi_handle.assert_no_handle_left()
+
+
+class FairQueueTest(TestCase):
+    def test_hosts_take_turns(self):
+        queue = lib._FairQueue()
+        for host, handle in [
+            ("host0", "a"), ("host0", "b"), ("host0", "c"), ("host1", "d"),
+            ("host2", "e"), ("host1", "f"),
+        ]:
+            queue.put(host, handle)
+        self.assertEqual(6, len(queue))
+        self.assertEqual(
+            ["a", "d", "e", "b", "f", "c"],
+            [queue.pop(lambda host: True) for _ in range(6)]
+        )
+        self.assertEqual(0, len(queue))
+        self.assertIsNone(queue.pop(lambda host: True))
+
+    def test_skip_host(self):
+        queue = lib._FairQueue()
+        queue.put("host0", "a")
+        queue.put("host1", "b")
+        self.assertEqual("b", queue.pop(lambda host: host != "host0"))
+        self.assertIsNone(queue.pop(lambda host: host != "host0"))
+        self.assertEqual(1, len(queue))
+
+    def test_remove(self):
+        queue = lib._FairQueue()
+        queue.put("host0", "a")
+        queue.put("host0", "b")
+        self.assertTrue(queue.remove("host0", "a"))
+        self.assertFalse(queue.remove("host0", "a"))
+        self.assertFalse(queue.remove("host1", "b"))
+        self.assertEqual("b", queue.pop(lambda host: True))
+
+
+@mock.patch.object(
+    lib.Response,
+    "connection_failure",
+    side_effect=lambda handle, errno, msg: lib.Response(
+        handle, False, errno, msg
+    ),
+)
+@mock.patch.object(
+    lib.Response,
+    "connection_successful",
+    side_effect=lambda handle: lib.Response(handle, True),
+)
+@mock.patch("pcs.common.node_communicator._create_request_handle")
+class MultiaddressCommunicatorRaceTest(CommunicatorBaseTest):
+    def setUp(self):
+        super().setUp()
+        self.request = lib.Request(
+            lib.RequestTarget(
+                "label", dest_list=_addr_list_to_dest(["host0", "host1"])
+            ),
+            lib.RequestData("action")
+        )
+
+    def get_communicator(self):
+        return lib.MultiaddressCommunicator(
+            self.mock_com_log, None, None, address_race_delay=0
+        )
+
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMulti([1])
+    )
+    def test_first_wins(self, _, mock_create_handle, __, ___):
+        mock_create_handle.side_effect = (
+            lambda request, _, __, **kwargs: MockCurl(request=request)
+        )
+        com = self.get_communicator()
+        com.add_requests([self.request])
+        response_list = list(com.start_loop())
+        self.assertEqual(1, len(response_list))
+        response = response_list[0]
+        self.assertTrue(response.was_connected)
+        self.assertEqual(Destination("host0", None), self.request.dest)
+        self.assertEqual(2, mock_create_handle.call_count)
+        self.assertEqual(
+            [
+                mock.call.log_request_start(self.request),
+                mock.call.log_request_start(self.request),
+                mock.call.log_response(response),
+            ],
+            self.mock_com_log.mock_calls
+        )
+        com._multi_handle.assert_no_handle_left()
+
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMulti([1, 1])
+    )
+    def test_first_fails(self, _, mock_create_handle, __, ___):
+        handle_list = [
+            MockCurl(error=(pycurl.E_SEND_ERROR, "reason")),
+            MockCurl(),
+        ]
+        def _create_handle(request, _, __, **kwargs):
+            handle = handle_list.pop(0)
+            handle.request_obj = request
+            return handle
+        mock_create_handle.side_effect = _create_handle
+        com = self.get_communicator()
+        com.add_requests([self.request])
+        response_list = list(com.start_loop())
+        self.assertEqual(1, len(response_list))
+        response = response_list[0]
+        self.assertTrue(response.was_connected)
+        self.assertEqual(Destination("host1", None), self.request.dest)
+        self.assertEqual(
+            [
+                mock.call.log_request_start(self.request),
+                mock.call.log_request_start(self.request),
+                mock.call.log_response(mock.ANY),
+                mock.call.log_response(response),
+            ],
+            self.mock_com_log.mock_calls
+        )
+        com._multi_handle.assert_no_handle_left()
+
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMulti([0, 1, 1, 1])
+    )
+    def test_cancelled_slot_refilled(self, _, mock_create_handle, __, ___):
+        mock_create_handle.side_effect = (
+            lambda request, _, __, **kwargs: MockCurl(request=request)
+        )
+        com = lib.MultiaddressCommunicator(
+            self.mock_com_log, None, None, address_race_delay=0,
+            max_parallel=2
+        )
+        waiting_list = [fixture_request(1), fixture_request(2)]
+        def _log_request_start(request):
+            # more requests than max_parallel are waiting while both
+            # addresses of the first request are being tried
+            if self.mock_com_log.log_request_start.call_count == 2:
+                com.add_requests(waiting_list)
+        self.mock_com_log.log_request_start.side_effect = _log_request_start
+        com.add_requests([self.request])
+        response_list = list(com.start_loop())
+        self.assertEqual(
+            [self.request] + waiting_list,
+            [response.request for response in response_list]
+        )
+        self.assertTrue(all(r.was_connected for r in response_list))
+        self.assertEqual(
+            [
+                mock.call.log_request_start(self.request),
+                mock.call.log_request_start(self.request),
+                mock.call.log_response(response_list[0]),
+                mock.call.log_request_start(waiting_list[0]),
+                # the slot of the cancelled attempt is used right away
+                mock.call.log_request_start(waiting_list[1]),
+                mock.call.log_response(response_list[1]),
+                mock.call.log_response(response_list[2]),
+            ],
+            self.mock_com_log.mock_calls
+        )
+        com._multi_handle.assert_no_handle_left()
@@ -1,4 +1,4 @@
-from collections import namedtuple
+from collections import deque, namedtuple
 from lxml import etree
 import threading
 
@@ -13,6 +13,39 @@ def run_parallel(worker, data_list):
     for thread in thread_list:
         thread.join()
 
+def iter_parallel(worker, arg_list, max_workers):
+    """
+    Run worker for each item of arg_list in threads, yield its return values
+    in the order of arg_list as soon as they are available. An exception raised
+    by the worker is raised when its return value is to be yielded.
+
+    callable worker -- takes one item of arg_list
+    iterable arg_list -- arguments for the worker
+    int max_workers -- maximal number of workers running at the same time
+    """
+    if max_workers < 2:
+        for arg in arg_list:
+            yield worker(arg)
+        return
+    # concurrent.futures imports multiprocessing, which takes a while, so it
+    # is imported only when needed
+    from concurrent.futures import ThreadPoolExecutor
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = deque()
+    try:
+        for arg in arg_list:
+            pending.append(executor.submit(worker, arg))
+            # Do not queue many more items than can be processed, results are
+            # not collected if a caller stops iterating.
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
 def format_environment_error(e):
     if e.filename:
         return "{0}: '{1}'".format(e.strerror, e.filename)
@@ -27,9 +60,10 @@ def xml_fromstring(xml):
     # we get an exception in python3:
     # ValueError: Unicode strings with encoding declaration are not supported.
     # Please use bytes input or XML fragments without declaration.
-    # So we encode the string to bytes.
+    # So we encode the string to bytes. Bytes, e.g. a raw output of a pacemaker
+    # tool, are parsed as they are.
     return etree.fromstring(
-        xml.encode("utf-8"),
+        xml.encode("utf-8") if isinstance(xml, str) else xml,
         #it raises on a huge xml without the flag huge_tree=True
         #see https://bugzilla.redhat.com/show_bug.cgi?id=1506864
         etree.XMLParser(huge_tree=True)
@@ -1,10 +1,12 @@
 from collections import namedtuple
 from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from ctypes import byref, cast, CDLL, CFUNCTYPE, POINTER, sizeof, Structure
 from ctypes import c_char, c_char_p, c_int, c_uint, c_void_p
 from ctypes.util import find_library
 import grp
 import pwd
+from time import time as now
 
 from tornado.gen import coroutine
 
@@ -97,6 +99,53 @@ def get_user_groups_sync(username):
 
 UserAuthInfo = namedtuple("UserAuthInfo", "name groups is_authorized")
 
+class UserGroupsCache:
+    """
+    Keeps groups of authorized users for a short time so the groups are not
+    loaded from NSS for each request of a logged in user.
+    """
+    def __init__(self, ttl):
+        self.__ttl = ttl
+        self.__entries = {}
+
+    def get(self, username):
+        if username not in self.__entries:
+            return None
+        expires, groups = self.__entries[username]
+        if expires < now():
+            del self.__entries[username]
+            return None
+        return groups
+
+    def set(self, username, groups):
+        if self.__ttl > 0:
+            current_time = now()
+            self.__drop_expired(current_time)
+            self.__entries[username] = (current_time + self.__ttl, groups)
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __drop_expired(self, current_time):
+        # Entries of users who never come back would stay in the cache for
+        # the whole life of the daemon otherwise.
+        expired = [
+            username
+            for username, (expires, _) in self.__entries.items()
+            if expires < current_time
+        ]
+        for username in expired:
+            del self.__entries[username]
+
+    def invalidate(self, username):
+        self.__entries.pop(username, None)
+
+    def update(self, user: UserAuthInfo):
+        if user.is_authorized:
+            self.set(user.name, user.groups)
+        else:
+            self.invalidate(user.name)
+
 class LoginLogger:
     def unable_determine_groups(self, username, e):
         log.pcsd.info(
@@ -162,6 +211,82 @@ def authorize_user_sync(username, password) -> UserAuthInfo:
 
     return check_user_groups_sync(username, LoginLogger())
 
+def _noop():
+    pass
+
+class ProcessPool:
+    """
+    Shared bounded pool of processes running pam and nss calls which can block
+    or leak. All the processes are replaced by new ones after the pool has run
+    max_tasks tasks.
+    """
+    def __init__(self, size, max_tasks=0):
+        """
+        int size -- number of processes
+        int max_tasks -- replace processes after this number of tasks, 0 means
+            never
+        """
+        self.__size = size
+        self.__max_tasks = max_tasks
+        self.__executor = None
+        self.__submitted_tasks = 0
+
+    def start(self):
+        # ProcessPoolExecutor forks all its processes on the first submit.
+        self.submit(_noop)
+
+    def submit(self, sync_fn, *args):
+        if (
+            self.__executor is None
+            or
+            (self.__max_tasks and self.__submitted_tasks >= self.__max_tasks)
+        ):
+            self.__replace_executor()
+        try:
+            future = self.__executor.submit(sync_fn, *args)
+        except BrokenProcessPool:
+            log.pcsd.warning("Authentication process failed, replacing")
+            self.__replace_executor()
+            future = self.__executor.submit(sync_fn, *args)
+        self.__submitted_tasks += 1
+        return future
+
+    def shutdown(self):
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False)
+            self.__executor = None
+
+    def __replace_executor(self):
+        # Tasks already submitted to the old executor are finished before its
+        # processes exit.
+        self.shutdown()
+        self.__executor = ProcessPoolExecutor(max_workers=self.__size)
+        self.__submitted_tasks = 0
+
+class _AuthState:
+    #pylint: disable=too-few-public-methods
+    process_pool = ProcessPool(size=1)
+    user_groups_cache = UserGroupsCache(ttl=0)
+
+def configure(
+    process_pool_size, process_max_tasks=0, user_groups_cache_ttl=0
+):
+    """
+    Set up shared resources used for authentication. It should be called
+    before tornado starts other processes, so the pool processes do not inherit
+    their pipes.
+
+    int process_pool_size -- number of authentication processes
+    int process_max_tasks -- replace authentication processes after this
+        number of tasks, 0 means never
+    int user_groups_cache_ttl -- how long (in seconds) groups of an authorized
+        user are cached, 0 disables the cache
+    """
+    _AuthState.process_pool.shutdown()
+    _AuthState.process_pool = ProcessPool(process_pool_size, process_max_tasks)
+    _AuthState.process_pool.start()
+    _AuthState.user_groups_cache = UserGroupsCache(user_groups_cache_ttl)
+
 # TODO async/await version - how to do it?
 # When async/await is used then the problem is:
 # "TypeError: object Future can't be used in 'await' expression" is raised even
@@ -169,17 +294,20 @@ def authorize_user_sync(username, password) -> UserAuthInfo:
 # http://www.tornadoweb.org/en/stable/guide/coroutines.html#python-3-5-async-and-await
 @coroutine
 def run_in_process(sync_fn, *args):
-    pool = ProcessPoolExecutor(max_workers=1)
-    result = yield pool.submit(sync_fn, *args)
-    pool.shutdown()
+    result = yield _AuthState.process_pool.submit(sync_fn, *args)
     return result
 
 @coroutine
 def authorize_user(username, password) -> UserAuthInfo:
     user = yield run_in_process(authorize_user_sync, username, password)
+    _AuthState.user_groups_cache.update(user)
     return user
 
 @coroutine
 def check_user_groups(username) -> UserAuthInfo:
+    groups = _AuthState.user_groups_cache.get(username)
+    if groups is not None:
+        return UserAuthInfo(username, groups, is_authorized=True)
     user = yield run_in_process(check_user_groups_sync, username, PlainLogger())
+    _AuthState.user_groups_cache.update(user)
     return user
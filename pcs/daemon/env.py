@@ -32,6 +32,9 @@ PCSD_CMDLINE_ENTRY = "PCSD_CMDLINE_ENTRY"
 PCSD_STATIC_FILES_DIR = "PCSD_STATIC_FILES_DIR"
 HTTPS_PROXY = "HTTPS_PROXY"
 NO_PROXY = "NO_PROXY"
+PCSD_RUBY_WORKERS = "PCSD_RUBY_WORKERS"
+PCSD_RUBY_WORKER_MAX_REQUESTS = "PCSD_RUBY_WORKER_MAX_REQUESTS"
+PCSD_AUTH_WORKERS = "PCSD_AUTH_WORKERS"
 
 Env = namedtuple("Env", [
     PCSD_PORT,
@@ -48,6 +51,9 @@ Env = namedtuple("Env", [
     HTTPS_PROXY,
     NO_PROXY,
     PCSD_DEV,
+    PCSD_RUBY_WORKERS,
+    PCSD_RUBY_WORKER_MAX_REQUESTS,
+    PCSD_AUTH_WORKERS,
     "has_errors",
 ])
 
@@ -68,6 +74,9 @@ def prepare_env(environ, logger=None):
         loader.https_proxy(),
         loader.no_proxy(),
         loader.pcsd_dev(),
+        loader.ruby_workers(),
+        loader.ruby_worker_max_requests(),
+        loader.auth_workers(),
         loader.has_errors(),
     )
     if logger:
@@ -162,6 +171,24 @@ class EnvLoader:
             )
             return session_lifetime
 
+    def ruby_workers(self):
+        return self.__non_negative_integer(
+            PCSD_RUBY_WORKERS,
+            settings.pcsd_ruby_workers,
+        )
+
+    def ruby_worker_max_requests(self):
+        return self.__non_negative_integer(
+            PCSD_RUBY_WORKER_MAX_REQUESTS,
+            settings.pcsd_ruby_worker_max_requests,
+        )
+
+    def auth_workers(self):
+        return self.__positive_integer(
+            PCSD_AUTH_WORKERS,
+            settings.pcsd_auth_workers,
+        )
+
     def pcsd_debug(self):
         return self.__has_true_in_environ(PCSD_DEBUG)
 
@@ -207,5 +234,26 @@ class EnvLoader:
             self.errors.append(f"{description} '{in_pcsd_path}' does not exist")
         return in_pcsd_path
 
+    def __non_negative_integer(self, environ_key, default):
+        return self.__integer(
+            environ_key, default, 0, "a non-negative integer"
+        )
+
+    def __positive_integer(self, environ_key, default):
+        return self.__integer(environ_key, default, 1, "a positive integer")
+
+    def __integer(self, environ_key, default, minimum, description):
+        value = self.environ.get(environ_key, default)
+        try:
+            integer_value = int(value)
+            if integer_value >= minimum:
+                return integer_value
+        except ValueError:
+            pass
+        self.errors.append(
+            f"Invalid {environ_key} value '{value}' (it must be {description})"
+        )
+        return value
+
     def __has_true_in_environ(self, environ_key):
         return self.environ.get(environ_key, "").lower() == "true"
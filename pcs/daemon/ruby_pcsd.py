@@ -6,6 +6,9 @@ from collections import namedtuple
 from time import time as now
 
 from tornado.gen import Task, multi, convert_yielded
+from tornado.ioloop import IOLoop
+from tornado.iostream import StreamClosedError
+from tornado.locks import Semaphore
 from tornado.web import HTTPError
 from tornado.httputil import split_host_and_port, HTTPServerRequest
 from tornado.process import Subprocess
@@ -16,6 +19,7 @@ from pcs.daemon import log
 SINATRA_GUI = "sinatra_gui"
 SINATRA_REMOTE = "sinatra_remote"
 SYNC_CONFIGS = "sync_configs"
+PING = "ping"
 
 DEFAULT_SYNC_CONFIG_DELAY = 5
 RUBY_LOG_LEVEL_MAP = {
@@ -63,12 +67,179 @@ def log_communication(request_json, stdout, stderr):
     log.pcsd.debug(f"Response stdout from ruby pcsd wrapper: '{stdout}'")
     log.pcsd.debug(f"Response stderr from ruby pcsd wrapper: '{stderr}'")
 
+class RubyWorkerError(Exception):
+    pass
+
+class RubyWorker:
+    """
+    Long running ruby process which processes requests one by one. A request
+    is one line with a json on stdin, a response is one line with a json on
+    stdout.
+    """
+    def __init__(self, cmdline, env):
+        self.__process = Subprocess(
+            cmdline + ["--worker"],
+            stdin=Subprocess.STREAM,
+            stdout=Subprocess.STREAM,
+            stderr=Subprocess.STREAM,
+            env=env
+        )
+        self.__stderr_chunks = []
+        self.handled_requests = 0
+        IOLoop.current().spawn_callback(self.__collect_stderr)
+
+    @property
+    def pid(self):
+        return self.__process.pid
+
+    def is_alive(self):
+        return self.__process.proc.poll() is None
+
+    async def communicate(self, request_json):
+        """
+        Send a request to the worker and return its stdout and stderr
+
+        string request_json -- request, it must not contain a newline
+        """
+        try:
+            await self.__process.stdin.write(str.encode(request_json) + b"\n")
+            stdout = await self.__process.stdout.read_until(b"\n")
+        except StreamClosedError as e:
+            self.stop()
+            raise RubyWorkerError(
+                f"Ruby worker (pid {self.pid}) stopped unexpectedly: {e}"
+            )
+        stderr = b"".join(self.__stderr_chunks)
+        self.__stderr_chunks.clear()
+        return stdout, stderr
+
+    async def ping(self):
+        try:
+            stdout, dummy_stderr = await self.communicate(
+                json.dumps({"type": PING})
+            )
+            return json.loads(stdout).get("pong", False)
+        except (RubyWorkerError, json.JSONDecodeError):
+            return False
+
+    def stop(self):
+        # The worker finishes when its stdin is closed. Processes forked from
+        # pcsd may hold a copy of the pipe, so the worker is terminated as well.
+        self.__process.stdin.close()
+        if self.is_alive():
+            self.__process.proc.terminate()
+
+    async def __collect_stderr(self):
+        try:
+            while True:
+                self.__stderr_chunks.append(
+                    await self.__process.stderr.read_bytes(4096, partial=True)
+                )
+        except StreamClosedError:
+            pass
+
+class RubyWorkerPool:
+    """
+    Bounded set of ruby workers. Workers are started on demand. Requests wait
+    until a worker is free when all workers are busy.
+    """
+    def __init__(self, create_worker, size, max_requests=0):
+        """
+        callable create_worker -- starts a new RubyWorker
+        int size -- max number of running workers
+        int max_requests -- replace a worker after this number of requests,
+            0 means never
+        """
+        self.__create_worker = create_worker
+        self.__max_requests = max_requests
+        self.__size = size
+        self.__slots = Semaphore(size)
+        self.__busy_slots = 0
+        self.__idle_workers = []
+
+    def is_busy(self):
+        """
+        Return True if all workers are busy, so a request would have to wait
+        """
+        return self.__busy_slots >= self.__size
+
+    async def send(self, request_json):
+        async with self.__slots:
+            self.__busy_slots += 1
+            try:
+                return await self.__send(request_json)
+            finally:
+                self.__busy_slots -= 1
+
+    async def __send(self, request_json):
+        worker = self.__get_worker()
+        result = await worker.communicate(request_json)
+        worker.handled_requests += 1
+        if (
+            self.__max_requests
+            and
+            worker.handled_requests >= self.__max_requests
+        ):
+            log.pcsd.debug(
+                "Ruby worker (pid %s) reached %s requests, replacing",
+                worker.pid,
+                worker.handled_requests
+            )
+            worker.stop()
+        else:
+            self.__idle_workers.append(worker)
+        return result
+
+    async def check_health(self):
+        """
+        Remove idle workers which do not respond
+        """
+        for dummy_index in range(len(self.__idle_workers)):
+            async with self.__slots:
+                if not self.__idle_workers:
+                    return
+                self.__busy_slots += 1
+                try:
+                    await self.__check_worker(self.__idle_workers.pop(0))
+                finally:
+                    self.__busy_slots -= 1
+
+    async def __check_worker(self, worker):
+        if await worker.ping():
+            self.__idle_workers.append(worker)
+        else:
+            log.pcsd.warning(
+                "Ruby worker (pid %s) does not respond, removing", worker.pid
+            )
+            worker.stop()
+
+    def stop(self):
+        for worker in self.__idle_workers:
+            worker.stop()
+        self.__idle_workers = []
+
+    def __get_worker(self):
+        while self.__idle_workers:
+            worker = self.__idle_workers.pop()
+            if worker.is_alive():
+                return worker
+            log.pcsd.warning(
+                "Ruby worker (pid %s) is not running, replacing", worker.pid
+            )
+        return self.__create_worker()
+
 class Wrapper:
     # pylint: disable=too-many-instance-attributes
     def __init__(
         self, gem_home, pcsd_cmdline_entry, debug=False, ruby_executable="ruby",
-        https_proxy=None, no_proxy=None
+        https_proxy=None, no_proxy=None, workers=0, worker_max_requests=0
     ):
+        """
+        int workers -- number of long running ruby processes, 0 means a new
+            process is started for each request
+        int worker_max_requests -- replace a worker after this number of
+            requests, 0 means never
+        """
         self.__gem_home = gem_home
         self.__pcsd_cmdline_entry = pcsd_cmdline_entry
         self.__pcsd_dir = os.path.dirname(pcsd_cmdline_entry)
@@ -76,6 +247,13 @@ class Wrapper:
         self.__debug = debug
         self.__https_proxy = https_proxy
         self.__no_proxy = no_proxy
+        self.__worker_pool = None
+        if workers > 0:
+            self.__worker_pool = RubyWorkerPool(
+                lambda: RubyWorker(self.__get_cmdline(), self.__get_env()),
+                workers,
+                worker_max_requests,
+            )
 
     def get_sinatra_request(self, request: HTTPServerRequest):
         host, port = split_host_and_port(request.host)
@@ -101,7 +279,7 @@ class Wrapper:
             "rack.input": request.body.decode("utf8"),
         }}
 
-    async def send_to_ruby(self, request_json):
+    def __get_env(self):
         env = {
             "GEM_HOME": self.__gem_home,
             "PCSD_DEBUG": "true" if self.__debug else "false"
@@ -110,17 +288,47 @@ class Wrapper:
             env["NO_PROXY"] = self.__no_proxy
         if self.__https_proxy is not None:
             env["HTTPS_PROXY"] = self.__https_proxy
+        return env
+
+    def __get_cmdline(self):
+        return [
+            self.__ruby_executable, "-I",
+            self.__pcsd_dir,
+            self.__pcsd_cmdline_entry
+        ]
+
+    async def send_to_ruby(self, request_json, wait_for_worker=True):
+        """
+        bool wait_for_worker -- if all workers are busy, wait for a free one
+            instead of starting a new ruby process for the request
+        """
+        if (
+            self.__worker_pool is None
+            or
+            (not wait_for_worker and self.__worker_pool.is_busy())
+        ):
+            return await self.__send_to_new_ruby_process(request_json)
+        try:
+            return await self.__worker_pool.send(request_json)
+        except RubyWorkerError as e:
+            log.pcsd.error(str(e))
+            raise HTTPError(500)
+
+    async def check_workers(self):
+        if self.__worker_pool is not None:
+            await self.__worker_pool.check_health()
+
+    def stop_workers(self):
+        if self.__worker_pool is not None:
+            self.__worker_pool.stop()
 
+    async def __send_to_new_ruby_process(self, request_json):
         pcsd_ruby = Subprocess(
-            [
-                self.__ruby_executable, "-I",
-                self.__pcsd_dir,
-                self.__pcsd_cmdline_entry
-            ],
+            self.__get_cmdline(),
             stdin=Subprocess.STREAM,
             stdout=Subprocess.STREAM,
             stderr=Subprocess.STREAM,
-            env=env
+            env=self.__get_env()
         )
         await Task(pcsd_ruby.stdin.write, str.encode(request_json))
         pcsd_ruby.stdin.close()
@@ -129,11 +337,13 @@ class Wrapper:
             Task(pcsd_ruby.stderr.read_until_close),
         ])
 
-    async def run_ruby(self, request_type, request=None):
+    async def run_ruby(self, request_type, request=None, wait_for_worker=True):
         request = request or {}
         request.update({"type": request_type})
         request_json = json.dumps(request)
-        stdout, stderr = await self.send_to_ruby(request_json)
+        stdout, stderr = await self.send_to_ruby(
+            request_json, wait_for_worker=wait_for_worker
+        )
         try:
             response = json.loads(stdout)
         except json.JSONDecodeError as e:
@@ -145,7 +355,13 @@ class Wrapper:
         else:
             if self.__debug:
                 log_communication(request_json, stdout, stderr)
-            process_response_logs(response["logs"])
+            process_response_logs(response.get("logs", []))
+            if "error" in response:
+                self.__log_bad_response(
+                    f"Ruby pcsd wrapper failed: '{response['error']}'",
+                    request_json, stdout, stderr
+                )
+                raise HTTPError(500)
             return response
 
     async def request_gui(
@@ -169,9 +385,14 @@ class Wrapper:
         return SinatraResult.from_response(response)
 
     async def request_remote(self, request: HTTPServerRequest) -> SinatraResult:
+        # Ruby handlers processing a request may send remote requests to the
+        # local pcsd and wait for them. Remote requests do not wait for
+        # a worker, otherwise they would wait forever if all workers were
+        # busy waiting for them.
         response = await convert_yielded(self.run_ruby(
             SINATRA_REMOTE,
-            self.get_sinatra_request(request)
+            self.get_sinatra_request(request),
+            wait_for_worker=False,
         ))
         return SinatraResult.from_response(response)
 
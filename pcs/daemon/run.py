@@ -8,13 +8,25 @@ from tornado.web import Application
 
 from pcs import settings
 from pcs.common.system import is_systemd
-from pcs.daemon import log, systemd, session, ruby_pcsd, app_remote, app_gui,ssl
+from pcs.daemon import (
+    app_gui,
+    app_remote,
+    auth,
+    log,
+    ruby_pcsd,
+    session,
+    ssl,
+    systemd,
+)
 from pcs.daemon.env import prepare_env
 from pcs.daemon.http_server import HttpsServerManage
 
+RUBY_WORKERS_CHECK_INTERVAL = 60
+
 class SignalInfo:
     #pylint: disable=too-few-public-methods
     server_manage = None
+    ruby_pcsd_wrapper = None
     ioloop_started = False
 
 def handle_signal(incomming_signal, frame):
@@ -22,6 +34,8 @@ def handle_signal(incomming_signal, frame):
     log.pcsd.warning('Caught signal: %s, shutting down', incomming_signal)
     if SignalInfo.server_manage:
         SignalInfo.server_manage.stop()
+    if SignalInfo.ruby_pcsd_wrapper:
+        SignalInfo.ruby_pcsd_wrapper.stop_workers()
     if SignalInfo.ioloop_started:
         IOLoop.current().stop()
     raise SystemExit(0)
@@ -38,6 +52,15 @@ def config_sync(
         IOLoop.current().call_at(next_run_time, config_synchronization)
     return config_synchronization
 
+def ruby_workers_check(ruby_pcsd_wrapper: ruby_pcsd.Wrapper):
+    async def check_ruby_workers():
+        await ruby_pcsd_wrapper.check_workers()
+        IOLoop.current().call_later(
+            RUBY_WORKERS_CHECK_INTERVAL,
+            check_ruby_workers
+        )
+    return check_ruby_workers
+
 def configure_app(
     session_storage: session.Storage,
     ruby_pcsd_wrapper: ruby_pcsd.Wrapper,
@@ -83,6 +106,14 @@ def main():
     if env.PCSD_DEBUG:
         log.enable_debug()
 
+    # Authentication processes are forked before ruby workers are started so
+    # they do not inherit pipes to the ruby workers.
+    auth.configure(
+        env.PCSD_AUTH_WORKERS,
+        process_max_tasks=settings.pcsd_auth_worker_max_tasks,
+        user_groups_cache_ttl=settings.pcsd_user_groups_cache_ttl,
+    )
+
     sync_config_lock = Lock()
     ruby_pcsd_wrapper = ruby_pcsd.Wrapper(
         gem_home=env.GEM_HOME,
@@ -91,7 +122,10 @@ def main():
         ruby_executable=settings.ruby_executable,
         https_proxy=env.HTTPS_PROXY,
         no_proxy=env.NO_PROXY,
+        workers=env.PCSD_RUBY_WORKERS,
+        worker_max_requests=env.PCSD_RUBY_WORKER_MAX_REQUESTS,
     )
+    SignalInfo.ruby_pcsd_wrapper = ruby_pcsd_wrapper
     make_app = configure_app(
         session.Storage(env.PCSD_SESSION_LIFETIME),
         ruby_pcsd_wrapper,
@@ -131,4 +165,8 @@ def main():
     if is_systemd() and env.NOTIFY_SOCKET:
         ioloop.add_callback(systemd.notify, env.NOTIFY_SOCKET)
     ioloop.add_callback(config_sync(sync_config_lock, ruby_pcsd_wrapper))
+    ioloop.call_later(
+        RUBY_WORKERS_CHECK_INTERVAL,
+        ruby_workers_check(ruby_pcsd_wrapper)
+    )
     ioloop.start()
@@ -1,5 +1,8 @@
 from unittest import TestCase
 import logging
+import os
+
+from tornado.concurrent import Future
 
 from pcs.daemon import auth
 from pcs.test.tools.misc import create_setup_patch_mixin
@@ -37,3 +40,89 @@ class AuthorizeUserSync(TestCase, create_setup_patch_mixin(auth)):
         user_auth_info = auth.authorize_user_sync(USER, PASSWORD)
         self.assertEqual(user_auth_info.name, USER)
         self.assertFalse(user_auth_info.is_authorized)
+
+class UserGroupsCache(TestCase, create_setup_patch_mixin(auth)):
+    def setUp(self):
+        self.now = self.setup_patch("now", return_value=100)
+        self.cache = auth.UserGroupsCache(ttl=10)
+
+    def test_return_groups_until_expired(self):
+        self.cache.set(USER, ("haclient",))
+        self.now.return_value = 110
+        self.assertEqual(self.cache.get(USER), ("haclient",))
+        self.now.return_value = 111
+        self.assertIsNone(self.cache.get(USER))
+
+    def test_store_authorized_user(self):
+        self.cache.update(auth.UserAuthInfo(USER, ("haclient",), True))
+        self.assertEqual(self.cache.get(USER), ("haclient",))
+
+    def test_invalidate_on_rejected_user(self):
+        self.cache.set(USER, ("haclient",))
+        self.cache.update(auth.UserAuthInfo(USER, [], False))
+        self.assertIsNone(self.cache.get(USER))
+
+    def test_zero_ttl_disables_cache(self):
+        cache = auth.UserGroupsCache(ttl=0)
+        cache.set(USER, ("haclient",))
+        self.assertIsNone(cache.get(USER))
+
+    def test_drop_expired_entries_on_set(self):
+        self.cache.set("user1", ("haclient",))
+        self.cache.set("user2", ("haclient",))
+        self.now.return_value = 111
+        self.cache.set(USER, ("haclient",))
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.get(USER), ("haclient",))
+
+class ProcessPool(TestCase):
+    def setUp(self):
+        self.pool = auth.ProcessPool(size=1, max_tasks=2)
+        self.addCleanup(self.pool.shutdown)
+
+    def run_getpid(self):
+        return self.pool.submit(os.getpid).result()
+
+    def test_reuse_process(self):
+        self.assertEqual(self.run_getpid(), self.run_getpid())
+
+    def test_replace_process_after_max_tasks(self):
+        first = self.run_getpid()
+        self.run_getpid()
+        self.assertNotEqual(self.run_getpid(), first)
+
+    def test_unlimited_tasks(self):
+        pool = auth.ProcessPool(size=1)
+        self.addCleanup(pool.shutdown)
+        pid_set = {pool.submit(os.getpid).result() for dummy in range(3)}
+        self.assertEqual(len(pid_set), 1)
+        self.assertNotEqual(pid_set, {os.getpid()})
+
+class CheckUserGroups(TestCase, create_setup_patch_mixin(auth)):
+    def setUp(self):
+        self.run_in_process = self.setup_patch("run_in_process")
+        self.setup_patch(
+            "_AuthState.user_groups_cache",
+            auth.UserGroupsCache(ttl=10)
+        )
+
+    def set_run_result(self, user):
+        future = Future()
+        future.set_result(user)
+        self.run_in_process.return_value = future
+
+    def test_groups_loaded_once(self):
+        user = auth.UserAuthInfo(USER, ("haclient",), True)
+        self.set_run_result(user)
+        first = auth.check_user_groups(USER).result()
+        second = auth.check_user_groups(USER).result()
+        self.assertEqual(first, user)
+        self.assertEqual(second, user)
+        self.run_in_process.assert_called_once()
+
+    def test_groups_of_unauthorized_user_not_cached(self):
+        user = auth.UserAuthInfo(USER, ("users",), False)
+        self.set_run_result(user)
+        auth.check_user_groups(USER).result()
+        auth.check_user_groups(USER).result()
+        self.assertEqual(self.run_in_process.call_count, 2)
@@ -46,6 +46,10 @@ class Prepare(TestCase, create_setup_patch_mixin(env)):
             env.HTTPS_PROXY: None,
             env.NO_PROXY: None,
             env.PCSD_DEV: False,
+            env.PCSD_RUBY_WORKERS: settings.pcsd_ruby_workers,
+            env.PCSD_RUBY_WORKER_MAX_REQUESTS:
+                settings.pcsd_ruby_worker_max_requests,
+            env.PCSD_AUTH_WORKERS: settings.pcsd_auth_workers,
             "has_errors": False,
         }
         if specific_env_values is None:
@@ -79,6 +83,9 @@ class Prepare(TestCase, create_setup_patch_mixin(env)):
             env.HTTPS_PROXY: "proxy1",
             env.NO_PROXY: "host",
             env.PCSD_DEV: "true",
+            env.PCSD_RUBY_WORKERS: "2",
+            env.PCSD_RUBY_WORKER_MAX_REQUESTS: "0",
+            env.PCSD_AUTH_WORKERS: "3",
         }
         self.assert_environ_produces_modified_pcsd_env(
             environ=environ,
@@ -101,9 +108,41 @@ class Prepare(TestCase, create_setup_patch_mixin(env)):
                 env.HTTPS_PROXY: environ[env.HTTPS_PROXY],
                 env.NO_PROXY: environ[env.NO_PROXY],
                 env.PCSD_DEV: True,
+                env.PCSD_RUBY_WORKERS: 2,
+                env.PCSD_RUBY_WORKER_MAX_REQUESTS: 0,
+                env.PCSD_AUTH_WORKERS: 3,
             },
         )
 
+    def test_error_on_invalid_ruby_workers(self):
+        environ = {
+            env.PCSD_RUBY_WORKERS: "-1",
+            env.PCSD_RUBY_WORKER_MAX_REQUESTS: "many",
+        }
+        self.assert_environ_produces_modified_pcsd_env(
+            environ,
+            specific_env_values={**environ, "has_errors": True},
+            errors=[
+                "Invalid PCSD_RUBY_WORKERS value '-1'"
+                    " (it must be a non-negative integer)"
+                ,
+                "Invalid PCSD_RUBY_WORKER_MAX_REQUESTS value 'many'"
+                    " (it must be a non-negative integer)"
+                ,
+            ]
+        )
+
+    def test_error_on_invalid_auth_workers(self):
+        environ = {env.PCSD_AUTH_WORKERS: "0"}
+        self.assert_environ_produces_modified_pcsd_env(
+            environ,
+            specific_env_values={**environ, "has_errors": True},
+            errors=[
+                "Invalid PCSD_AUTH_WORKERS value '0'"
+                    " (it must be a positive integer)"
+            ]
+        )
+
     def test_error_on_noninteger_session_lifetime(self):
         environ = {env.PCSD_SESSION_LIFETIME: "invalid"}
         self.assert_environ_produces_modified_pcsd_env(
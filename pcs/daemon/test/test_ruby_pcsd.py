@@ -4,7 +4,9 @@ from base64 import b64encode
 from unittest import TestCase, mock
 from urllib.parse import urlencode
 
+from tornado.gen import convert_yielded, sleep
 from tornado.httputil import HTTPServerRequest
+from tornado.locks import Event
 from tornado.testing import AsyncTestCase, gen_test
 from tornado.web import HTTPError
 
@@ -74,8 +76,9 @@ class RunRuby(AsyncTestCase):
         patcher.start()
         super().setUp()
 
-    async def send_to_ruby(self, request_json):
+    async def send_to_ruby(self, request_json, wait_for_worker=True):
         self.assertEqual(json.loads(request_json), self.request)
+        self.wait_for_worker = wait_for_worker
         return self.stdout, self.stderr
 
     def create_request(self, type=ruby_pcsd.SYNC_CONFIGS):
@@ -108,6 +111,12 @@ class RunRuby(AsyncTestCase):
         result = yield self.wrapper.sync_configs()
         self.assertEqual(result, next)
 
+    @gen_test
+    def test_error_reported_by_ruby(self):
+        self.set_run_result({"error": "Unknown type: 'sync_configs'"})
+        with self.assertRaises(HTTPError):
+            yield self.wrapper.run_ruby(ruby_pcsd.SYNC_CONFIGS)
+
     @patch_ruby_pcsd("now", return_value=0)
     @gen_test
     def test_sync_config_shorcut_fail(self, now):
@@ -131,6 +140,7 @@ class RunRuby(AsyncTestCase):
         }
         result = yield self.wrapper.request_remote(http_request)
         self.assert_sinatra_result(result, headers, status, body)
+        self.assertFalse(self.wait_for_worker)
 
     @gen_test
     def test_request_gui(self):
@@ -164,6 +174,177 @@ class RunRuby(AsyncTestCase):
             is_authenticated=is_authenticated,
         )
         self.assert_sinatra_result(result, headers, status, body)
+        self.assertTrue(self.wait_for_worker)
+
+class FakeWorker:
+    def __init__(self, name, alive=True, responding=True):
+        self.name = name
+        self.pid = name
+        self.alive = alive
+        self.responding = responding
+        self.handled_requests = 0
+        self.stopped = False
+        self.requests = []
+        self.release = None
+
+    def is_alive(self):
+        return self.alive
+
+    async def communicate(self, request_json):
+        self.requests.append(request_json)
+        await sleep(0)
+        if self.release is not None:
+            await self.release.wait()
+        if not self.responding:
+            raise ruby_pcsd.RubyWorkerError("not responding")
+        return str.encode(self.name), b""
+
+    async def ping(self):
+        return self.responding
+
+    def stop(self):
+        self.stopped = True
+
+class RubyWorkerPool(AsyncTestCase):
+    def setUp(self):
+        self.workers = []
+        super().setUp()
+
+    def create_worker(self):
+        worker = FakeWorker(f"worker{len(self.workers)}")
+        self.workers.append(worker)
+        return worker
+
+    def create_pool(self, size=2, max_requests=0):
+        return ruby_pcsd.RubyWorkerPool(self.create_worker, size, max_requests)
+
+    @gen_test
+    def test_reuse_idle_worker(self):
+        pool = self.create_pool()
+        first = yield pool.send("request1")
+        second = yield pool.send("request2")
+        self.assertEqual((first, second), ((b"worker0", b""),) * 2)
+        self.assertEqual(len(self.workers), 1)
+        self.assertEqual(self.workers[0].requests, ["request1", "request2"])
+
+    @gen_test
+    def test_replace_worker_after_max_requests(self):
+        pool = self.create_pool(max_requests=2)
+        for request in ["request1", "request2", "request3"]:
+            yield pool.send(request)
+        self.assertEqual(len(self.workers), 2)
+        self.assertTrue(self.workers[0].stopped)
+        self.assertEqual(self.workers[0].requests, ["request1", "request2"])
+        self.assertEqual(self.workers[1].requests, ["request3"])
+
+    @gen_test
+    def test_replace_dead_worker(self):
+        pool = self.create_pool()
+        yield pool.send("request1")
+        self.workers[0].alive = False
+        result = yield pool.send("request2")
+        self.assertEqual(result, (b"worker1", b""))
+
+    @gen_test
+    def test_running_workers_are_bounded(self):
+        pool = self.create_pool(size=2)
+        yield [pool.send(f"request{i}") for i in range(6)]
+        self.assertEqual(len(self.workers), 2)
+
+    @gen_test
+    def test_failed_worker_is_not_reused(self):
+        pool = self.create_pool()
+        yield pool.send("request1")
+        self.workers[0].responding = False
+        with self.assertRaises(ruby_pcsd.RubyWorkerError):
+            yield pool.send("request2")
+        result = yield pool.send("request3")
+        self.assertEqual(result, (b"worker1", b""))
+
+    @gen_test
+    def test_health_check_removes_unresponsive_workers(self):
+        pool = self.create_pool()
+        yield [pool.send("request1"), pool.send("request2")]
+        self.workers[0].responding = False
+        yield pool.check_health()
+        self.assertTrue(self.workers[0].stopped)
+        self.assertFalse(self.workers[1].stopped)
+        result = yield pool.send("request3")
+        self.assertEqual(result, (b"worker1", b""))
+
+    @gen_test
+    def test_is_busy(self):
+        release = Event()
+        def create_worker():
+            worker = self.create_worker()
+            worker.release = release
+            return worker
+        pool = ruby_pcsd.RubyWorkerPool(create_worker, 2)
+        first = convert_yielded(pool.send("request1"))
+        yield sleep(0)
+        self.assertFalse(pool.is_busy())
+        second = convert_yielded(pool.send("request2"))
+        yield sleep(0)
+        self.assertTrue(pool.is_busy())
+        release.set()
+        yield [first, second]
+        self.assertFalse(pool.is_busy())
+
+class WrapperWorkerPool(AsyncTestCase):
+    def setUp(self):
+        self.wrapper = ruby_pcsd.Wrapper(
+            rc("/path/to/gem_home"),
+            rc("/path/to/pcsd/cmdline/entry"),
+            workers=1,
+        )
+        self.worker = FakeWorker("worker")
+        self.new_process_requests = []
+        patcher_list = [
+            mock.patch.object(
+                ruby_pcsd, "RubyWorker", lambda cmdline, env: self.worker
+            ),
+            mock.patch.object(
+                self.wrapper,
+                "_Wrapper__send_to_new_ruby_process",
+                self.send_to_new_ruby_process
+            ),
+        ]
+        for patcher in patcher_list:
+            self.addCleanup(patcher.stop)
+            patcher.start()
+        super().setUp()
+
+    async def send_to_new_ruby_process(self, request_json):
+        self.new_process_requests.append(request_json)
+        return b"new process", b""
+
+    @gen_test
+    def test_wait_for_worker(self):
+        result = yield [
+            self.wrapper.send_to_ruby("request1"),
+            self.wrapper.send_to_ruby("request2"),
+        ]
+        self.assertEqual(result, [(b"worker", b""), (b"worker", b"")])
+        self.assertEqual(self.worker.requests, ["request1", "request2"])
+        self.assertEqual(self.new_process_requests, [])
+
+    @gen_test
+    def test_do_not_wait_for_busy_worker(self):
+        result = yield [
+            self.wrapper.send_to_ruby("request1"),
+            self.wrapper.send_to_ruby("request2", wait_for_worker=False),
+        ]
+        self.assertEqual(result, [(b"worker", b""), (b"new process", b"")])
+        self.assertEqual(self.worker.requests, ["request1"])
+        self.assertEqual(self.new_process_requests, ["request2"])
+
+    @gen_test
+    def test_do_not_wait_use_free_worker(self):
+        result = yield self.wrapper.send_to_ruby(
+            "request1", wait_for_worker=False
+        )
+        self.assertEqual(result, (b"worker", b""))
+        self.assertEqual(self.new_process_requests, [])
 
 class ProcessResponseLog(TestCase):
     @patch_ruby_pcsd("log.from_external_source")
@@ -0,0 +1,17 @@
+"""
+The pcs command starts here. Bash completion runs pcs on each press of the TAB
+key, so suggestions are printed without importing the rest of pcs.
+"""
+import os
+import sys
+
+from pcs.cli.common import completion
+
+
+def main(argv=None):
+    if completion.has_applicable_environment(os.environ):
+        print(completion.make_suggestions(os.environ, completion.load_tree()))
+        sys.exit()
+
+    from pcs import app
+    app.main(argv)
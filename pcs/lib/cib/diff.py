@@ -0,0 +1,256 @@
+"""
+This module creates differences of two CIBs in the format of pacemaker's xml
+patchset version 2, the same format `crm_diff --no-version` produces. The diff
+is created from the loaded trees directly, so it is not necessary to store the
+CIBs in temporary files and run crm_diff to get it.
+"""
+from collections import OrderedDict
+
+from lxml import etree
+
+
+# CIB version attributes are handled by pacemaker when a patch is applied, see
+# the --no-version option of crm_diff
+_VERSION_ATTRIBUTES = frozenset(["admin_epoch", "epoch", "num_updates"])
+# Elements this close to the root (sections of the CIB and their children) are
+# not compared as a whole. They hold most of the CIB and nearly always contain
+# the change, so comparing them would serialize most of the CIB repeatedly.
+_WHOLE_COMPARE_MIN_DEPTH = 2
+
+
+class UnsupportedCibDiff(Exception):
+    """
+    The trees contain a change which cannot be described reliably by this
+    module. Use crm_diff to get the diff in such a case.
+    """
+
+
+def diff_cibs(cib_old, cib_new):
+    """
+    Return a patchset describing changes from cib_old to cib_new or None if the
+    CIBs do not differ. Raise UnsupportedCibDiff if the difference cannot be
+    created.
+
+    etree cib_old -- original CIB
+    etree cib_new -- modified CIB
+    """
+    if cib_old.tag != cib_new.tag:
+        raise UnsupportedCibDiff("Root elements differ")
+    delete_list = []
+    change_list = []
+    _diff_element(
+        cib_old, cib_new, "/{0}".format(cib_new.tag), 0, delete_list,
+        change_list
+    )
+    return create_patchset(delete_list + change_list)
+
+
+def create_patchset(change_list):
+    """
+    Return a patchset element holding the changes or None if there are none
+
+    list change_list -- change elements
+    """
+    if not change_list:
+        return None
+    diff = etree.Element("diff", format="2")
+    for change in change_list:
+        diff.append(change)
+    return diff
+
+
+def create_delete_change(path):
+    return etree.Element("change", operation="delete", path=path)
+
+
+def create_create_change(parent_path, position, element):
+    """
+    Return a change creating a copy of the element
+
+    string parent_path -- path of the parent of the element
+    int position -- index of the element among its siblings
+    etree element -- the created element
+    """
+    change = etree.Element(
+        "change", operation="create", path=parent_path, position=str(position)
+    )
+    change.append(_copy_element(element))
+    return change
+
+
+def create_modify_change(path, element, old_attrs):
+    """
+    Return a change of attributes of the element or None if they do not differ
+
+    string path -- path of the element
+    etree element -- the modified element
+    dict old_attrs -- original attributes of the element
+    """
+    old_attrs = dict(old_attrs)
+    new_attrs = dict(element.attrib)
+    if element.getparent() is None:
+        for name in _VERSION_ATTRIBUTES:
+            old_attrs.pop(name, None)
+            new_attrs.pop(name, None)
+    if old_attrs == new_attrs:
+        return None
+
+    change = etree.Element("change", operation="modify", path=path)
+    change_attr_list = etree.SubElement(change, "change-list")
+    for name, value in new_attrs.items():
+        if old_attrs.get(name) != value:
+            etree.SubElement(
+                change_attr_list,
+                "change-attr",
+                name=name,
+                operation="set",
+                value=value,
+            )
+    for name in old_attrs:
+        if name not in new_attrs:
+            etree.SubElement(
+                change_attr_list, "change-attr", name=name, operation="unset"
+            )
+    change_result = etree.SubElement(change, "change-result")
+    etree.SubElement(change_result, element.tag, attrib=dict(element.attrib))
+    return change
+
+
+def get_element_path(element):
+    """
+    Return path of an element in a tree as pacemaker puts it in patchsets
+
+    etree element -- element in a CIB tree
+    """
+    path_parts = []
+    while element is not None:
+        parent = element.getparent()
+        if parent is None:
+            path_parts.append("/{0}".format(element.tag))
+        else:
+            _check_unambiguous(parent, element)
+            path_parts.append(_child_path("", element))
+        element = parent
+    return "".join(reversed(path_parts))
+
+
+def _diff_element(old, new, path, depth, delete_list, change_list):
+    _check_text(old, new)
+    if old.items() != new.items():
+        attr_change = create_modify_change(path, new, old.attrib)
+        if attr_change is not None:
+            change_list.append(attr_change)
+
+    old_children = _get_children_by_key(old)
+    new_children = _get_children_by_key(new)
+
+    for key, child in old_children.items():
+        if key not in new_children:
+            delete_list.append(create_delete_change(_child_path(path, child)))
+
+    common_old_order = [key for key in old_children if key in new_children]
+    common_new_order = [key for key in new_children if key in old_children]
+    if common_old_order != common_new_order:
+        # Moves are applied differently by different pacemaker versions.
+        raise UnsupportedCibDiff(
+            "Order of elements in '{0}' changed".format(path)
+        )
+
+    for position, (key, child) in enumerate(new_children.items()):
+        if key in old_children:
+            if (
+                depth + 1 >= _WHOLE_COMPARE_MIN_DEPTH
+                and
+                _is_same_subtree(old_children[key], child)
+            ):
+                continue
+            _diff_element(
+                old_children[key],
+                child,
+                _child_path(path, child),
+                depth + 1,
+                delete_list,
+                change_list,
+            )
+        else:
+            change_list.append(create_create_change(path, position, child))
+
+
+def _is_same_subtree(old, new):
+    # Serializing is done in C and it is much faster than walking through the
+    # trees in python. Most of a CIB does not change, so this saves most of
+    # the walking.
+    return (
+        etree.tostring(old, with_tail=False)
+        ==
+        etree.tostring(new, with_tail=False)
+    )
+
+
+def _get_children_by_key(element):
+    """
+    Return an ordered dict of child elements keyed by their tag and id, which
+    is how pacemaker identifies elements in patchset paths
+    """
+    children = OrderedDict()
+    for child in element:
+        if not isinstance(child.tag, str) or child.tag.startswith("{"):
+            # comments, processing instructions, namespaced elements
+            raise UnsupportedCibDiff(
+                "Unsupported node in '{0}'".format(element.tag)
+            )
+        key = (child.tag, _get_id(child))
+        if key in children:
+            raise UnsupportedCibDiff(
+                "Ambiguous element '{0}' in '{1}'".format(
+                    child.tag, element.tag
+                )
+            )
+        children[key] = child
+    return children
+
+
+def _get_id(element):
+    element_id = element.get("id")
+    if element_id is not None and "'" in element_id:
+        raise UnsupportedCibDiff("Unsupported id \"{0}\"".format(element_id))
+    return element_id
+
+
+def _check_unambiguous(parent, child):
+    child_id = _get_id(child)
+    for sibling in parent.iterchildren(child.tag):
+        if sibling is not child and _get_id(sibling) == child_id:
+            raise UnsupportedCibDiff(
+                "Ambiguous element '{0}' in '{1}'".format(
+                    child.tag, parent.tag
+                )
+            )
+
+
+def _child_path(parent_path, child):
+    child_id = child.get("id")
+    if child_id is None:
+        return "{0}/{1}".format(parent_path, child.tag)
+    return "{0}/{1}[@id='{2}']".format(parent_path, child.tag, child_id)
+
+
+def _check_text(old, new):
+    if (old.text or "").strip() != (new.text or "").strip():
+        raise UnsupportedCibDiff(
+            "Text content of '{0}' changed".format(new.tag)
+        )
+
+
+def _copy_element(element):
+    copy = etree.Element(element.tag, attrib=dict(element.attrib))
+    copy.text = element.text if (element.text or "").strip() else None
+    for child in element:
+        if isinstance(child.tag, str):
+            copy.append(_copy_element(child))
+        else:
+            raise UnsupportedCibDiff(
+                "Unsupported node in '{0}'".format(element.tag)
+            )
+    return copy
+
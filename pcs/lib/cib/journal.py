@@ -0,0 +1,203 @@
+"""
+This module keeps track of changes made to a CIB tree, so a patchset can be
+created from the changes instead of comparing the whole original and modified
+CIBs.
+
+Tracking is opt-in. It is started for a CIB tree by calling start. Functions
+modifying the tree report their changes by calling record_* functions of this
+module before (attributes, removals) or after (additions) the change is made.
+The record_* functions do nothing for trees which are not tracked. All changes
+of a tracked tree must be reported, otherwise the patchset is not complete.
+Changes made by the helpers in pcs.lib.xml_tools are reported to this module
+automatically.
+"""
+from pcs.lib import xml_tools
+from pcs.lib.cib.diff import (
+    create_create_change,
+    create_delete_change,
+    create_modify_change,
+    create_patchset,
+    get_element_path,
+    UnsupportedCibDiff,
+)
+
+
+# The registry is keyed by id of a root element. The journal keeps a reference
+# to the root element, so the id stays unique while the journal is registered.
+_journal_registry = {}
+
+
+class CibJournal(object):
+    def __init__(self, cib):
+        self._cib = cib
+        # the lists keep references to the elements, so their ids stay valid
+        self._added = []
+        self._added_ids = set()
+        self._modified = []
+        self._modified_attrs = {}
+        self._delete_change_list = []
+
+    @property
+    def cib(self):
+        return self._cib
+
+    def element_added(self, element):
+        if self._is_new(element):
+            return
+        self._added.append(element)
+        self._added_ids.add(id(element))
+
+    def element_removed(self, element):
+        if id(element) in self._added_ids:
+            # The element may be added again later, for example when it is
+            # moved. It will be recorded as added again in such a case.
+            self._added.remove(element)
+            self._added_ids.discard(id(element))
+            return
+        if self._is_new(element) or not self._is_in_tree(element):
+            return
+        self._delete_change_list.append(
+            create_delete_change(get_element_path(element))
+        )
+
+    def attributes_modified(self, element):
+        if id(element) in self._modified_attrs or self._is_new(element):
+            return
+        self._modified.append(element)
+        self._modified_attrs[id(element)] = dict(element.attrib)
+
+    def get_patchset(self):
+        """
+        Return a patchset describing the recorded changes or None if there are
+        no changes. Raise UnsupportedCibDiff if the patchset cannot be created.
+        """
+        change_list = list(self._delete_change_list)
+        for element in self._modified:
+            if not self._is_in_tree(element) or self._is_new(element):
+                # the element has been removed or moved
+                continue
+            old_attrs = self._modified_attrs[id(element)]
+            if old_attrs.get("id") != element.get("id"):
+                # paths of the element and its descendants have changed
+                raise UnsupportedCibDiff(
+                    "Id of an element changed to '{0}'".format(
+                        element.get("id")
+                    )
+                )
+            change = create_modify_change(
+                get_element_path(element), element, old_attrs
+            )
+            if change is not None:
+                change_list.append(change)
+
+        create_list = []
+        for element in self._added:
+            parent = element.getparent()
+            if (
+                parent is None
+                or
+                not self._is_in_tree(parent)
+                or
+                self._is_new(parent)
+            ):
+                # the element has been removed or it is a part of another new
+                # element
+                continue
+            create_list.append((
+                parent.index(element),
+                create_create_change(
+                    get_element_path(parent), parent.index(element), element
+                )
+            ))
+        # Each create must be applied after creates of its preceding siblings,
+        # so that its position is valid.
+        change_list.extend(
+            change for _, change in sorted(create_list, key=lambda x: x[0])
+        )
+        return create_patchset(change_list)
+
+    def _is_in_tree(self, element):
+        # Elements removed from a tree still belong to its document, so
+        # getroottree cannot be used to find out if they are in the tree.
+        while element.getparent() is not None:
+            element = element.getparent()
+        return element is self._cib
+
+    def _is_new(self, element):
+        if not self._added_ids:
+            return False
+        while element is not None:
+            if id(element) in self._added_ids:
+                return True
+            element = element.getparent()
+        return False
+
+
+def start(cib):
+    """
+    Start tracking changes of a CIB tree, return the journal
+
+    etree cib -- root element of the CIB tree
+    """
+    journal = CibJournal(cib)
+    _journal_registry[id(cib)] = journal
+    return journal
+
+
+def stop(journal):
+    """
+    Stop tracking changes of a CIB tree
+
+    CibJournal journal -- the journal returned by start
+    """
+    _journal_registry.pop(id(journal.cib), None)
+
+
+def record_added(element):
+    """
+    Report an element has been inserted to a tree
+
+    etree element -- the inserted element
+    """
+    journal = _get_journal(element)
+    if journal is not None:
+        journal.element_added(element)
+
+
+def record_removed(element):
+    """
+    Report an element is going to be removed from a tree
+
+    etree element -- the element to be removed
+    """
+    journal = _get_journal(element)
+    if journal is not None:
+        journal.element_removed(element)
+
+
+def record_attributes_modified(element):
+    """
+    Report attributes of an element are going to be changed
+
+    etree element -- the element to be changed
+    """
+    journal = _get_journal(element)
+    if journal is not None:
+        journal.attributes_modified(element)
+
+
+def _get_journal(element):
+    if not _journal_registry:
+        return None
+    root = element.getroottree().getroot()
+    journal = _journal_registry.get(id(root))
+    if journal is not None and journal.cib is root:
+        return journal
+    return None
+
+
+xml_tools.set_change_recorders(
+    record_added,
+    record_removed,
+    record_attributes_modified,
+)
@@ -1,6 +1,7 @@
 from lxml import etree
 from functools import partial
 
+from pcs.lib.cib import journal
 from pcs.lib.cib.tools import create_subelement_id
 from pcs.lib.xml_tools import(
     get_sub_element,
@@ -16,13 +17,13 @@ def _append_new_nvpair(nvset_element, name, value, id_provider=None):
     string value is value attribute of new nvpair
     IdProvider id_provider -- elements' ids generator
     """
-    etree.SubElement(
+    journal.record_added(etree.SubElement(
         nvset_element,
         "nvpair",
         id=create_subelement_id(nvset_element, name, id_provider),
         name=name,
         value=value
-    )
+    ))
 
 def set_nvpair_in_nvset(nvset_element, name, value):
     """
@@ -39,8 +40,10 @@ def set_nvpair_in_nvset(nvset_element, name, value):
             _append_new_nvpair(nvset_element, name, value)
     else:
         if value:
+            journal.record_attributes_modified(nvpair)
             nvpair.set("value", value)
         else:
+            journal.record_removed(nvpair)
             nvset_element.remove(nvpair)
 
 def arrange_first_nvset(tag_name, context_element, nvpair_dict, new_id=None):
@@ -83,6 +86,7 @@ def append_new_nvset(tag_name, context_element, nvpair_dict, id_provider=None):
     nvset_element = etree.SubElement(context_element, tag_name, {
         "id": create_subelement_id(context_element, tag_name, id_provider)
     })
+    journal.record_added(nvset_element)
     for name, value in sorted(nvpair_dict.items()):
         _append_new_nvpair(nvset_element, name, value, id_provider)
 
@@ -5,6 +5,7 @@ from lxml import etree
 from pcs.common import report_codes
 from pcs.lib import reports, validate
 from pcs.lib.resource_agent import get_default_interval, complete_all_intervals
+from pcs.lib.cib import journal
 from pcs.lib.cib.nvpair import append_new_instance_attributes
 from pcs.lib.cib.tools import (
     create_subelement_id,
@@ -264,47 +265,56 @@ def validate_different_intervals(operation_list):
         )]
     return []
 
-def create_id(context_element, name, interval):
+def create_id(context_element, name, interval, id_provider=None):
     """
     Create id for op element.
     etree context_element is used for the name building
     string name is the name of the operation
     mixed interval is the interval attribute of operation
+    IdProvider id_provider -- elements' ids generator
     """
     return create_subelement_id(
         context_element,
-        "{0}-interval-{1}".format(name, interval)
+        "{0}-interval-{1}".format(name, interval),
+        id_provider
     )
 
-def create_operations(primitive_element, operation_list):
+def create_operations(primitive_element, operation_list, id_provider=None):
     """
     Create operation element containing operations from operation_list
     list operation_list contains dictionaries with attributes of operation
     etree primitive_element is context element
+    IdProvider id_provider -- elements' ids generator and uniqueness checker
     """
     operations_element = etree.SubElement(primitive_element, "operations")
     for operation in sorted(operation_list, key=lambda op: op["name"]):
-        append_new_operation(operations_element, operation)
+        append_new_operation(operations_element, operation, id_provider)
 
-def append_new_operation(operations_element, options):
+def append_new_operation(operations_element, options, id_provider=None):
     """
     Create op element and apend it to operations_element.
     etree operations_element is the context element
     dict options are attributes of operation
+    IdProvider id_provider -- elements' ids generator and uniqueness checker
     """
     attribute_map = dict(
         (key, value) for key, value in options.items()
         if key not in OPERATION_NVPAIR_ATTRIBUTES
     )
     if "id" in attribute_map:
-        if does_id_exist(operations_element, attribute_map["id"]):
+        if id_provider:
+            report_list = id_provider.book_ids(attribute_map["id"])
+            if report_list:
+                raise LibraryError(*report_list)
+        elif does_id_exist(operations_element, attribute_map["id"]):
             raise LibraryError(reports.id_already_exists(attribute_map["id"]))
     else:
         attribute_map.update({
             "id": create_id(
                 operations_element.getparent(),
                 options["name"],
-                options["interval"]
+                options["interval"],
+                id_provider
             )
         })
     op_element = etree.SubElement(
@@ -318,7 +328,9 @@ def append_new_operation(operations_element, options):
     )
 
     if nvpair_attribute_map:
-        append_new_instance_attributes(op_element, nvpair_attribute_map)
+        append_new_instance_attributes(
+            op_element, nvpair_attribute_map, id_provider
+        )
 
     return op_element
 
@@ -339,6 +351,7 @@ def disable(operation_element):
     Disable the specified operation
     etree operation_element -- the operation
     """
+    journal.record_attributes_modified(operation_element)
     operation_element.attrib["enabled"] = "false"
 
 def enable(operation_element):
@@ -346,6 +359,7 @@ def enable(operation_element):
     Enable the specified operation
     etree operation_element -- the operation
     """
+    journal.record_attributes_modified(operation_element)
     operation_element.attrib.pop("enabled", None)
 
 def is_enabled(operation_element):
@@ -0,0 +1,255 @@
+from copy import deepcopy
+from lxml import etree
+from unittest import TestCase
+
+from pcs.lib.cib.diff import diff_cibs, UnsupportedCibDiff
+from pcs.test.tools.assertions import assert_xml_equal
+from pcs.test.tools.misc import get_test_resource as rc
+from pcs.test.tools.xml import apply_patchset, etree_to_str
+
+
+def load_cib(filename):
+    with open(rc(filename)) as cib_file:
+        return etree.fromstring(
+            cib_file.read(), etree.XMLParser(remove_blank_text=True)
+        )
+
+
+class DiffCibs(TestCase):
+    def assert_diff(self, cib_old, cib_new, expected_diff):
+        assert_xml_equal(
+            expected_diff, etree_to_str(diff_cibs(cib_old, cib_new))
+        )
+
+    def test_no_change(self):
+        cib = load_cib("cib-large.xml")
+        self.assertIsNone(diff_cibs(cib, deepcopy(cib)))
+
+    def test_version_change_ignored(self):
+        cib_old = etree.fromstring('<cib epoch="1" num_updates="2"/>')
+        cib_new = etree.fromstring(
+            '<cib epoch="2" num_updates="0" admin_epoch="1"/>'
+        )
+        self.assertIsNone(diff_cibs(cib_old, cib_new))
+
+    def test_all_operations(self):
+        cib_old = etree.fromstring("""
+            <cib epoch="1">
+                <configuration>
+                    <resources>
+                        <primitive id="A" class="ocf" type="Dummy"/>
+                        <primitive id="B" class="ocf" type="Dummy"
+                            description="b"
+                        />
+                    </resources>
+                    <constraints>
+                        <rsc_location id="L" rsc="A" node="n" score="1"/>
+                    </constraints>
+                </configuration>
+            </cib>
+        """)
+        cib_new = etree.fromstring("""
+            <cib epoch="2">
+                <configuration>
+                    <resources>
+                        <primitive id="C" class="ocf" type="Dummy">
+                            <meta_attributes id="C-meta">
+                                <nvpair id="C-meta-a" name="a" value="1"/>
+                            </meta_attributes>
+                        </primitive>
+                        <primitive id="B" class="ocf" type="Stateful"/>
+                    </resources>
+                    <constraints/>
+                </configuration>
+            </cib>
+        """)
+        self.assert_diff(
+            cib_old,
+            cib_new,
+            """
+            <diff format="2">
+                <change operation="delete"
+                    path="/cib/configuration/resources/primitive[@id='A']"
+                />
+                <change operation="delete" path=
+                    "/cib/configuration/constraints/rsc_location[@id='L']"
+                />
+                <change operation="create"
+                    path="/cib/configuration/resources" position="0"
+                >
+                    <primitive id="C" class="ocf" type="Dummy">
+                        <meta_attributes id="C-meta">
+                            <nvpair id="C-meta-a" name="a" value="1"/>
+                        </meta_attributes>
+                    </primitive>
+                </change>
+                <change operation="modify"
+                    path="/cib/configuration/resources/primitive[@id='B']"
+                >
+                    <change-list>
+                        <change-attr name="type" operation="set"
+                            value="Stateful"
+                        />
+                        <change-attr name="description" operation="unset"/>
+                    </change-list>
+                    <change-result>
+                        <primitive id="B" class="ocf" type="Stateful"/>
+                    </change-result>
+                </change>
+            </diff>
+            """
+        )
+
+    def test_unsupported_move(self):
+        cib_old = etree.fromstring(
+            '<cib><resources><primitive id="A"/><primitive id="B"/></resources>'
+            '</cib>'
+        )
+        cib_new = etree.fromstring(
+            '<cib><resources><primitive id="B"/><primitive id="A"/></resources>'
+            '</cib>'
+        )
+        self.assertRaises(UnsupportedCibDiff, diff_cibs, cib_old, cib_new)
+
+    def test_unsupported_ambiguous_path(self):
+        cib_old = etree.fromstring("<cib><a><b/></a></cib>")
+        cib_new = etree.fromstring("<cib><a><b/><b/></a></cib>")
+        self.assertRaises(UnsupportedCibDiff, diff_cibs, cib_old, cib_new)
+
+    def test_unsupported_comment(self):
+        cib_old = etree.fromstring("<cib><a/></cib>")
+        cib_new = etree.fromstring("<cib><a><!-- comment --></a></cib>")
+        self.assertRaises(UnsupportedCibDiff, diff_cibs, cib_old, cib_new)
+
+    def test_unsupported_quote_in_id(self):
+        cib_old = etree.fromstring("<cib><a/></cib>")
+        cib_new = etree.fromstring("<cib><a><b id=\"it's\"/></a></cib>")
+        self.assertRaises(UnsupportedCibDiff, diff_cibs, cib_old, cib_new)
+
+    def test_unsupported_root_change(self):
+        self.assertRaises(
+            UnsupportedCibDiff,
+            diff_cibs,
+            etree.fromstring("<cib/>"),
+            etree.fromstring("<pacemaker/>")
+        )
+
+
+def _add_primitives(cib):
+    resources = cib.find("configuration/resources")
+    for position in (0, 2, 3, len(resources) + 2):
+        resources.insert(
+            position,
+            etree.fromstring("""
+                <primitive id="new-{0}" class="ocf" provider="pacemaker"
+                    type="Dummy"
+                >
+                    <operations>
+                        <op id="new-{0}-monitor" name="monitor" interval="10"/>
+                    </operations>
+                </primitive>
+            """.format(position), etree.XMLParser(remove_blank_text=True))
+        )
+
+def _remove_primitives(cib):
+    resources = cib.find("configuration/resources")
+    for primitive in list(resources)[::25]:
+        resources.remove(primitive)
+
+def _update_nvpairs(cib):
+    for nvpair in cib.findall(".//meta_attributes/nvpair")[::20]:
+        nvpair.set("value", "Started")
+
+def _replace_operations(cib):
+    for operations in cib.findall(".//operations")[:20]:
+        for op in list(operations):
+            operations.remove(op)
+        etree.SubElement(
+            operations,
+            "op",
+            id="{0}-new-op".format(operations.getparent().get("id")),
+            name="start",
+            interval="0s",
+        )
+
+def _remove_attributes(cib):
+    for primitive in cib.findall(".//primitive")[1::5]:
+        del primitive.attrib["provider"]
+        primitive.set("description", "no provider")
+
+def _change_constraints(cib):
+    constraints = cib.find("configuration/constraints")
+    for location in list(constraints)[::100]:
+        constraints.remove(location)
+    etree.SubElement(
+        constraints, "rsc_order", id="order", first="dummy", then="dummy1"
+    )
+    constraints.insert(
+        1,
+        etree.Element(
+            "rsc_colocation", id="colo", rsc="dummy", with_rsc="dummy1",
+            score="INFINITY"
+        )
+    )
+
+def _move_to_group(cib):
+    resources = cib.find("configuration/resources")
+    group = etree.Element("group", id="G")
+    for primitive in list(resources)[10:15]:
+        group.append(primitive)
+    resources.insert(3, group)
+
+def _add_optional_sections(cib):
+    configuration = cib.find("configuration")
+    etree.SubElement(configuration, "tags")
+    rsc_defaults = etree.SubElement(configuration, "rsc_defaults")
+    etree.SubElement(
+        etree.SubElement(rsc_defaults, "meta_attributes", id="rsc-options"),
+        "nvpair",
+        id="rsc-options-stickiness",
+        name="resource-stickiness",
+        value="100",
+    )
+    cib.set("validate-with", "pacemaker-3.0")
+
+
+class DiffCibsApplyEquivalence(TestCase):
+    """
+    Applying a diff to the original CIB must result in the modified CIB
+    """
+    modifier_list = [
+        _add_primitives,
+        _remove_primitives,
+        _update_nvpairs,
+        _replace_operations,
+        _remove_attributes,
+        _change_constraints,
+        _move_to_group,
+        _add_optional_sections,
+    ]
+
+    def assert_equivalent(self, cib_old, cib_new):
+        diff = diff_cibs(cib_old, cib_new)
+        self.assertIsNotNone(diff)
+        # canonical form makes the comparison of big CIBs fast enough
+        self.assertEqual(
+            etree.tostring(cib_new, method="c14n"),
+            etree.tostring(
+                apply_patchset(deepcopy(cib_old), diff), method="c14n"
+            ),
+        )
+
+    def test_each_modification(self):
+        for modifier in self.modifier_list:
+            with self.subTest(modifier=modifier.__name__):
+                cib_old = load_cib("cib-large.xml")
+                cib_new = deepcopy(cib_old)
+                modifier(cib_new)
+                self.assert_equivalent(cib_old, cib_new)
+
+    def test_all_modifications(self):
+        cib_old = load_cib("cib-large.xml")
+        cib_new = deepcopy(cib_old)
+        for modifier in self.modifier_list:
+            modifier(cib_new)
+        self.assert_equivalent(cib_old, cib_new)
@@ -0,0 +1,172 @@
+from copy import deepcopy
+from lxml import etree
+from unittest import TestCase
+
+from pcs.lib.cib import journal, nvpair
+from pcs.lib.cib.diff import UnsupportedCibDiff
+from pcs.lib.cib.resource import common, operations
+from pcs.test.tools.assertions import assert_xml_equal
+from pcs.test.tools.xml import apply_patchset, etree_to_str
+
+
+CIB = """
+    <cib epoch="1">
+        <configuration>
+            <resources>
+                <primitive id="A" class="ocf" provider="pacemaker" type="Dummy">
+                    <meta_attributes id="A-meta_attributes">
+                        <nvpair id="A-meta_attributes-target-role"
+                            name="target-role" value="Stopped"
+                        />
+                    </meta_attributes>
+                    <operations>
+                        <op id="A-monitor" name="monitor" interval="10"/>
+                    </operations>
+                </primitive>
+                <primitive id="B" class="ocf" provider="pacemaker" type="Dummy">
+                    <operations>
+                        <op id="B-monitor" name="monitor" interval="10"
+                            enabled="false"
+                        />
+                    </operations>
+                </primitive>
+            </resources>
+        </configuration>
+    </cib>
+"""
+
+
+class CibJournalTest(TestCase):
+    def setUp(self):
+        self.cib_original = etree.fromstring(
+            CIB, etree.XMLParser(remove_blank_text=True)
+        )
+        self.cib = deepcopy(self.cib_original)
+        self.journal = journal.start(self.cib)
+        self.addCleanup(journal.stop, self.journal)
+
+    def resource(self, resource_id):
+        return self.cib.find(
+            ".//primitive[@id='{0}']".format(resource_id)
+        )
+
+    def assert_patchset(self, expected_patchset):
+        patchset = self.journal.get_patchset()
+        assert_xml_equal(expected_patchset, etree_to_str(patchset))
+        assert_xml_equal(
+            etree_to_str(self.cib),
+            etree_to_str(apply_patchset(self.cib_original, patchset))
+        )
+
+    def test_no_changes(self):
+        self.assertIsNone(self.journal.get_patchset())
+
+    def test_enable_disable(self):
+        common.enable(self.resource("A"))
+        common.disable(self.resource("B"))
+        self.assert_patchset("""
+            <diff format="2">
+                <change operation="delete" path="/cib/configuration/resources/primitive[@id='A']/meta_attributes[@id='A-meta_attributes']/nvpair[@id='A-meta_attributes-target-role']"/>
+                <change operation="delete" path="/cib/configuration/resources/primitive[@id='A']/meta_attributes[@id='A-meta_attributes']"/>
+                <change operation="create" path="/cib/configuration/resources/primitive[@id='B']" position="0">
+                    <meta_attributes id="B-meta_attributes">
+                        <nvpair id="B-meta_attributes-target-role"
+                            name="target-role" value="Stopped"
+                        />
+                    </meta_attributes>
+                </change>
+            </diff>
+        """)
+
+    def test_modify_attributes(self):
+        common.disable(self.resource("A"))
+        nvpair.set_nvpair_in_nvset(
+            self.resource("A").find("meta_attributes"), "target-role", "Slave"
+        )
+        operations.disable(self.resource("A").find(".//op"))
+        operations.enable(self.resource("B").find(".//op"))
+        self.assert_patchset("""
+            <diff format="2">
+                <change operation="modify" path="/cib/configuration/resources/primitive[@id='A']/meta_attributes[@id='A-meta_attributes']/nvpair[@id='A-meta_attributes-target-role']">
+                    <change-list>
+                        <change-attr name="value" operation="set"
+                            value="Slave"
+                        />
+                    </change-list>
+                    <change-result>
+                        <nvpair id="A-meta_attributes-target-role"
+                            name="target-role" value="Slave"
+                        />
+                    </change-result>
+                </change>
+                <change operation="modify" path="/cib/configuration/resources/primitive[@id='A']/operations/op[@id='A-monitor']">
+                    <change-list>
+                        <change-attr name="enabled" operation="set"
+                            value="false"
+                        />
+                    </change-list>
+                    <change-result>
+                        <op id="A-monitor" name="monitor" interval="10"
+                            enabled="false"
+                        />
+                    </change-result>
+                </change>
+                <change operation="modify" path="/cib/configuration/resources/primitive[@id='B']/operations/op[@id='B-monitor']">
+                    <change-list>
+                        <change-attr name="enabled" operation="unset"/>
+                    </change-list>
+                    <change-result>
+                        <op id="B-monitor" name="monitor" interval="10"/>
+                    </change-result>
+                </change>
+            </diff>
+        """)
+
+    def test_changes_in_new_elements_merged(self):
+        common.unmanage(self.resource("B"))
+        common.disable(self.resource("B"))
+        common.manage(self.resource("B"))
+        self.assert_patchset("""
+            <diff format="2">
+                <change operation="create" path="/cib/configuration/resources/primitive[@id='B']" position="0">
+                    <meta_attributes id="B-meta_attributes">
+                        <nvpair id="B-meta_attributes-target-role"
+                            name="target-role" value="Stopped"
+                        />
+                    </meta_attributes>
+                </change>
+            </diff>
+        """)
+
+    def test_added_and_removed(self):
+        common.disable(self.resource("B"))
+        common.enable(self.resource("B"))
+        self.assertIsNone(self.journal.get_patchset())
+
+    def test_modified_and_removed(self):
+        nvpair.set_nvpair_in_nvset(
+            self.resource("A").find("meta_attributes"), "target-role", "Slave"
+        )
+        common.enable(self.resource("A"))
+        self.assert_patchset("""
+            <diff format="2">
+                <change operation="delete" path="/cib/configuration/resources/primitive[@id='A']/meta_attributes[@id='A-meta_attributes']/nvpair[@id='A-meta_attributes-target-role']"/>
+                <change operation="delete" path="/cib/configuration/resources/primitive[@id='A']/meta_attributes[@id='A-meta_attributes']"/>
+            </diff>
+        """)
+
+    def test_id_changed(self):
+        op = self.resource("A").find(".//op")
+        journal.record_attributes_modified(op)
+        op.set("id", "new-id")
+        self.assertRaises(UnsupportedCibDiff, self.journal.get_patchset)
+
+    def test_untracked_tree(self):
+        cib = deepcopy(self.cib_original)
+        common.disable(cib.find(".//primitive[@id='B']"))
+        self.assertIsNone(self.journal.get_patchset())
+
+    def test_stopped(self):
+        journal.stop(self.journal)
+        common.disable(self.resource("B"))
+        self.assertIsNone(self.journal.get_patchset())
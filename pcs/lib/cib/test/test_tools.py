@@ -126,6 +126,61 @@ class IdProviderAllocate(IdProviderTest):
         self.assertEqual("myId-2",  self.provider.allocate_id("myId"))
 
 
+@mock.patch(
+    "pcs.lib.cib.tools.get_existing_ids",
+    side_effect=lambda tree: set(["myId"])
+)
+class IdProviderExistingIdsLoadedOnce(IdProviderTest):
+    def test_book_and_allocate(self, mock_get_ids):
+        assert_report_item_list_equal(
+            self.provider.book_ids("myId", "otherId"),
+            [
+                self.fixture_report("myId"),
+            ]
+        )
+        self.assertEqual("myId-1",  self.provider.allocate_id("myId"))
+        self.assertEqual("otherId-1",  self.provider.allocate_id("otherId"))
+        self.assertEqual(1, mock_get_ids.call_count)
+
+
+class GetExistingIdsTest(CibToolsTest):
+    def test_same_ids_as_does_id_exist(self):
+        tree = etree.fromstring("""
+            <cib>
+                <configuration>
+                    <resources>
+                        <primitive id="a">
+                            <meta_attributes id="a-meta">
+                                <nvpair id="a-meta-remote" name="remote-node"
+                                    value="remote"
+                                />
+                                <nvpair id="a-meta-other" name="other"
+                                    value="other"
+                                />
+                            </meta_attributes>
+                        </primitive>
+                    </resources>
+                    <acls>
+                        <acl_target id="target1">
+                            <role id="role1"/>
+                        </acl_target>
+                    </acls>
+                </configuration>
+                <status>
+                    <node_state id="status-1"/>
+                </status>
+            </cib>
+        """)
+        self.assertEqual(
+            set(["a", "a-meta", "a-meta-remote", "a-meta-other", "remote"]),
+            lib.get_existing_ids(tree)
+        )
+
+    def test_cib_is_not_root_element(self):
+        tree = etree.fromstring('<root><direct id="a"/></root>')
+        self.assertEqual(set(["a"]), lib.get_existing_ids(tree))
+
+
 class DoesIdExistTest(CibToolsTest):
     def test_existing_id(self):
         self.fixture_add_primitive_with_id("myId")
@@ -242,6 +297,14 @@ class FindUniqueIdTest(CibToolsTest):
             lib.find_unique_id(self.cib.tree, "myId", ["myId", "myId-2"])
         )
 
+    def test_existing_ids(self):
+        self.assertEqual(
+            "myId-2",
+            lib.find_unique_id(
+                self.cib.tree, "myId", existing_ids=set(["myId", "myId-1"])
+            )
+        )
+
 class CreateNvsetIdTest(TestCase):
     def test_create_plain_id_when_no_confilicting_id_there(self):
         context = etree.fromstring('<cib><a id="b"/></cib>')
@@ -15,6 +15,10 @@ VERSION_FORMAT = r"(?P<major>\d+)\.(?P<minor>\d+)(\.(?P<rev>\d+))?$"
 class IdProvider(object):
     """
     Book ids for future use in the CIB and generate new ids accordingly
+
+    Ids existing in the CIB are loaded once, when they are needed for the first
+    time. Therefore all ids of elements put to the CIB during the life of an
+    IdProvider must be booked or allocated by it.
     """
     def __init__(self, cib_element):
         """
@@ -22,13 +26,24 @@ class IdProvider(object):
         """
         self._cib = get_root(cib_element)
         self._booked_ids = set()
+        self._existing_ids = None
+
+    def _get_existing_ids(self):
+        if self._existing_ids is None:
+            self._existing_ids = get_existing_ids(self._cib)
+        return self._existing_ids
 
     def allocate_id(self, proposed_id):
         """
         Generate a new unique id based on the proposal and keep track of it
         string proposed_id -- requested id
         """
-        final_id = find_unique_id(self._cib, proposed_id, self._booked_ids)
+        final_id = find_unique_id(
+            self._cib,
+            proposed_id,
+            self._booked_ids,
+            existing_ids=self._get_existing_ids()
+        )
         self._booked_ids.add(final_id)
         return final_id
 
@@ -42,7 +57,7 @@ class IdProvider(object):
         for id in id_list:
             if id in reported_ids:
                 continue
-            if id in self._booked_ids or does_id_exist(self._cib, id):
+            if id in self._booked_ids or id in self._get_existing_ids():
                 report_list.append(reports.id_already_exists(id))
                 reported_ids.add(id)
                 continue
@@ -92,6 +107,30 @@ def does_id_exist(tree, check_id):
     """.format(check_id))
     return len(existing) > 0
 
+def get_existing_ids(tree):
+    """
+    Return a set of all ids in the xml dom passed, the same ids which
+    does_id_exist considers to be existing
+
+    tree cib etree node
+    """
+    # see does_id_exist for what is considered to be an id and why
+    return set(get_root(tree).xpath("""
+        (
+            /cib/*[name()!="status"]
+            |
+            /*[name()!="cib"]
+        )
+        //*[name()!="acl_target" and name()!="role"]/@id
+        |
+        (
+            /cib/*[name()!="status"]
+            |
+            /*[name()!="cib"]
+        )
+        //primitive/meta_attributes/nvpair[@name="remote-node"]/@value
+    """))
+
 def validate_id_does_not_exist(tree, id):
     """
     tree cib etree node
@@ -99,19 +138,27 @@ def validate_id_does_not_exist(tree, id):
     if does_id_exist(tree, id):
         raise LibraryError(reports.id_already_exists(id))
 
-def find_unique_id(tree, check_id, reserved_ids=None):
+def find_unique_id(tree, check_id, reserved_ids=None, existing_ids=None):
     """
     Returns check_id if it doesn't exist in the dom, otherwise it adds
     an integer to the end of the id and increments it until a unique id is found
     etree tree -- cib etree node
     string check_id -- id to check
     iterable reserved_ids -- ids to think about as already used
+    set existing_ids -- ids existing in the tree as returned by
+        get_existing_ids, loaded from the tree if not specified
     """
     if not reserved_ids:
         reserved_ids = set()
+    if existing_ids is None:
+        if check_id not in reserved_ids and not does_id_exist(tree, check_id):
+            return check_id
+        # Load all the ids at once instead of searching the tree for each
+        # candidate.
+        existing_ids = get_existing_ids(tree)
     counter = 1
     temp_id = check_id
-    while temp_id in reserved_ids or does_id_exist(tree, temp_id):
+    while temp_id in reserved_ids or temp_id in existing_ids:
         temp_id = "{0}-{1}".format(check_id, counter)
         counter += 1
     return temp_id
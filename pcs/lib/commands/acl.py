@@ -6,10 +6,14 @@ from pcs.lib.cib.tools import get_acls
 
 
 REQUIRED_CIB_VERSION = Version(2, 0, 0)
+# acls are defined in the configuration, the status is not needed
+REQUIRED_CIB_SECTIONS = ("configuration",)
 
 @contextmanager
 def cib_acl_section(env):
-    yield get_acls(env.get_cib(REQUIRED_CIB_VERSION))
+    yield get_acls(
+        env.get_cib(REQUIRED_CIB_VERSION, sections=REQUIRED_CIB_SECTIONS)
+    )
     env.push_cib()
 
 def create_role(lib_env, role_id, permission_info_list, description):
@@ -249,7 +253,9 @@ def get_config(lib_env):
 
     lib_env -- LibraryEnvironment
     """
-    acl_section = get_acls(lib_env.get_cib(REQUIRED_CIB_VERSION))
+    acl_section = get_acls(
+        lib_env.get_cib(REQUIRED_CIB_VERSION, sections=REQUIRED_CIB_SECTIONS)
+    )
     return {
         "target_list": acl.get_target_list(acl_section),
         "group_list": acl.get_group_list(acl_section),
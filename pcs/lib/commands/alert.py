@@ -5,6 +5,8 @@ from pcs.lib.errors import LibraryError
 
 
 REQUIRED_CIB_VERSION = Version(2, 5, 0)
+# alerts are defined in the configuration, the status is not needed
+REQUIRED_CIB_SECTIONS = ("configuration",)
 
 
 def create_alert(
@@ -31,7 +33,9 @@ def create_alert(
 
 
     alert_el = alert.create_alert(
-        lib_env.get_cib(REQUIRED_CIB_VERSION),
+        lib_env.get_cib(
+            REQUIRED_CIB_VERSION, sections=REQUIRED_CIB_SECTIONS
+        ),
         alert_id,
         path,
         description
@@ -63,7 +67,9 @@ def update_alert(
     """
 
     alert_el = alert.update_alert(
-        lib_env.get_cib(REQUIRED_CIB_VERSION),
+        lib_env.get_cib(
+            REQUIRED_CIB_VERSION, sections=REQUIRED_CIB_SECTIONS
+        ),
         alert_id,
         path,
         description
@@ -81,7 +87,9 @@ def remove_alert(lib_env, alert_id_list):
     lib_env -- LibraryEnvironment
     alert_id_list -- list of alerts ids which should be removed
     """
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(
+        REQUIRED_CIB_VERSION, sections=REQUIRED_CIB_SECTIONS
+    )
     report_list = []
     for alert_id in alert_id_list:
         try:
@@ -122,7 +130,9 @@ def add_recipient(
 
     recipient = alert.add_recipient(
         lib_env.report_processor,
-        lib_env.get_cib(REQUIRED_CIB_VERSION),
+        lib_env.get_cib(
+            REQUIRED_CIB_VERSION, sections=REQUIRED_CIB_SECTIONS
+        ),
         alert_id,
         recipient_value,
         recipient_id=recipient_id,
@@ -163,7 +173,9 @@ def update_recipient(
         )
     recipient = alert.update_recipient(
         lib_env.report_processor,
-        lib_env.get_cib(REQUIRED_CIB_VERSION),
+        lib_env.get_cib(
+            REQUIRED_CIB_VERSION, sections=REQUIRED_CIB_SECTIONS
+        ),
         recipient_id,
         recipient_value=recipient_value,
         description=description,
@@ -182,7 +194,9 @@ def remove_recipient(lib_env, recipient_id_list):
     lib_env -- LibraryEnvironment
     recipient_id_list -- list of recipients ids to be removed
     """
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(
+        REQUIRED_CIB_VERSION, sections=REQUIRED_CIB_SECTIONS
+    )
     report_list = []
     for recipient_id in recipient_id_list:
         try:
@@ -200,4 +214,6 @@ def get_all_alerts(lib_env):
 
     lib_env -- LibraryEnvironment
     """
-    return alert.get_all_alerts(lib_env.get_cib())
+    return alert.get_all_alerts(
+        lib_env.get_cib(sections=REQUIRED_CIB_SECTIONS)
+    )
@@ -65,9 +65,9 @@ from pcs.lib.errors import (
 from pcs.lib.external import is_service_running
 from pcs.lib.pacemaker.live import (
     get_cib,
-    get_cib_xml,
+    get_cib_xml_bytes,
     get_cib_xml_cmd_results,
-    get_cluster_status_xml,
+    get_cluster_status_xml_bytes,
     remove_node,
     verify as verify_cmd,
 )
@@ -138,14 +138,14 @@ def verify(env, verbose=False):
             #be consistent with raising below
             env.report_processor.send()
     else:
-        cib_xml = get_cib_xml(runner)
+        cib_xml = get_cib_xml_bytes(runner)
 
     cib = get_cib(cib_xml)
     fencing_topology.verify(
         env.report_processor,
         get_fencing_topology(cib),
         get_resources(cib),
-        ClusterState(get_cluster_status_xml(runner)).node_section.nodes
+        ClusterState(get_cluster_status_xml_bytes(runner)).node_section.nodes
     )
     #can raise
     env.report_processor.send()
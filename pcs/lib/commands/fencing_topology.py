@@ -8,7 +8,7 @@ from pcs.lib.cib.tools import (
     get_fencing_topology,
     get_resources,
 )
-from pcs.lib.pacemaker.live import get_cluster_status_xml
+from pcs.lib.pacemaker.live import get_cluster_status_xml_bytes
 from pcs.lib.pacemaker.state import ClusterState
 
 def add_level(
@@ -42,7 +42,7 @@ def add_level(
         target_value,
         devices,
         ClusterState(
-            get_cluster_status_xml(lib_env.cmd_runner())
+            get_cluster_status_xml_bytes(lib_env.cmd_runner())
         ).node_section.nodes,
         force_device,
         force_node
@@ -110,7 +110,7 @@ def verify(lib_env):
         get_fencing_topology(cib),
         get_resources(cib),
         ClusterState(
-            get_cluster_status_xml(lib_env.cmd_runner())
+            get_cluster_status_xml_bytes(lib_env.cmd_runner())
         ).node_section.nodes
     )
     lib_env.report_processor.send()
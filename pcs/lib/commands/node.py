@@ -4,7 +4,7 @@ from pcs.lib import reports
 from pcs.lib.cib.node import update_node_instance_attrs
 from pcs.lib.errors import LibraryError
 from pcs.lib.pacemaker.live import (
-    get_cluster_status_xml,
+    get_cluster_status_xml_bytes,
     get_local_node_name,
 )
 from pcs.lib.pacemaker.state import ClusterState
@@ -16,7 +16,7 @@ def cib_runner_nodes(lib_env, wait):
     runner = lib_env.cmd_runner()
 
     state_nodes = ClusterState(
-        get_cluster_status_xml(runner)
+        get_cluster_status_xml_bytes(runner)
     ).node_section.nodes
 
     yield (lib_env.get_cib(), runner, state_nodes)
@@ -23,6 +23,7 @@ from pcs.lib.pacemaker.values import (
 )
 from pcs.lib.pacemaker.state import (
     ensure_resource_state,
+    get_cluster_state_snapshot,
     info_resource_state,
     is_resource_managed,
     ResourceNotFound,
@@ -38,13 +39,16 @@ def resource_environment(
     wait=False,
     wait_for_resource_ids=None,
     resource_state_reporter=info_resource_state,
-    required_cib_version=None
+    required_cib_version=None,
+    track_cib_changes=False,
 ):
     env.ensure_wait_satisfiable(wait)
-    yield get_resources(env.get_cib(required_cib_version))
+    yield get_resources(
+        env.get_cib(required_cib_version, track_changes=track_cib_changes)
+    )
     env.push_cib(wait=wait)
     if wait is not False and wait_for_resource_ids:
-        state = env.get_cluster_state()
+        state = get_cluster_state_snapshot(env.get_cluster_state())
         env.report_processor.process_list([
             resource_state_reporter(state, res_id)
             for res_id in wait_for_resource_ids
@@ -234,6 +238,7 @@ def create(
             allow_invalid_operation,
             allow_invalid_instance_attributes,
             use_default_operations,
+            id_provider=IdProvider(resources_section),
         )
         if ensure_disabled:
             resource.common.disable(primitive_element)
@@ -314,6 +319,7 @@ def _create_as_clone_common(
             allow_invalid_operation,
             allow_invalid_instance_attributes,
             use_default_operations,
+            id_provider=IdProvider(resources_section),
         )
         clone_element = resource.clone.append_new(
             tag,
@@ -396,6 +402,7 @@ def create_in_group(
             allow_invalid_operation,
             allow_invalid_instance_attributes,
             use_default_operations,
+            id_provider=IdProvider(resources_section),
         )
         if ensure_disabled:
             resource.common.disable(primitive_element)
@@ -484,6 +491,7 @@ def create_into_bundle(
             allow_invalid_operation,
             allow_invalid_instance_attributes,
             use_default_operations,
+            id_provider=IdProvider(resources_section),
         )
         if ensure_disabled:
             resource.common.disable(primitive_element)
@@ -653,7 +661,8 @@ def disable(env, resource_ids, wait):
     mixed wait -- False: no wait, None: wait default timeout, int: wait timeout
     """
     with resource_environment(
-        env, wait, resource_ids, _ensure_disabled_after_wait(True)
+        env, wait, resource_ids, _ensure_disabled_after_wait(True),
+        track_cib_changes=True
     ) as resources_section:
         resource_el_list = _find_resources_or_raise(
             resources_section,
@@ -663,7 +672,7 @@ def disable(env, resource_ids, wait):
             _resource_list_enable_disable(
                 resource_el_list,
                 resource.common.disable,
-                env.get_cluster_state()
+                get_cluster_state_snapshot(env.get_cluster_state())
             )
         )
 
@@ -675,7 +684,8 @@ def enable(env, resource_ids, wait):
     mixed wait -- False: no wait, None: wait default timeout, int: wait timeout
     """
     with resource_environment(
-        env, wait, resource_ids, _ensure_disabled_after_wait(False)
+        env, wait, resource_ids, _ensure_disabled_after_wait(False),
+        track_cib_changes=True
     ) as resources_section:
         resource_el_list = _find_resources_or_raise(
             resources_section,
@@ -686,7 +696,7 @@ def enable(env, resource_ids, wait):
             _resource_list_enable_disable(
                 resource_el_list,
                 resource.common.enable,
-                env.get_cluster_state()
+                get_cluster_state_snapshot(env.get_cluster_state())
             )
         )
 
@@ -714,7 +724,9 @@ def unmanage(env, resource_ids, with_monitor=False):
     strings resource_ids -- ids of the resources to become unmanaged
     bool with_monitor -- disable resources' monitor operations
     """
-    with resource_environment(env) as resources_section:
+    with resource_environment(
+        env, track_cib_changes=True
+    ) as resources_section:
         resource_el_list = _find_resources_or_raise(
             resources_section,
             resource_ids,
@@ -743,7 +755,9 @@ def manage(env, resource_ids, with_monitor=False):
     strings resource_ids -- ids of the resources to become managed
     bool with_monitor -- enable resources' monitor operations
     """
-    with resource_environment(env) as resources_section:
+    with resource_environment(
+        env, track_cib_changes=True
+    ) as resources_section:
         report_list = []
         resource_el_list = _find_resources_or_raise(
             resources_section,
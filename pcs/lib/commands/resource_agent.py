@@ -1,4 +1,9 @@
-from pcs.lib import resource_agent
+from pcs import settings
+from pcs.common import env_file_role_codes
+from pcs.common.tools import format_environment_error
+from pcs.lib import reports, resource_agent
+from pcs.lib.errors import LibraryError
+from pcs.lib.external import iter_parallel_run
 
 
 def list_standards(lib_env):
@@ -38,23 +43,31 @@ def list_agents_for_standard_and_provider(lib_env, standard_provider=None):
     )
 
 
-def list_agents(lib_env, describe=True, search=None):
+def list_agents(lib_env, describe=True, search=None, on_agent_loaded=None):
     """
     List all resource agents on the local host, optionally filtered and
         described
     bool describe load and return agents' description as well
     string search return only agents which name contains this string
+    callable on_agent_loaded called with each agent as soon as it is loaded,
+        in the order of the returned list
     """
     runner = lib_env.cmd_runner()
 
     # list agents for all standards and providers
-    agent_names = []
-    for std in resource_agent.list_resource_agents_standards_and_providers(
+    std_list = resource_agent.list_resource_agents_standards_and_providers(
         runner
-    ):
+    )
+    std_agents_list = iter_parallel_run(
+        runner,
+        resource_agent.list_resource_agents,
+        std_list,
+        settings.agent_metadata_parallel_jobs
+    )
+    agent_names = []
+    for std, agent_list in zip(std_list, std_agents_list):
         agent_names += [
-            "{0}:{1}".format(std, agent)
-            for agent in resource_agent.list_resource_agents(runner, std)
+            "{0}:{1}".format(std, agent) for agent in agent_list
         ]
     agent_names.sort(
         # works with both str and unicode in both python 2 and 3
@@ -65,12 +78,14 @@ def list_agents(lib_env, describe=True, search=None):
         agent_names,
         describe,
         search,
-        resource_agent.ResourceAgent
+        resource_agent.ResourceAgent,
+        on_agent_loaded,
     )
 
 
 def _complete_agent_list(
-    runner, agent_names, describe, search, metadata_class
+    runner, agent_names, describe, search, metadata_class,
+    on_agent_loaded=None
 ):
     # filter agents by name if requested
     if search:
@@ -79,15 +94,12 @@ def _complete_agent_list(
             name for name in agent_names if search_lower in name.lower()
         ]
 
-    # complete the output and load descriptions if requested
-    agent_list = []
-    for name in agent_names:
+    def get_agent_info(worker_runner, name):
         try:
-            agent_metadata = metadata_class(runner, name)
+            agent_metadata = metadata_class(worker_runner, name)
             if describe:
-                agent_list.append(agent_metadata.get_description_info())
-            else:
-                agent_list.append(agent_metadata.get_name_info())
+                return agent_metadata.get_description_info()
+            return agent_metadata.get_name_info()
         except resource_agent.ResourceAgentError:
             #we don't return it in the list:
             #
@@ -102,8 +114,25 @@ def _complete_agent_list(
             #Providing a warning is not the way (currently). Other components
             #read this list and do not expect warnings there. Using the stderr
             #(to separate warnings) is currently difficult.
-            pass
-    return agent_list
+            return None
+
+    # complete the output and load descriptions if requested, metadata are
+    # loaded only for descriptions
+    agent_info_list = []
+    for agent_info in iter_parallel_run(
+        runner,
+        get_agent_info,
+        agent_names,
+        settings.agent_metadata_parallel_jobs if describe else 1
+    ):
+        if agent_info is None:
+            continue
+        agent_info_list.append(agent_info)
+        # Loading descriptions of all agents takes a while. The callback runs
+        # in the calling thread, so the caller can show agents loaded so far.
+        if on_agent_loaded is not None:
+            on_agent_loaded(agent_info)
+    return agent_info_list
 
 
 def describe_agent(lib_env, agent_name):
@@ -118,3 +147,64 @@ def describe_agent(lib_env, agent_name):
         absent_agent_supported=False
     )
     return agent.get_full_info()
+
+
+def clear_metadata_cache(lib_env):
+    """
+    Remove all agents' metadata from the cache
+    """
+    # pylint: disable=unused-argument
+    _clear_metadata_cache(_get_metadata_cache())
+
+
+def rebuild_metadata_cache(lib_env):
+    """
+    Remove all agents' metadata from the cache and cache metadata and lists
+        of all agents installed on the local host
+    """
+    cache = _get_metadata_cache()
+    _clear_metadata_cache(cache)
+    runner = lib_env.cmd_runner()
+
+    agent_list = []
+    for std in resource_agent.list_resource_agents_standards_and_providers(
+        runner
+    ):
+        for agent_name in resource_agent.list_resource_agents(runner, std):
+            agent_list.append(
+                (resource_agent.ResourceAgent, "{0}:{1}".format(std, agent_name))
+            )
+    for agent_name in resource_agent.list_stonith_agents(runner):
+        agent_list.append((resource_agent.StonithAgent, agent_name))
+
+    for agent_class, agent_name in agent_list:
+        try:
+            # loading the metadata puts them to the cache
+            agent_class(runner, agent_name).is_valid_metadata()
+        except resource_agent.ResourceAgentError:
+            # agents with invalid names are not cached, same as agents
+            # without metadata
+            pass
+    try:
+        resource_agent.FencedMetadata(runner).get_parameters()
+    except resource_agent.ResourceAgentError:
+        pass
+
+
+def _get_metadata_cache():
+    cache = resource_agent.get_metadata_cache()
+    if cache is None:
+        raise LibraryError(reports.agent_metadata_cache_disabled())
+    return cache
+
+
+def _clear_metadata_cache(cache):
+    try:
+        cache.clear()
+    except EnvironmentError as e:
+        raise LibraryError(reports.file_io_error(
+            env_file_role_codes.AGENT_METADATA_CACHE,
+            file_path=cache.cache_dir,
+            reason=format_environment_error(e),
+            operation="clear",
+        ))
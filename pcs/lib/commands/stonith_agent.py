@@ -2,11 +2,13 @@ from pcs.lib import resource_agent
 from pcs.lib.commands.resource_agent import _complete_agent_list
 
 
-def list_agents(lib_env, describe=True, search=None):
+def list_agents(lib_env, describe=True, search=None, on_agent_loaded=None):
     """
     List all stonith agents on the local host, optionally filtered and described
     bool describe load and return agents' description as well
     string search return only agents which name contains this string
+    callable on_agent_loaded called with each agent as soon as it is loaded,
+        in the order of the returned list
     """
     runner = lib_env.cmd_runner()
     agent_names = resource_agent.list_stonith_agents(runner)
@@ -15,7 +17,8 @@ def list_agents(lib_env, describe=True, search=None):
         agent_names,
         describe,
         search,
-        resource_agent.StonithAgent
+        resource_agent.StonithAgent,
+        on_agent_loaded,
     )
 
 
@@ -1,13 +1,9 @@
 from functools import partial
-import logging
 from unittest import mock, TestCase
 
 from pcs.common import report_codes
 from pcs.lib.errors import ReportItemSeverity as Severities
-from pcs.lib.env import LibraryEnvironment
-from pcs.lib.external import CommandRunner
 from pcs.test.tools.command_env import get_env_tools
-from pcs.test.tools.custom_mock import MockLibraryReportProcessor
 
 import pcs.lib.commands.alert as cmd_alert
 
@@ -65,7 +61,7 @@ class CreateAlertTest(TestCase):
 
     def test_create_no_upgrade(self):
         (self.config
-            .runner.cib.load()
+            .runner.cib.load(sections=["configuration"])
             .env.push_cib(optional_in_conf=self.fixture_final_alerts)
         )
         cmd_alert.create_alert(
@@ -84,7 +80,8 @@ class CreateAlertTest(TestCase):
         (self.config
             .runner.cib.load(
                 filename="cib-empty.xml",
-                name="load_cib_old_version"
+                name="load_cib_old_version",
+                sections=["configuration"]
             )
             .runner.cib.upgrade()
             .runner.cib.load()
@@ -167,7 +164,10 @@ class UpdateAlertTest(TestCase):
         </alerts>
         """
         (self.config
-            .runner.cib.load(optional_in_conf=self.fixture_initial_alerts)
+            .runner.cib.load(
+                optional_in_conf=self.fixture_initial_alerts,
+                sections=["configuration"]
+            )
             .env.push_cib(
                 replace={"./configuration/alerts": fixture_final_alerts}
             )
@@ -186,7 +186,10 @@ class UpdateAlertTest(TestCase):
 
     def test_update_instance_attribute(self):
         (self.config
-            .runner.cib.load(optional_in_conf=self.fixture_initial_alerts)
+            .runner.cib.load(
+                optional_in_conf=self.fixture_initial_alerts,
+                sections=["configuration"]
+            )
             .env.push_cib(
                 replace={
                     './configuration/alerts/alert[@id="my-alert"]/'
@@ -217,7 +220,8 @@ class UpdateAlertTest(TestCase):
                     <alerts>
                         <alert id="alert" path="path"/>
                     </alerts>
-                """
+                """,
+                sections=["configuration"]
             )
         )
         self.env_assist.assert_raise_library_error(
@@ -251,7 +255,8 @@ class RemoveAlertTest(TestCase):
                     <alert id="alert3" path="/path"/>
                     <alert id="alert4" path="/path"/>
                 </alerts>
-            """
+            """,
+            sections=["configuration"]
         )
 
     def test_one_alert(self):
@@ -327,11 +332,14 @@ class AddRecipientTest(TestCase):
                         <recipient id="alert-recipient" value="value1"/>
                     </alert>
                 </alerts>
-            """
+            """,
+            sections=["configuration"]
         )
 
     def test_value_not_defined(self):
         self.config.remove("runner.cib.load")
+        self.config.remove("runner.cib.load.configuration")
+        self.config.remove("runner.cib.load.version")
         self.env_assist.assert_raise_library_error(
             lambda: cmd_alert.add_recipient(
                 self.env_assist.get_env(), "unknown", "", {}, {}
@@ -492,11 +500,14 @@ class UpdateRecipientTest(TestCase):
                         </recipient>
                     </alert>
                 </alerts>
-            """
+            """,
+            sections=["configuration"]
         )
 
     def test_empty_value(self):
         self.config.remove("runner.cib.load")
+        self.config.remove("runner.cib.load.configuration")
+        self.config.remove("runner.cib.load.version")
         self.env_assist.assert_raise_library_error(
             lambda: cmd_alert.update_recipient(
                 self.env_assist.get_env(),
@@ -601,7 +612,8 @@ class RemoveRecipientTest(TestCase):
     def setUp(self):
         self.env_assist, self.config = get_env_tools(test_case=self)
         self.config.runner.cib.load(
-            optional_in_conf=self.fixture_initial_alerts
+            optional_in_conf=self.fixture_initial_alerts,
+            sections=["configuration"]
         )
 
     def test_recipient_not_found(self):
@@ -660,17 +672,13 @@ class RemoveRecipientTest(TestCase):
 @mock.patch("pcs.lib.cib.alert.get_all_alerts")
 class GetAllAlertsTest(TestCase):
     def setUp(self):
-        self.mock_log = mock.MagicMock(spec_set=logging.Logger)
-        self.mock_run = mock.MagicMock(spec_set=CommandRunner)
-        self.mock_rep = MockLibraryReportProcessor()
-        self.mock_env = LibraryEnvironment(
-            self.mock_log, self.mock_rep, cib_data='<cib/>'
-        )
+        self.env_assist, self.config = get_env_tools(test_case=self)
 
     def test_success(self, mock_alerts):
         mock_alerts.return_value = [{"id": "alert"}]
+        self.config.runner.cib.load(sections=["configuration"])
         self.assertEqual(
             [{"id": "alert"}],
-            cmd_alert.get_all_alerts(self.mock_env)
+            cmd_alert.get_all_alerts(self.env_assist.get_env())
         )
         self.assertEqual(1, mock_alerts.call_count)
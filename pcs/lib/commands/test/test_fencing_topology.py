@@ -28,7 +28,7 @@ patch_command = create_patcher("pcs.lib.commands.fencing_topology")
 @patch_command("get_fencing_topology")
 @patch_env("push_cib")
 @patch_command("ClusterState")
-@patch_command("get_cluster_status_xml")
+@patch_command("get_cluster_status_xml_bytes")
 @patch_env("get_cib")
 @patch_env("cmd_runner", lambda self: "mocked cmd_runner")
 class AddLevel(TestCase):
@@ -220,7 +220,7 @@ class RemoveLevelsByParams(TestCase):
 @patch_command("get_fencing_topology")
 @patch_env("push_cib")
 @patch_command("ClusterState")
-@patch_command("get_cluster_status_xml")
+@patch_command("get_cluster_status_xml_bytes")
 @patch_env("get_cib", lambda self: "mocked cib")
 @patch_env("cmd_runner", lambda self: "mocked cmd_runner")
 class Verify(TestCase):
@@ -256,7 +256,7 @@ class CibRunnerNodes(TestCase):
     @patch_env("cmd_runner", lambda self: "mocked cmd_runner")
     @patch_env("ensure_wait_satisfiable")
     @patch_command("ClusterState")
-    @patch_command("get_cluster_status_xml")
+    @patch_command("get_cluster_status_xml_bytes")
     def test_wire_together_all_expected_dependecies(
         self, get_cluster_status_xml, ClusterState, ensure_wait_satisfiable,
         push_cib
@@ -153,6 +153,8 @@ class TestListAgentsForStandardAndProvider(TestCase):
         ],
     }.get(standard, [])
 )
+# the fake runner cannot provide runners for parallel workers
+@mock.patch("pcs.settings.agent_metadata_parallel_jobs", 1)
 @mock.patch.object(
     LibraryEnvironment,
     "cmd_runner",
@@ -279,6 +281,32 @@ class TestListAgents(TestCase):
         )
 
 
+    def test_agents_passed_to_callback_while_listing(self):
+        loaded_agents = []
+        command_returned = []
+
+        def on_agent_loaded(agent_info):
+            # the callback must be called before the command returns
+            self.assertEqual([], command_returned)
+            loaded_agents.append(agent_info["name"])
+
+        agent_list = lib.list_agents(
+            self.lib_env, False, "te", on_agent_loaded=on_agent_loaded
+        )
+        command_returned.append(True)
+        self.assertEqual(
+            [
+                "ocf:test:Delay",
+                "ocf:test:Stateful",
+                "service:pacemaker_remote",
+            ],
+            loaded_agents
+        )
+        self.assertEqual(
+            loaded_agents, [agent_info["name"] for agent_info in agent_list]
+        )
+
+
 class CompleteAgentList(TestCase):
     def test_skip_agent_name_when_InvalidResourceAgentName_raised(self):
         invalid_agent_name =  "systemd:lvm2-pvscan@252:2"#suppose it is invalid
@@ -458,3 +486,89 @@ class DescribeAgentUtf8(TestCase):
                 ],
             }
         )
+
+
+@mock.patch.object(
+    LibraryEnvironment,
+    "cmd_runner",
+    lambda self: "mock_runner"
+)
+class MetadataCacheTest(TestCase):
+    def setUp(self):
+        self.lib_env = LibraryEnvironment(
+            mock.MagicMock(logging.Logger), MockLibraryReportProcessor()
+        )
+        self.cache = mock.Mock(spec_set=["clear", "cache_dir"])
+        self.cache.cache_dir = "/var/lib/pcsd/agent_metadata"
+        lib_ra.set_metadata_cache(self.cache)
+        self.addCleanup(lib_ra.set_metadata_cache, None)
+
+    def test_clear(self):
+        lib.clear_metadata_cache(self.lib_env)
+        self.cache.clear.assert_called_once_with()
+
+    def test_clear_error(self):
+        self.cache.clear.side_effect = PermissionError(
+            13, "Permission denied", "/var/lib/pcsd/agent_metadata/x.json"
+        )
+        assert_raise_library_error(
+            lambda: lib.clear_metadata_cache(self.lib_env),
+            (
+                severity.ERROR,
+                report_codes.FILE_IO_ERROR,
+                {
+                    "file_role": "AGENT_METADATA_CACHE",
+                    "file_path": "/var/lib/pcsd/agent_metadata",
+                    "reason": "Permission denied: "
+                        "'/var/lib/pcsd/agent_metadata/x.json'"
+                    ,
+                    "operation": "clear",
+                }
+            )
+        )
+
+    def test_disabled(self):
+        lib_ra.set_metadata_cache(None)
+        for command in (lib.clear_metadata_cache, lib.rebuild_metadata_cache):
+            with self.subTest(command=command.__name__):
+                assert_raise_library_error(
+                    lambda: command(self.lib_env),
+                    (
+                        severity.ERROR,
+                        report_codes.AGENT_METADATA_CACHE_DISABLED,
+                        {}
+                    )
+                )
+
+    @mock.patch.object(lib_ra.FencedMetadata, "get_parameters")
+    @mock.patch.object(
+        lib_ra.CrmAgent, "is_valid_metadata", autospec=True
+    )
+    @mock.patch("pcs.lib.resource_agent.list_stonith_agents")
+    @mock.patch("pcs.lib.resource_agent.list_resource_agents")
+    @mock.patch(
+        "pcs.lib.resource_agent.list_resource_agents_standards_and_providers"
+    )
+    def test_rebuild(
+        self, mock_standards, mock_agents, mock_stonith_agents,
+        mock_is_valid, mock_fenced
+    ):
+        mock_standards.return_value = ["ocf:heartbeat", "systemd"]
+        mock_agents.side_effect = lambda runner, std: {
+            "ocf:heartbeat": ["Dummy", "in:valid"],
+            "systemd": ["chronyd"],
+        }[std]
+        mock_stonith_agents.return_value = ["fence_xvm"]
+
+        lib.rebuild_metadata_cache(self.lib_env)
+
+        self.cache.clear.assert_called_once_with()
+        self.assertEqual(
+            [
+                "ocf:heartbeat:Dummy",
+                "systemd:chronyd",
+                "fence_xvm",
+            ],
+            [call[0][0].get_name() for call in mock_is_valid.call_args_list]
+        )
+        mock_fenced.assert_called_once_with()
@@ -1,4 +1,5 @@
 import logging
+import threading
 from lxml import etree
 from unittest import mock, TestCase
 
@@ -26,6 +27,8 @@ from pcs.lib.commands import stonith_agent as lib
         "fence_xvm",
     ]
 )
+# the fake runner cannot provide runners for parallel workers
+@mock.patch("pcs.settings.agent_metadata_parallel_jobs", 1)
 @mock.patch.object(
     LibraryEnvironment,
     "cmd_runner",
@@ -143,6 +146,27 @@ class TestListAgents(TestCase):
         )
 
 
+    @mock.patch.object(lib_ra.Agent, "_get_metadata", autospec=True)
+    def test_describe_agents_passed_to_callback(self, mock_metadata):
+        mock_metadata.side_effect = lambda self: etree.XML(
+            "<resource-agent><shortdesc>{0}</shortdesc></resource-agent>"
+            .format(self.get_name())
+        )
+        loaded_agents = []
+
+        def on_agent_loaded(agent_info):
+            # the agents are loaded in threads, the callback is called from
+            # the thread running the command
+            self.assertIs(threading.main_thread(), threading.current_thread())
+            loaded_agents.append(agent_info["shortdesc"])
+
+        lib.list_agents(self.lib_env, True, None, on_agent_loaded)
+        self.assertEqual(
+            ["fence_apc", "fence_dummy", "fence_xvm"],
+            loaded_agents
+        )
+
+
 @mock.patch.object(lib_ra.StonithAgent, "_load_metadata", autospec=True)
 @mock.patch.object(lib_ra.FencedMetadata, "get_parameters", lambda self: [])
 @mock.patch.object(LibraryEnvironment, "cmd_runner", lambda self: "mock_runner")
@@ -166,6 +166,13 @@ class QuorumStatus():
         """
         return bool(self._data["quorate"])
 
+    @property
+    def node_names(self):
+        """
+        Names of nodes in the corosync membership
+        """
+        return [node_info["name"] for node_info in self._data["node_list"]]
+
     @property
     def votes_needed_for_quorum(self):
         """
@@ -219,6 +219,9 @@ class QuorumStatusParse(TestCase):
                 {"name": "rh70-node3", "votes": 1, "local": False},
             ],
         )
+        self.assertEqual(
+            status.node_names, ["rh70-node1", "rh70-node2", "rh70-node3"]
+        )
 
     def test_quorate_with_qdevice(self):
         status = lib.QuorumStatus.from_string(dedent("""\
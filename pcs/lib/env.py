@@ -1,7 +1,12 @@
+from copy import deepcopy
+import logging
+
 from pcs.common.node_communicator import NodeCommunicatorFactory
 from pcs.common.tools import Version
 from pcs.lib import reports
 from pcs.lib.booth.env import BoothEnv
+from pcs.lib.cib import journal as cib_journal
+from pcs.lib.cib.diff import diff_cibs, UnsupportedCibDiff
 from pcs.lib.cib.tools import get_cib_crm_feature_set
 from pcs.lib.pacemaker.env import PacemakerEnv
 from pcs.lib.communication import qdevice
@@ -31,12 +36,14 @@ from pcs.lib.node_communication import (
     NodeTargetLibFactory,
 )
 from pcs.lib.pacemaker.live import (
+    CIB_SECTIONS,
     diff_cibs_xml,
     ensure_cib_version,
     ensure_wait_for_idle_support,
     get_cib,
-    get_cib_xml,
-    get_cluster_status_xml,
+    get_cib_sections_xml_bytes,
+    get_cib_xml_bytes,
+    get_cluster_status_xml_bytes,
     push_cib_diff_xml,
     replace_cib_configuration,
     wait_for_idle,
@@ -64,7 +71,12 @@ class LibraryEnvironment(object):
         known_hosts_getter=None,
         cluster_conf_data=None,
         request_timeout=None,
+        debug=False,
     ):
+        """
+        bool debug -- capture debug info of communication with other nodes.
+            It is captured anyway if the logger is enabled for debug messages.
+        """
         self._logger = logger
         self._report_processor = report_processor
         self._user_login = user_login
@@ -90,11 +102,14 @@ class LibraryEnvironment(object):
         self.__loaded_cib_diff_source = None
         self.__loaded_cib_diff_source_feature_set = None
         self.__loaded_cib_to_modify = None
+        self.__loaded_cib_original = None
+        self.__loaded_cib_journal = None
         self._communicator_factory = NodeCommunicatorFactory(
             LibCommunicatorLogger(self.logger, self.report_processor),
             self.user_login,
             self.user_groups,
-            self._request_timeout
+            self._request_timeout,
+            debug=(debug or self.logger.isEnabledFor(logging.DEBUG)),
         )
 
         self.__timeout_cache = {}
@@ -121,10 +136,39 @@ class LibraryEnvironment(object):
             self._is_cman_cluster = is_cman_cluster(self.cmd_runner())
         return self._is_cman_cluster
 
-    def get_cib(self, minimal_version=None):
+    def get_cib(
+        self, minimal_version=None, track_changes=False, sections=None
+    ):
+        """
+        Load the CIB and return it for modifications
+
+        pcs.common.tools.Version minimal_version -- upgrade the CIB to be
+            valid against this version of pacemaker at least
+        bool track_changes -- record changes of the CIB and push them without
+            comparing the whole loaded and modified CIBs. Only use this if all
+            the changes are made by functions reporting them to
+            pcs.lib.cib.journal. If no changes have been recorded, the whole
+            CIBs are compared anyway.
+        iterable sections -- load only these top level sections of the CIB
+            (pcs.lib.pacemaker.live.CIB_SECTIONS), None means the whole CIB.
+            The configuration section must be loaded for the CIB to be pushed.
+        """
         if self.__loaded_cib_diff_source is not None:
             raise AssertionError("CIB has already been loaded")
-        self.__loaded_cib_diff_source = get_cib_xml(self.cmd_runner())
+        if sections is None:
+            self.__loaded_cib_diff_source = get_cib_xml_bytes(
+                self.cmd_runner()
+            )
+        else:
+            if not set(sections).issubset(CIB_SECTIONS):
+                raise AssertionError(
+                    "Unknown CIB sections: {0}".format(
+                        ", ".join(sorted(set(sections) - set(CIB_SECTIONS)))
+                    )
+                )
+            self.__loaded_cib_diff_source = get_cib_sections_xml_bytes(
+                self.cmd_runner(), sections
+            )
         self.__loaded_cib_to_modify = get_cib(self.__loaded_cib_diff_source)
         if minimal_version is not None:
             upgraded_cib = ensure_cib_version(
@@ -148,6 +192,14 @@ class LibraryEnvironment(object):
             or
             Version(0, 0, 0)
         )
+        if track_changes:
+            self.__loaded_cib_journal = cib_journal.start(
+                self.__loaded_cib_to_modify
+            )
+        else:
+            # Keep the original tree to diff the modified one against it.
+            # Copying a tree is much faster than parsing the CIB again.
+            self.__loaded_cib_original = deepcopy(self.__loaded_cib_to_modify)
         return self.__loaded_cib_to_modify
 
     @property
@@ -157,7 +209,9 @@ class LibraryEnvironment(object):
         return self.__loaded_cib_to_modify
 
     def get_cluster_state(self):
-        return get_cluster_state_dom(get_cluster_status_xml(self.cmd_runner()))
+        return get_cluster_state_dom(
+            get_cluster_status_xml_bytes(self.cmd_runner())
+        )
 
     def _get_wait_timeout(self, wait):
         if wait is False:
@@ -233,22 +287,57 @@ class LibraryEnvironment(object):
         )
 
     def __main_push_cib_diff(self, cmd_runner):
-        cib_diff_xml = diff_cibs_xml(
-            cmd_runner,
-            self.report_processor,
-            self.__loaded_cib_diff_source,
-            etree_to_str(self.__loaded_cib_to_modify)
-        )
+        try:
+            cib_diff = self.__get_cib_diff()
+            cib_diff_xml = (
+                etree_to_str(cib_diff) if cib_diff is not None else ""
+            )
+        except UnsupportedCibDiff as e:
+            self.logger.debug(
+                "Unable to diff CIBs in pcs, using crm_diff: {0}".format(e)
+            )
+            cib_diff_xml = diff_cibs_xml(
+                cmd_runner,
+                self.report_processor,
+                self.__loaded_cib_diff_source,
+                etree_to_str(self.__loaded_cib_to_modify)
+            )
         if cib_diff_xml:
             push_cib_diff_xml(cmd_runner, cib_diff_xml)
 
+    def __get_cib_diff(self):
+        if self.__loaded_cib_journal is not None:
+            try:
+                patchset = self.__loaded_cib_journal.get_patchset()
+                if patchset is not None:
+                    return patchset
+                # Nothing has been recorded. The CIB may have been changed by
+                # functions not reporting their changes, so compare the whole
+                # CIBs not to lose such changes.
+            except UnsupportedCibDiff as e:
+                self.logger.debug(
+                    "Unable to create CIB diff from recorded changes, "
+                    "comparing whole CIBs: {0}".format(e)
+                )
+        cib_original = self.__loaded_cib_original
+        if cib_original is None:
+            # changes have been tracked, the original tree has not been kept
+            cib_original = get_cib(self.__loaded_cib_diff_source)
+        return diff_cibs(cib_original, self.__loaded_cib_to_modify)
+
     def __do_push_cib(self, cmd_runner, push_strategy, wait):
         timeout = self._get_wait_timeout(wait)
-        push_strategy()
+        try:
+            push_strategy()
+        finally:
+            if self.__loaded_cib_journal is not None:
+                cib_journal.stop(self.__loaded_cib_journal)
+                self.__loaded_cib_journal = None
         self._cib_upgrade_reported = False
         self.__loaded_cib_diff_source = None
         self.__loaded_cib_diff_source_feature_set = None
         self.__loaded_cib_to_modify = None
+        self.__loaded_cib_original = None
         if self.is_cib_live and timeout is not False:
             wait_for_idle(cmd_runner, timeout)
 
@@ -404,7 +493,7 @@ class LibraryEnvironment(object):
             self.__get_auth_tokens(),
             self.user_login,
             self.user_groups,
-            self._request_timeout
+            self._request_timeout,
         )
 
     def __get_known_hosts(self):
@@ -1,17 +1,17 @@
 import base64
 import io
 import json
+import logging
 import os
 import re
 from shlex import quote as shell_quote
-import signal
 import subprocess
 from urllib.parse import urlencode
 
 from pcs import settings
 from pcs.common import pcs_pycurl as pycurl
 from pcs.common.system import is_systemd as is_systemctl
-from pcs.common.tools import join_multilines
+from pcs.common.tools import iter_parallel, join_multilines
 from pcs.lib import reports
 from pcs.lib.errors import LibraryError, ReportItemSeverity
 
@@ -316,6 +316,16 @@ class CommandRunner(object):
     def env_vars(self):
         return self._env_vars.copy()
 
+    @property
+    def reporter(self):
+        return self._reporter
+
+    def with_reporter(self, reporter):
+        """
+        Get a runner with the same settings which sends reports to reporter
+        """
+        return self.__class__(self._logger, reporter, self._env_vars)
+
     def run(
         self, args, stdin_string=None, env_extend=None, binary_output=False
     ):
@@ -323,30 +333,24 @@ class CommandRunner(object):
         # set own PATH or CIB_file, we must allow it. I.e. it wants to run
         # a pacemaker tool on a CIB in a file but cannot afford the risk of
         # changing the CIB in the file specified by the user.
-        env_vars = self._env_vars.copy()
-        env_vars.update(
-            dict(env_extend) if env_extend else dict()
-        )
+        # Popen does not modify the environment, so it is copied only when it
+        # is being extended.
+        env_vars = self._env_vars
+        if env_extend:
+            env_vars = self._env_vars.copy()
+            env_vars.update(env_extend)
 
         log_args = " ".join([shell_quote(x) for x in args])
-        self._logger.debug(
-            "Running: {args}\nEnvironment:{env_vars}{stdin_string}".format(
-                args=log_args,
-                stdin_string=("" if not stdin_string else (
-                    "\n--Debug Input Start--\n{0}\n--Debug Input End--"
-                    .format(stdin_string)
-                )),
-                env_vars=("" if not env_vars else (
-                    "\n" + "\n".join([
-                        "  {0}={1}".format(key, val)
-                        for key, val in sorted(env_vars.items())
-                    ])
-                ))
+        # Formatting the messages copies the whole input and output, which may
+        # be megabytes long (e.g. a CIB), so it is done only if they are logged.
+        log_debug = self._logger.isEnabledFor(logging.DEBUG)
+        if log_debug:
+            self._logger.debug(
+                _format_run_started_log(log_args, stdin_string, env_vars)
             )
-        )
         self._reporter.process(
             reports.run_external_process_started(
-                log_args, stdin_string, env_vars
+                log_args, _cut_for_report(stdin_string), env_vars
             )
         )
 
@@ -361,9 +365,11 @@ class CommandRunner(object):
                 ),
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                preexec_fn=(
-                    lambda: signal.signal(signal.SIGPIPE, signal.SIG_DFL)
-                ),
+                # Python ignores SIGPIPE, the default action is restored in
+                # the child process. Unlike preexec_fn, this is done without
+                # running python code in the child, which allows the child to
+                # be spawned in a fast way.
+                restore_signals=True,
                 close_fds=True,
                 shell=False,
                 env=env_vars,
@@ -377,24 +383,107 @@ class CommandRunner(object):
                 reports.run_external_process_error(log_args, e.strerror)
             )
 
-        self._logger.debug(
-            (
-                "Finished running: {args}\nReturn value: {retval}"
-                + "\n--Debug Stdout Start--\n{out_std}\n--Debug Stdout End--"
-                + "\n--Debug Stderr Start--\n{out_err}\n--Debug Stderr End--"
-            ).format(
-                args=log_args,
-                retval=retval,
-                out_std=out_std,
-                out_err=out_err
+        if log_debug:
+            self._logger.debug(
+                _format_run_finished_log(log_args, retval, out_std, out_err)
             )
-        )
         self._reporter.process(reports.run_external_process_finished(
-            log_args, retval, out_std, out_err
+            log_args,
+            retval,
+            _cut_for_report(out_std),
+            _cut_for_report(out_err)
         ))
         return out_std, out_err, retval
 
 
+class _ReportBuffer(object):
+    """
+    Report processor keeping reports to be processed later by another one
+    """
+    def __init__(self):
+        self.report_item_list = []
+
+    def process(self, report_item):
+        self.report_item_list.append(report_item)
+
+
+def iter_parallel_run(runner, worker, arg_list, max_workers):
+    """
+    Run worker for each item of arg_list in threads, yield its return values
+    in the order of arg_list like iter_parallel does. Report processors are not
+    thread-safe, so each worker gets its own runner. Reports of a worker are
+    processed by the reporter of the runner in the calling thread when its
+    return value is to be yielded.
+
+    CommandRunner runner -- runner to be used by the workers
+    callable worker -- takes a runner and one item of arg_list
+    iterable arg_list -- arguments for the worker
+    int max_workers -- maximal number of workers running at the same time
+    """
+    if max_workers < 2:
+        for arg in arg_list:
+            yield worker(runner, arg)
+        return
+
+    def run_worker(arg):
+        report_buffer = _ReportBuffer()
+        return (
+            worker(runner.with_reporter(report_buffer), arg),
+            report_buffer.report_item_list,
+        )
+
+    for result, report_item_list in iter_parallel(
+        run_worker, arg_list, max_workers
+    ):
+        for report_item in report_item_list:
+            runner.reporter.process(report_item)
+        yield result
+
+
+def _format_run_started_log(log_args, stdin_string, env_vars):
+    return "Running: {args}\nEnvironment:{env_vars}{stdin_string}".format(
+        args=log_args,
+        stdin_string=("" if not stdin_string else (
+            "\n--Debug Input Start--\n{0}\n--Debug Input End--"
+            .format(stdin_string)
+        )),
+        env_vars=("" if not env_vars else (
+            "\n" + "\n".join([
+                "  {0}={1}".format(key, val)
+                for key, val in sorted(env_vars.items())
+            ])
+        ))
+    )
+
+def _format_run_finished_log(log_args, retval, out_std, out_err):
+    return (
+        "Finished running: {args}\nReturn value: {retval}"
+        + "\n--Debug Stdout Start--\n{out_std}\n--Debug Stdout End--"
+        + "\n--Debug Stderr Start--\n{out_err}\n--Debug Stderr End--"
+    ).format(
+        args=log_args,
+        retval=retval,
+        out_std=out_std,
+        out_err=out_err
+    )
+
+def _cut_for_report(data):
+    """
+    Shorten input or output of a process to be put to a report
+
+    string or bytes data -- the input or output, may be None
+    """
+    limit = settings.external_process_report_output_limit
+    if data is None or limit is None or len(data) <= limit:
+        return data
+    note = "\n--Debug Output Cut, {0} more characters not shown--".format(
+        len(data) - limit
+    )
+    if isinstance(data, bytes):
+        return data[:limit] + note.replace("characters", "bytes").encode()
+    return data[:limit] + note
+
+
 # deprecated
 class NodeCommunicationException(Exception):
     # pylint: disable=super-init-not-called
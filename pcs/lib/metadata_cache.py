@@ -0,0 +1,156 @@
+"""
+Metadata of agents and pacemaker daemons are obtained by running external
+programs, which is slow. This module stores them on disk so they can be shared
+by all pcs processes.
+
+Each entry is stored along with the size and modification time of the files
+the metadata come from (e.g. an agent's executable and a pacemaker binary). An
+entry is ignored once any of the files changes, so the cache does not need to
+be cleared when agents or pacemaker are upgraded. Entries are written to
+temporary files and renamed, so readers never see a partially written entry.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+
+_ENTRY_SUFFIX = ".json"
+_TMP_PREFIX = ".tmp-"
+
+
+class MetadataCache(object):
+    def __init__(self, cache_dir):
+        """
+        string cache_dir -- directory to store the cached metadata in
+        """
+        self._cache_dir = cache_dir
+
+    @property
+    def cache_dir(self):
+        return self._cache_dir
+
+    def get(self, name, source_path_list):
+        """
+        Return cached metadata or None if they are not cached or outdated
+
+        string name -- name of the metadata owner, e.g. an agent's full name
+        iterable source_path_list -- files the metadata are produced from
+        """
+        fingerprint = _get_fingerprint(source_path_list)
+        if fingerprint is None:
+            return None
+        try:
+            with open(self._get_entry_path(name)) as entry_file:
+                entry = json.load(entry_file)
+        except (EnvironmentError, ValueError):
+            return None
+        if (
+            not isinstance(entry, dict)
+            or
+            entry.get("name") != name
+            or
+            entry.get("sources") != fingerprint
+        ):
+            return None
+        return entry.get("metadata")
+
+    def put(self, name, source_path_list, metadata):
+        """
+        Store metadata to the cache, return True on success
+
+        string name -- name of the metadata owner, e.g. an agent's full name
+        iterable source_path_list -- files the metadata are produced from
+        string metadata -- metadata to be stored
+        """
+        fingerprint = _get_fingerprint(source_path_list)
+        if fingerprint is None:
+            return False
+        return self._put(name, fingerprint, metadata)
+
+    def load(self, name, source_path_list, loader):
+        """
+        Return cached metadata, get them by the loader if they are not cached
+
+        string name -- name of the metadata owner, e.g. an agent's full name
+        iterable source_path_list -- files the metadata are produced from
+        callable loader -- returns the metadata, it is not expected to return
+            if the metadata cannot be obtained
+        """
+        metadata = self.get(name, source_path_list)
+        if metadata is not None:
+            return metadata
+        # Get the state of the sources before loading the metadata. If the
+        # sources change meanwhile, the entry is outdated on the next access.
+        fingerprint = _get_fingerprint(source_path_list)
+        metadata = loader()
+        if fingerprint is not None:
+            self._put(name, fingerprint, metadata)
+        return metadata
+
+    def clear(self):
+        """
+        Remove all entries from the cache, raise EnvironmentError on failure
+        """
+        try:
+            file_list = os.listdir(self._cache_dir)
+        except FileNotFoundError:
+            file_list = []
+        for file_name in file_list:
+            if (
+                file_name.endswith(_ENTRY_SUFFIX)
+                or
+                file_name.startswith(_TMP_PREFIX)
+            ):
+                try:
+                    os.remove(os.path.join(self._cache_dir, file_name))
+                except FileNotFoundError:
+                    pass
+        os.makedirs(self._cache_dir, mode=0o700, exist_ok=True)
+
+    def _put(self, name, fingerprint, metadata):
+        tmp_path = None
+        try:
+            os.makedirs(self._cache_dir, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self._cache_dir, prefix=_TMP_PREFIX
+            )
+            with os.fdopen(fd, "w") as tmp_file:
+                json.dump(
+                    {
+                        "name": name,
+                        "sources": fingerprint,
+                        "metadata": metadata,
+                    },
+                    tmp_file
+                )
+            os.rename(tmp_path, self._get_entry_path(name))
+            return True
+        except EnvironmentError:
+            if tmp_path is not None:
+                _remove_file(tmp_path)
+            return False
+
+    def _get_entry_path(self, name):
+        return os.path.join(
+            self._cache_dir,
+            hashlib.sha256(name.encode("utf-8")).hexdigest() + _ENTRY_SUFFIX
+        )
+
+
+def _get_fingerprint(source_path_list):
+    fingerprint = []
+    for path in source_path_list:
+        try:
+            stat = os.stat(path)
+        except EnvironmentError:
+            return None
+        fingerprint.append([path, stat.st_mtime_ns, stat.st_size])
+    return fingerprint
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except EnvironmentError:
+        pass
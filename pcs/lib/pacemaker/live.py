@@ -17,6 +17,11 @@ from pcs.lib.xml_tools import etree_to_str
 __EXITCODE_WAIT_TIMEOUT = 124
 __EXITCODE_CIB_SCOPE_VALID_BUT_NOT_PRESENT = 105
 __RESOURCE_REFRESH_OPERATION_COUNT_THRESHOLD = 100
+# number of attempts to load CIB sections from the same version of the CIB
+__CIB_SECTIONS_LOAD_ATTEMPTS = 3
+
+# top level sections of the CIB which can be loaded separately
+CIB_SECTIONS = ("configuration", "status")
 
 class CrmMonErrorException(LibraryError):
     pass
@@ -25,38 +30,138 @@ class CrmMonErrorException(LibraryError):
 ### status
 
 def get_cluster_status_xml(runner):
+    stdout, stderr, retval = runner.run(_get_crm_mon_cmd())
+    _ensure_cluster_status_loaded(stdout, stderr, retval)
+    return stdout
+
+def get_cluster_status_xml_bytes(runner):
+    """
+    Return the cluster status as bytes, which lxml parses without the document
+    being decoded and encoded again
+
+    CommandRunner runner
+    """
     stdout, stderr, retval = runner.run(
-        [__exec("crm_mon"), "--one-shot", "--as-xml", "--inactive"]
+        _get_crm_mon_cmd(), binary_output=True
     )
+    _ensure_cluster_status_loaded(stdout, stderr, retval)
+    return stdout
+
+def _get_crm_mon_cmd():
+    return [__exec("crm_mon"), "--one-shot", "--as-xml", "--inactive"]
+
+def _ensure_cluster_status_loaded(stdout, stderr, retval):
     if retval != 0:
         raise CrmMonErrorException(
-            reports.cluster_state_cannot_load(join_multilines([stderr, stdout]))
+            reports.cluster_state_cannot_load(
+                join_multilines([_to_str(stderr), _to_str(stdout)])
+            )
         )
-    return stdout
 
 ### cib
 def get_cib_xml_cmd_results(runner, scope=None):
-    command = [__exec("cibadmin"), "--local", "--query"]
-    if scope:
-        command.append("--scope={0}".format(scope))
-    stdout, stderr, returncode = runner.run(command)
+    stdout, stderr, returncode = runner.run(_get_cib_query_cmd(scope))
     return stdout, stderr, returncode
 
 def get_cib_xml(runner, scope=None):
     stdout, stderr, retval = get_cib_xml_cmd_results(runner, scope)
+    _ensure_cib_loaded(scope, stdout, stderr, retval)
+    return stdout
+
+def get_cib_xml_bytes(runner, scope=None):
+    """
+    Return the CIB as bytes, which lxml parses without the document being
+    decoded and encoded again
+
+    CommandRunner runner
+    string scope -- return only the specified section of the CIB
+    """
+    stdout, stderr, retval = runner.run(
+        _get_cib_query_cmd(scope), binary_output=True
+    )
+    _ensure_cib_loaded(scope, stdout, stderr, retval)
+    return stdout
+
+def get_cib_sections_xml_bytes(runner, section_list):
+    """
+    Return a CIB containing only the specified top level sections as bytes
+
+    CommandRunner runner
+    iterable section_list -- names of the sections, items of CIB_SECTIONS
+    """
+    section_list = list(section_list)
+    if set(CIB_SECTIONS).issubset(section_list):
+        # all the sections are requested, one query loads them
+        return etree.tostring(_get_cib_only_sections(runner, section_list))
+    # The root element and the sections are loaded by separate queries. The
+    # CIB may change in between, so the version of the CIB is checked after
+    # the sections have been loaded to make sure they all come from the same
+    # CIB. Status updates only increase num_updates, it is not compared unless
+    # the status is loaded. Otherwise loading would keep failing on a busy
+    # cluster.
+    with_num_updates = "status" in section_list
+    for dummy_attempt in range(__CIB_SECTIONS_LOAD_ATTEMPTS):
+        cib = _get_cib_root(runner)
+        loaded_section_list = [
+            get_cib(get_cib_xml_bytes(runner, scope=section))
+            for section in section_list
+        ]
+        if (
+            _get_cib_version(_get_cib_root(runner), with_num_updates)
+            ==
+            _get_cib_version(cib, with_num_updates)
+        ):
+            cib.extend(loaded_section_list)
+            return etree.tostring(cib)
+    # The CIB keeps changing, load it by one query which is always consistent.
+    return etree.tostring(_get_cib_only_sections(runner, section_list))
+
+def _get_cib_only_sections(runner, section_list):
+    cib = get_cib(get_cib_xml_bytes(runner))
+    for section in section_list:
+        if cib.find(section) is None:
+            # the same error as when loading a missing section by its scope
+            raise LibraryError(reports.cib_load_error_scope_missing(
+                section,
+                "Section '{0}' is not present in the CIB".format(section)
+            ))
+    for child in list(cib):
+        if child.tag not in section_list:
+            cib.remove(child)
+    return cib
+
+def _get_cib_root(runner):
+    stdout, stderr, retval = runner.run(
+        [
+            __exec("cibadmin"), "--local", "--query", "--xpath=/cib",
+            "--no-children",
+        ],
+        binary_output=True
+    )
+    _ensure_cib_loaded(None, stdout, stderr, retval)
+    return get_cib(stdout)
+
+def _get_cib_version(cib, with_num_updates):
+    attr_list = ["admin_epoch", "epoch"]
+    if with_num_updates:
+        attr_list.append("num_updates")
+    return tuple(cib.get(attr) for attr in attr_list)
+
+def _get_cib_query_cmd(scope):
+    command = [__exec("cibadmin"), "--local", "--query"]
+    if scope:
+        command.append("--scope={0}".format(scope))
+    return command
+
+def _ensure_cib_loaded(scope, stdout, stderr, retval):
     if retval != 0:
+        output = join_multilines([_to_str(stderr), _to_str(stdout)])
         if retval == __EXITCODE_CIB_SCOPE_VALID_BUT_NOT_PRESENT and scope:
             raise LibraryError(
-                reports.cib_load_error_scope_missing(
-                    scope,
-                    join_multilines([stderr, stdout])
-                )
+                reports.cib_load_error_scope_missing(scope, output)
             )
         else:
-            raise LibraryError(
-                reports.cib_load_error(join_multilines([stderr, stdout]))
-            )
-    return stdout
+            raise LibraryError(reports.cib_load_error(output))
 
 def parse_cib_xml(xml):
     return xml_fromstring(xml)
@@ -115,9 +220,10 @@ def diff_cibs_xml(runner, reporter, cib_old_xml, cib_new_xml):
     """
     Return xml diff of two CIBs
     CommandRunner runner
-    string cib_old_xml -- original CIB
+    string or bytes cib_old_xml -- original CIB
     string cib_new_xml -- modified CIB
     """
+    cib_old_xml = _to_str(cib_old_xml)
     try:
         cib_old_tmp_file = write_tmpfile(cib_old_xml)
         reporter.process(
@@ -167,7 +273,7 @@ def ensure_cib_version(runner, cib, version):
         return None
 
     _upgrade_cib(runner)
-    new_cib_xml = get_cib_xml(runner)
+    new_cib_xml = get_cib_xml_bytes(runner)
 
     try:
         new_cib = parse_cib_xml(new_cib_xml)
@@ -254,7 +360,7 @@ def get_local_node_name(runner):
 
 def get_local_node_status(runner):
     try:
-        cluster_status = ClusterState(get_cluster_status_xml(runner))
+        cluster_status = ClusterState(get_cluster_status_xml_bytes(runner))
     except CrmMonErrorException:
         return {"offline": True}
     node_name = get_local_node_name(runner)
@@ -317,7 +423,7 @@ def resource_cleanup(
 
 def resource_refresh(runner, resource=None, node=None, full=False, force=None):
     if not force and not node and not resource:
-        summary = ClusterState(get_cluster_status_xml(runner)).summary
+        summary = ClusterState(get_cluster_status_xml_bytes(runner)).summary
         operations = summary.nodes.attrs.count * summary.resources.attrs.count
         if operations > __RESOURCE_REFRESH_OPERATION_COUNT_THRESHOLD:
             raise LibraryError(
@@ -349,6 +455,12 @@ def resource_refresh(runner, resource=None, node=None, full=False, force=None):
 
 ### tools
 
+def _to_str(output):
+    # error messages are put to reports as strings
+    if isinstance(output, bytes):
+        return output.decode("utf-8", "replace")
+    return output
+
 # shortcut for getting a full path to a pacemaker executable
 def __exec(name):
     return os.path.join(settings.pacemaker_binaries, name)
@@ -3,6 +3,7 @@ The intention is put there knowledge about cluster state structure.
 Hide information about underlaying xml is desired too.
 '''
 import os.path
+import threading
 from collections import defaultdict
 
 from lxml import etree
@@ -15,7 +16,6 @@ from pcs.lib.pacemaker.values import (
     is_false,
     is_true,
 )
-from pcs.lib.xml_tools import find_parent
 
 class ResourceNotFound(Exception):
     pass
@@ -134,11 +134,60 @@ class _NodeSection(_Element):
         'nodes': ('node', _Node),
     }
 
-def get_cluster_state_dom(xml):
+# Possible values of the validate argument of get_cluster_state_dom
+VALIDATE_ALWAYS = "always"
+VALIDATE_NEVER = "never"
+VALIDATE_SAMPLED = "sampled"
+
+# path -> (mtime, compiled schema); compiling the schema is expensive, so it is
+# done once per process unless the schema file changes
+_crm_mon_schema_cache = {}
+# number of parses with VALIDATE_SAMPLED, the SNMP agent parses the state in
+# its updater threads
+_sampled_validation_count = 0
+_sampled_validation_lock = threading.Lock()
+
+def _get_crm_mon_schema(path):
+    mtime = os.path.getmtime(path)
+    cached = _crm_mon_schema_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, etree.RelaxNG(file=path))
+        _crm_mon_schema_cache[path] = cached
+    return cached[1]
+
+def _should_validate(validate):
+    global _sampled_validation_count
+    if validate == VALIDATE_ALWAYS:
+        return True
+    if validate == VALIDATE_NEVER:
+        return False
+    if validate == VALIDATE_SAMPLED:
+        sample_rate = max(1, settings.crm_mon_schema_validation_sample_rate)
+        with _sampled_validation_lock:
+            should_validate = _sampled_validation_count % sample_rate == 0
+            _sampled_validation_count += 1
+        return should_validate
+    raise AssertionError(
+        "Unknown cluster state validation '{0}'".format(validate)
+    )
+
+def get_cluster_state_dom(xml, validate=VALIDATE_ALWAYS):
+    """
+    Parse a cluster state xml and validate it against the crm_mon schema
+
+    string xml -- cluster state as provided by crm_mon
+    string validate -- one of VALIDATE_ALWAYS, VALIDATE_NEVER (for documents
+        known to be valid) or VALIDATE_SAMPLED (validate a part of documents,
+        for code parsing the state repeatedly)
+    """
     try:
         dom = xml_fromstring(xml)
-        if os.path.isfile(settings.crm_mon_schema):
-            etree.RelaxNG(file=settings.crm_mon_schema).assertValid(dom)
+        if (
+            _should_validate(validate)
+            and
+            os.path.isfile(settings.crm_mon_schema)
+        ):
+            _get_crm_mon_schema(settings.crm_mon_schema).assertValid(dom)
         return dom
     except (etree.XMLSyntaxError, etree.DocumentInvalid):
         raise LibraryError(reports.cluster_state_invalid_format())
@@ -149,45 +198,235 @@ class ClusterState(_Element):
         'node_section': ('nodes', _NodeSection),
     }
 
-    def __init__(self, xml):
-        self.dom = get_cluster_state_dom(xml)
+    def __init__(self, xml, validate=VALIDATE_ALWAYS):
+        self.dom = get_cluster_state_dom(xml, validate)
         super(ClusterState, self).__init__(self.dom)
 
-def _id_xpath_predicate(resource_id):
-    return """(@id="{0}" or starts-with(@id, "{0}:"))""".format(resource_id)
+class _NodeStatus(object):
+    __slots__ = (
+        "id", "name", "type", "online", "standby", "maintenance", "is_dc",
+    )
+
+    def __init__(self, element):
+        attrib = element.attrib
+        self.id = attrib.get("id")
+        self.name = attrib.get("name")
+        self.type = attrib.get("type")
+        self.online = is_true(attrib.get("online", ""))
+        self.standby = is_true(attrib.get("standby", ""))
+        self.maintenance = is_true(attrib.get("maintenance", ""))
+        self.is_dc = is_true(attrib.get("is_dc", ""))
+
+class _PrimitiveStatus(object):
+    __slots__ = (
+        "id", "role", "active", "failed", "managed", "node_names", "parent",
+        "position",
+    )
+
+    def __init__(self, element, parent, position):
+        attrib = element.attrib
+        self.id = attrib.get("id")
+        self.role = attrib.get("role")
+        self.active = is_true(attrib.get("active", ""))
+        self.failed = is_true(attrib.get("failed", ""))
+        self.managed = not is_false(attrib.get("managed", ""))
+        self.node_names = [
+            node.attrib["name"] for node in element.iterfind("node")
+        ]
+        self.parent = parent
+        # position in the document, keeps results in the document order
+        self.position = position
+
+class _ContainerStatus(object):
+    """
+    Status of a group, clone, bundle or bundle replica
+    """
+    __slots__ = ("tag", "id", "managed", "parent", "children")
+
+    def __init__(self, element, parent):
+        self.tag = element.tag
+        self.id = element.attrib.get("id")
+        self.managed = not is_false(element.attrib.get("managed", ""))
+        self.parent = parent
+        self.children = []
+
+    def get_primitives(self):
+        return [
+            child for child in self.children
+            if isinstance(child, _PrimitiveStatus)
+        ]
+
+    def get_containers(self, tag):
+        return [
+            child for child in self.children
+            if isinstance(child, _ContainerStatus) and child.tag == tag
+        ]
+
+    def iter_all_primitives(self):
+        for child in self.children:
+            if isinstance(child, _PrimitiveStatus):
+                yield child
+            else:
+                for primitive in child.iter_all_primitives():
+                    yield primitive
+
+    def find_parent(self, tag_list):
+        parent = self.parent
+        while parent is not None and parent.tag not in tag_list:
+            parent = parent.parent
+        return parent
+
+class ClusterStateSnapshot(object):
+    """
+    Nodes and resources of a cluster state, parsed in one pass and indexed
+    """
+    __slots__ = (
+        "_node_list",
+        "_nodes_by_name",
+        "_nodes_by_id",
+        "_primitives_by_id",
+        "_primitives_by_node",
+        "_groups_by_id",
+        "_clones_by_id",
+        "_bundles_by_id",
+    )
+    _container_tags = frozenset(["group", "clone", "bundle", "replica"])
+
+    def __init__(self, dom):
+        """
+        etree dom -- cluster state as returned by get_cluster_state_dom
+        """
+        self._node_list = []
+        self._nodes_by_name = {}
+        self._nodes_by_id = {}
+        self._primitives_by_id = defaultdict(list)
+        self._primitives_by_node = defaultdict(list)
+        self._groups_by_id = defaultdict(list)
+        self._clones_by_id = defaultdict(list)
+        self._bundles_by_id = defaultdict(list)
+
+        for node_element in dom.iterfind("nodes/node"):
+            node = _NodeStatus(node_element)
+            self._node_list.append(node)
+            self._nodes_by_name[node.name] = node
+            self._nodes_by_id[node.id] = node
+        primitive_count = 0
+        for resources_element in dom.iterfind("resources"):
+            primitive_count = self._add_resources(
+                resources_element, None, primitive_count
+            )
+
+    def _add_resources(self, parent_element, parent, primitive_count):
+        for element in parent_element:
+            if element.tag == "resource":
+                primitive = _PrimitiveStatus(element, parent, primitive_count)
+                primitive_count += 1
+                if parent is not None:
+                    parent.children.append(primitive)
+                for key in _get_instance_id_keys(primitive.id):
+                    self._primitives_by_id[key].append(primitive)
+                for node_name in primitive.node_names:
+                    self._primitives_by_node[node_name].append(primitive)
+            elif element.tag in self._container_tags:
+                container = _ContainerStatus(element, parent)
+                if parent is not None:
+                    parent.children.append(container)
+                if container.tag == "group":
+                    for key in _get_instance_id_keys(container.id):
+                        self._groups_by_id[key].append(container)
+                elif container.tag == "clone":
+                    self._clones_by_id[container.id].append(container)
+                elif container.tag == "bundle":
+                    self._bundles_by_id[container.id].append(container)
+                primitive_count = self._add_resources(
+                    element, container, primitive_count
+                )
+        return primitive_count
+
+    @property
+    def nodes(self):
+        return list(self._node_list)
+
+    def get_node_by_name(self, name):
+        return self._nodes_by_name.get(name)
+
+    def get_node_by_id(self, node_id):
+        return self._nodes_by_id.get(node_id)
+
+    def get_primitives_on_node(self, node_name):
+        return list(self._primitives_by_node.get(node_name, []))
+
+    def get_primitives(self, resource_id):
+        """
+        Return primitives with the id including instances of cloned primitives
+        """
+        return list(self._primitives_by_id.get(resource_id, []))
+
+    def get_groups(self, resource_id):
+        """
+        Return groups with the id including instances of cloned groups
+        """
+        return list(self._groups_by_id.get(resource_id, []))
+
+    def get_clones(self, resource_id):
+        return list(self._clones_by_id.get(resource_id, []))
+
+    def get_bundles(self, resource_id):
+        return list(self._bundles_by_id.get(resource_id, []))
+
+def _get_instance_id_keys(resource_id):
+    # Instances of cloned resources have ids in the form "id:instance". They
+    # are found by the id of the resource as well as by their own id.
+    keys = [resource_id]
+    position = resource_id.find(":")
+    while position != -1:
+        keys.append(resource_id[:position])
+        position = resource_id.find(":", position + 1)
+    return keys
+
+def get_cluster_state_snapshot(cluster_state):
+    """
+    Return a snapshot of the cluster state, parse it if needed
+
+    etree|ClusterStateSnapshot cluster_state -- status of the cluster
+    """
+    if isinstance(cluster_state, ClusterStateSnapshot):
+        return cluster_state
+    return ClusterStateSnapshot(cluster_state)
 
 def _get_primitives_for_state_check(
     cluster_state, resource_id, expected_running
 ):
-    primitives = cluster_state.xpath("""
-        .//resource[{predicate_id}]
-        |
-        .//group[{predicate_id}]/resource[{predicate_position}]
-        |
-        .//clone[@id="{id}"]/resource
-        |
-        .//clone[@id="{id}"]/group/resource[{predicate_position}]
-        |
-        .//bundle[@id="{id}"]/replica/resource
-    """.format(
-        id=resource_id,
-        predicate_id=_id_xpath_predicate(resource_id),
-        predicate_position=("last()" if expected_running else "1")
-    ))
+    snapshot = get_cluster_state_snapshot(cluster_state)
+    position = -1 if expected_running else 0
+    primitives = snapshot.get_primitives(resource_id)
+    for group in snapshot.get_groups(resource_id):
+        group_primitives = group.get_primitives()
+        if group_primitives:
+            primitives.append(group_primitives[position])
+    for clone in snapshot.get_clones(resource_id):
+        primitives.extend(clone.get_primitives())
+        for group in clone.get_containers("group"):
+            group_primitives = group.get_primitives()
+            if group_primitives:
+                primitives.append(group_primitives[position])
+    for bundle in snapshot.get_bundles(resource_id):
+        for replica in bundle.get_containers("replica"):
+            primitives.extend(replica.get_primitives())
+    unique_primitives = dict(
+        (primitive.position, primitive) for primitive in primitives
+    )
     return [
-        element for element in primitives
-            if not is_true(element.attrib.get("failed", ""))
+        unique_primitives[position] for position in sorted(unique_primitives)
+        if not unique_primitives[position].failed
     ]
 
-def _get_primitive_roles_with_nodes(primitive_el_list):
+def _get_primitive_roles_with_nodes(primitive_list):
     # Clone resources are represented by multiple primitive elements.
     roles_with_nodes = defaultdict(set)
-    for resource_element in primitive_el_list:
-        if resource_element.attrib["role"] in ["Started", "Master", "Slave"]:
-            roles_with_nodes[resource_element.attrib["role"]].update([
-                node.attrib["name"]
-                for node in resource_element.findall(".//node")
-            ])
+    for primitive in primitive_list:
+        if primitive.role in ["Started", "Master", "Slave"]:
+            roles_with_nodes[primitive.role].update(primitive.node_names)
     return dict([
         (role, sorted(nodes))
         for role, nodes in roles_with_nodes.items()
@@ -242,39 +481,32 @@ def is_resource_managed(cluster_state, resource_id):
     """
     Check if the resource is managed
 
-    etree cluster_state -- status of the cluster
+    etree|ClusterStateSnapshot cluster_state -- status of the cluster
     string resource_id -- id of the resource
     """
-    primitive_list = cluster_state.xpath("""
-        .//resource[{predicate_id}]
-        |
-        .//group[{predicate_id}]/resource
-        """.format(predicate_id=_id_xpath_predicate(resource_id))
-    )
+    snapshot = get_cluster_state_snapshot(cluster_state)
+    primitive_list = snapshot.get_primitives(resource_id)
+    for group in snapshot.get_groups(resource_id):
+        primitive_list.extend(group.get_primitives())
     if primitive_list:
         for primitive in primitive_list:
-            if is_false(primitive.attrib.get("managed", "")):
+            if not primitive.managed:
                 return False
-            parent = find_parent(primitive, ["clone", "bundle"])
-            if (
-                parent is not None
-                and
-                is_false(parent.attrib.get("managed", ""))
-            ):
+            parent = primitive.parent
+            if parent is not None and parent.tag not in ("clone", "bundle"):
+                parent = parent.find_parent(["clone", "bundle"])
+            if parent is not None and not parent.managed:
                 return False
         return True
 
-    parent_list = cluster_state.xpath("""
-        .//clone[@id="{0}"]
-        |
-        .//bundle[@id="{0}"]
-        """.format(resource_id)
+    parent_list = (
+        snapshot.get_clones(resource_id) + snapshot.get_bundles(resource_id)
     )
     for parent in parent_list:
-        if is_false(parent.attrib.get("managed", "")):
+        if not parent.managed:
             return False
-        for primitive in parent.xpath(".//resource"):
-            if is_false(primitive.attrib.get("managed", "")):
+        for primitive in parent.iter_all_primitives():
+            if not primitive.managed:
                 return False
         return True
 
@@ -73,6 +73,34 @@ class GetClusterStatusXmlTest(LibraryPacemakerTest):
 
         mock_runner.run.assert_called_once_with(self.crm_mon_cmd())
 
+    def test_success_bytes(self):
+        mock_runner = get_runner(b"<xml />", b"", 0)
+
+        real_xml = lib.get_cluster_status_xml_bytes(mock_runner)
+
+        mock_runner.run.assert_called_once_with(
+            self.crm_mon_cmd(), binary_output=True
+        )
+        self.assertEqual(b"<xml />", real_xml)
+
+    def test_error_bytes(self):
+        mock_runner = get_runner(b"some info", b"some error", 1)
+
+        assert_raise_library_error(
+            lambda: lib.get_cluster_status_xml_bytes(mock_runner),
+            (
+                Severity.ERROR,
+                report_codes.CRM_MON_ERROR,
+                {
+                    "reason": "some error\nsome info",
+                }
+            )
+        )
+
+        mock_runner.run.assert_called_once_with(
+            self.crm_mon_cmd(), binary_output=True
+        )
+
 class GetCibXmlTest(LibraryPacemakerTest):
     def test_success(self):
         expected_stdout = "<xml />"
@@ -169,11 +197,310 @@ class GetCibXmlTest(LibraryPacemakerTest):
             ]
         )
 
+    def test_success_bytes(self):
+        mock_runner = get_runner(b"<xml />", b"", 0)
+
+        real_xml = lib.get_cib_xml_bytes(mock_runner, "test_scope")
+
+        mock_runner.run.assert_called_once_with(
+            [
+                self.path("cibadmin"),
+                "--local", "--query", "--scope=test_scope"
+            ],
+            binary_output=True
+        )
+        self.assertEqual(b"<xml />", real_xml)
+
+    def test_scope_error_bytes(self):
+        mock_runner = get_runner(b"some info", b"some error", 105)
+
+        assert_raise_library_error(
+            lambda: lib.get_cib_xml_bytes(mock_runner, scope="test_scope"),
+            (
+                Severity.ERROR,
+                report_codes.CIB_LOAD_ERROR_SCOPE_MISSING,
+                {
+                    "scope": "test_scope",
+                    "reason": "some error\nsome info",
+                }
+            )
+        )
+
+        mock_runner.run.assert_called_once_with(
+            [
+                self.path("cibadmin"),
+                "--local", "--query", "--scope=test_scope"
+            ],
+            binary_output=True
+        )
+
+class GetCibSectionsXmlBytesTest(LibraryPacemakerTest):
+    def call_root(self):
+        return mock.call(
+            [
+                self.path("cibadmin"), "--local", "--query",
+                "--xpath=/cib", "--no-children",
+            ],
+            binary_output=True
+        )
+
+    def call_scope(self, scope=None):
+        return mock.call(
+            [self.path("cibadmin"), "--local", "--query"]
+            +
+            (["--scope={0}".format(scope)] if scope else [])
+            ,
+            binary_output=True
+        )
+
+    def test_success(self):
+        mock_runner = get_runner()
+        mock_runner.run.side_effect = [
+            (b'<cib epoch="1" num_updates="2"/>', b"", 0),
+            (b"<configuration><resources/></configuration>", b"", 0),
+            (b'<cib epoch="1" num_updates="2"/>', b"", 0),
+        ]
+
+        assert_xml_equal(
+            """
+                <cib epoch="1" num_updates="2">
+                    <configuration><resources/></configuration>
+                </cib>
+            """,
+            lib.get_cib_sections_xml_bytes(
+                mock_runner, ["configuration"]
+            ).decode()
+        )
+        self.assertEqual(
+            [
+                self.call_root(),
+                self.call_scope("configuration"),
+                self.call_root(),
+            ],
+            mock_runner.run.mock_calls
+        )
+
+    def test_cib_changed_while_loading(self):
+        mock_runner = get_runner()
+        mock_runner.run.side_effect = [
+            (b'<cib epoch="1" num_updates="2"/>', b"", 0),
+            (b"<configuration><resources/></configuration>", b"", 0),
+            (b'<cib epoch="2" num_updates="0"/>', b"", 0),
+            (b'<cib epoch="2" num_updates="0"/>', b"", 0),
+            (b"<configuration><tags/></configuration>", b"", 0),
+            (b'<cib epoch="2" num_updates="0"/>', b"", 0),
+        ]
+
+        assert_xml_equal(
+            """
+                <cib epoch="2" num_updates="0">
+                    <configuration><tags/></configuration>
+                </cib>
+            """,
+            lib.get_cib_sections_xml_bytes(
+                mock_runner, ["configuration"]
+            ).decode()
+        )
+        self.assertEqual(
+            [
+                self.call_root(),
+                self.call_scope("configuration"),
+                self.call_root(),
+            ] * 2,
+            mock_runner.run.mock_calls
+        )
+
+    def test_status_updates_ignored(self):
+        mock_runner = get_runner()
+        mock_runner.run.side_effect = [
+            (b'<cib epoch="1" num_updates="2"/>', b"", 0),
+            (b"<configuration><resources/></configuration>", b"", 0),
+            (b'<cib epoch="1" num_updates="3"/>', b"", 0),
+        ]
+
+        assert_xml_equal(
+            """
+                <cib epoch="1" num_updates="2">
+                    <configuration><resources/></configuration>
+                </cib>
+            """,
+            lib.get_cib_sections_xml_bytes(
+                mock_runner, ["configuration"]
+            ).decode()
+        )
+        self.assertEqual(3, mock_runner.run.call_count)
+
+    def test_status_updates_compared_when_loading_status(self):
+        mock_runner = get_runner()
+        mock_runner.run.side_effect = [
+            (b'<cib epoch="1" num_updates="2"/>', b"", 0),
+            (b"<status/>", b"", 0),
+            (b'<cib epoch="1" num_updates="3"/>', b"", 0),
+            (b'<cib epoch="1" num_updates="3"/>', b"", 0),
+            (b'<status><node_state id="1"/></status>', b"", 0),
+            (b'<cib epoch="1" num_updates="3"/>', b"", 0),
+        ]
+
+        assert_xml_equal(
+            """
+                <cib epoch="1" num_updates="3">
+                    <status><node_state id="1"/></status>
+                </cib>
+            """,
+            lib.get_cib_sections_xml_bytes(mock_runner, ["status"]).decode()
+        )
+        self.assertEqual(
+            [
+                self.call_root(),
+                self.call_scope("status"),
+                self.call_root(),
+            ] * 2,
+            mock_runner.run.mock_calls
+        )
+
+    def test_all_sections_loaded_by_one_query(self):
+        mock_runner = get_runner(
+            b"""
+                <cib epoch="1" num_updates="4">
+                    <configuration><resources/></configuration>
+                    <status/>
+                </cib>
+            """
+        )
+
+        assert_xml_equal(
+            """
+                <cib epoch="1" num_updates="4">
+                    <configuration><resources/></configuration>
+                    <status/>
+                </cib>
+            """,
+            lib.get_cib_sections_xml_bytes(
+                mock_runner, ["status", "configuration"]
+            ).decode()
+        )
+        self.assertEqual([self.call_scope()], mock_runner.run.mock_calls)
+
+    def test_all_sections_section_missing(self):
+        mock_runner = get_runner(b'<cib epoch="1"><configuration/></cib>')
+
+        assert_raise_library_error(
+            lambda: lib.get_cib_sections_xml_bytes(
+                mock_runner, ["configuration", "status"]
+            ),
+            (
+                Severity.ERROR,
+                report_codes.CIB_LOAD_ERROR_SCOPE_MISSING,
+                {
+                    "scope": "status",
+                    "reason": "Section 'status' is not present in the CIB",
+                }
+            )
+        )
+
+    def test_cib_keeps_changing(self):
+        mock_runner = get_runner()
+        mock_runner.run.side_effect = [
+            (b'<cib epoch="1" num_updates="0"/>', b"", 0),
+            (b"<configuration/>", b"", 0),
+            (b'<cib epoch="2" num_updates="0"/>', b"", 0),
+            (b'<cib epoch="2" num_updates="0"/>', b"", 0),
+            (b"<configuration/>", b"", 0),
+            (b'<cib epoch="3" num_updates="0"/>', b"", 0),
+            (b'<cib epoch="3" num_updates="0"/>', b"", 0),
+            (b"<configuration/>", b"", 0),
+            (b'<cib epoch="4" num_updates="0"/>', b"", 0),
+            (
+                b"""
+                    <cib epoch="5" num_updates="0">
+                        <configuration><resources/></configuration>
+                        <status/>
+                    </cib>
+                """,
+                b"",
+                0
+            ),
+        ]
+
+        assert_xml_equal(
+            """
+                <cib epoch="5" num_updates="0">
+                    <configuration><resources/></configuration>
+                </cib>
+            """,
+            lib.get_cib_sections_xml_bytes(
+                mock_runner, ["configuration"]
+            ).decode()
+        )
+        self.assertEqual(
+            [
+                self.call_root(),
+                self.call_scope("configuration"),
+                self.call_root(),
+            ] * 3
+            +
+            [self.call_scope()]
+            ,
+            mock_runner.run.mock_calls
+        )
+
+    def test_cib_keeps_changing_section_missing(self):
+        mock_runner = get_runner()
+        mock_runner.run.side_effect = [
+            (b'<cib epoch="1"/>', b"", 0),
+            (b"<configuration/>", b"", 0),
+            (b'<cib epoch="2"/>', b"", 0),
+        ] * 3 + [
+            (b'<cib epoch="3"><status/></cib>', b"", 0),
+        ]
+
+        assert_raise_library_error(
+            lambda: lib.get_cib_sections_xml_bytes(
+                mock_runner, ["configuration"]
+            ),
+            (
+                Severity.ERROR,
+                report_codes.CIB_LOAD_ERROR_SCOPE_MISSING,
+                {
+                    "scope": "configuration",
+                    "reason":
+                        "Section 'configuration' is not present in the CIB",
+                }
+            )
+        )
+
+    def test_error(self):
+        mock_runner = get_runner(b"some info", b"some error", 1)
+
+        assert_raise_library_error(
+            lambda: lib.get_cib_sections_xml_bytes(
+                mock_runner, ["configuration"]
+            ),
+            (
+                Severity.ERROR,
+                report_codes.CIB_LOAD_ERROR,
+                {
+                    "reason": "some error\nsome info",
+                }
+            )
+        )
+        self.assertEqual(1, mock_runner.run.call_count)
+
 class GetCibTest(LibraryPacemakerTest):
     def test_success(self):
         xml = "<xml />"
         assert_xml_equal(xml, str(XmlManipulation((lib.get_cib(xml)))))
 
+    def test_success_bytes(self):
+        xml = '<xml a="\u017e" />'
+        assert_xml_equal(
+            xml,
+            str(XmlManipulation(lib.get_cib(
+                '<?xml version="1.0" encoding="UTF-8"?>{0}'.format(xml)
+                .encode("utf-8")
+            )))
+        )
+
     def test_invalid_xml(self):
         xml = "<invalid><xml />"
         assert_raise_library_error(
@@ -308,7 +635,7 @@ class UpgradeCibTest(TestCase):
             ["/usr/sbin/cibadmin", "--upgrade", "--force"]
         )
 
-@mock.patch("pcs.lib.pacemaker.live.get_cib_xml")
+@mock.patch("pcs.lib.pacemaker.live.get_cib_xml_bytes")
 @mock.patch("pcs.lib.pacemaker.live._upgrade_cib")
 class EnsureCibVersionTest(TestCase):
     def setUp(self):
@@ -619,7 +946,7 @@ class ResourceRefreshTest(LibraryPacemakerTest):
         expected_stderr = "expected stderr"
         mock_runner = mock.MagicMock(spec_set=CommandRunner)
         call_list = [
-            mock.call(self.crm_mon_cmd()),
+            mock.call(self.crm_mon_cmd(), binary_output=True),
             mock.call([self.path("crm_resource"), "--refresh"]),
         ]
         return_value_list = [
@@ -655,7 +982,9 @@ class ResourceRefreshTest(LibraryPacemakerTest):
             )
         )
 
-        mock_runner.run.assert_called_once_with(self.crm_mon_cmd())
+        mock_runner.run.assert_called_once_with(
+            self.crm_mon_cmd(), binary_output=True
+        )
 
     def test_threshold_exceeded_forced(self):
         expected_stdout = "expected output"
@@ -709,7 +1038,7 @@ class ResourceRefreshTest(LibraryPacemakerTest):
         expected_stderr = "expected stderr"
         mock_runner = mock.MagicMock(spec_set=CommandRunner)
         call_list = [
-            mock.call(self.crm_mon_cmd()),
+            mock.call(self.crm_mon_cmd(), binary_output=True),
             mock.call([self.path("crm_resource"), "--refresh", "--force"]),
         ]
         return_value_list = [
@@ -771,7 +1100,9 @@ class ResourceRefreshTest(LibraryPacemakerTest):
             )
         )
 
-        mock_runner.run.assert_called_once_with(self.crm_mon_cmd())
+        mock_runner.run.assert_called_once_with(
+            self.crm_mon_cmd(), binary_output=True
+        )
 
     def test_error_refresh(self):
         expected_stdout = "some info"
@@ -779,7 +1110,7 @@ class ResourceRefreshTest(LibraryPacemakerTest):
         expected_retval = 1
         mock_runner = mock.MagicMock(spec_set=CommandRunner)
         call_list = [
-            mock.call(self.crm_mon_cmd()),
+            mock.call(self.crm_mon_cmd(), binary_output=True),
             mock.call([self.path("crm_resource"), "--refresh"]),
         ]
         return_value_list = [
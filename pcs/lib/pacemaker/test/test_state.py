@@ -1,3 +1,5 @@
+import os
+import tempfile
 from unittest import mock, TestCase
 
 from lxml import etree
@@ -92,6 +94,97 @@ class ClusterStatusTest(TestBase):
         )
 
 
+class CrmMonSchemaValidation(TestBase):
+    # crm_mon element with a version attribute and any content
+    schema = """
+        <grammar xmlns="http://relaxng.org/ns/structure/1.0">
+            <start>
+                <element name="crm_mon">
+                    <attribute name="version"/>
+                    <zeroOrMore><ref name="any"/></zeroOrMore>
+                </element>
+            </start>
+            <define name="any">
+                <element>
+                    <anyName/>
+                    <zeroOrMore>
+                        <choice>
+                            <attribute><anyName/></attribute>
+                            <text/>
+                            <ref name="any"/>
+                        </choice>
+                    </zeroOrMore>
+                </element>
+            </define>
+        </grammar>
+    """
+
+    def setUp(self):
+        super(CrmMonSchemaValidation, self).setUp()
+        schema_fd, self.schema_path = tempfile.mkstemp(suffix=".rng")
+        with os.fdopen(schema_fd, "w") as schema_file:
+            schema_file.write(self.schema)
+        self.addCleanup(os.remove, self.schema_path)
+
+        for name, value in [
+            ("crm_mon_schema", self.schema_path),
+            ("crm_mon_schema_validation_sample_rate", 2),
+        ]:
+            patcher = mock.patch.object(state.settings, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(state, "_crm_mon_schema_cache", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(state, "_sampled_validation_count", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.valid_xml = str(self.covered_status)
+        self.invalid_xml = "<crm_mon/>"
+
+    def assert_invalid(self, xml, validate=state.VALIDATE_ALWAYS):
+        assert_raise_library_error(
+            lambda: state.get_cluster_state_dom(xml, validate),
+            (severities.ERROR, report_codes.BAD_CLUSTER_STATE_FORMAT, {})
+        )
+
+    def test_schema_compiled_once(self):
+        with mock.patch(
+            "pcs.lib.pacemaker.state.etree.RelaxNG", wraps=etree.RelaxNG
+        ) as mock_relaxng:
+            state.get_cluster_state_dom(self.valid_xml)
+            self.assert_invalid(self.invalid_xml)
+            state.get_cluster_state_dom(self.valid_xml)
+        mock_relaxng.assert_called_once_with(file=self.schema_path)
+
+    def test_schema_recompiled_when_changed(self):
+        with mock.patch(
+            "pcs.lib.pacemaker.state.etree.RelaxNG", wraps=etree.RelaxNG
+        ) as mock_relaxng:
+            state.get_cluster_state_dom(self.valid_xml)
+            mtime = os.path.getmtime(self.schema_path)
+            os.utime(self.schema_path, (mtime + 10, mtime + 10))
+            state.get_cluster_state_dom(self.valid_xml)
+        self.assertEqual(2, mock_relaxng.call_count)
+
+    def test_validate_never(self):
+        state.get_cluster_state_dom(self.invalid_xml, state.VALIDATE_NEVER)
+
+    def test_validate_unknown(self):
+        self.assertRaises(
+            AssertionError,
+            lambda: state.get_cluster_state_dom(self.valid_xml, True)
+        )
+
+    def test_validate_sampled(self):
+        self.assert_invalid(self.invalid_xml, state.VALIDATE_SAMPLED)
+        state.get_cluster_state_dom(self.invalid_xml, state.VALIDATE_SAMPLED)
+        self.assert_invalid(self.invalid_xml, state.VALIDATE_SAMPLED)
+        # not sampled parses still validate
+        self.assert_invalid(self.invalid_xml)
+
+
 class WorkWithClusterStatusNodesTest(TestBase):
     def fixture_node_string(self, **kwargs):
         attrs = dict(name='name', id='id', type='member')
@@ -153,43 +246,34 @@ class WorkWithClusterStatusSummaryTest(TestBase):
 
 class GetPrimitiveRolesWithNodes(TestCase):
     def test_success(self):
-        primitives_xml = [
-            """
-                <resource id="A" role="Started">
-                    <node name="node1" id="1"/>
-                </resource>
-            """,
-            """
-                <resource id="A" role="Master">
-                    <node name="node2" id="2"/>
-                </resource>
-            """,
-            """
-                <resource id="A" role="Slave">
-                    <node name="node4" id="4"/>
-                </resource>
-            """,
-            """
-                <resource id="A" role="Slave">
-                    <node name="node3" id="3"/>
-                </resource>
-            """,
-            """
-                <resource id="A" role="Stopped">
-                </resource>
-            """,
-            """
-                <resource id="A" role="Started">
-                    <node name="node5" id="5"/>
-                </resource>
-            """,
-        ]
-        primitives = [
-            etree.fromstring(xml) for xml in primitives_xml
-        ]
+        snapshot = state.ClusterStateSnapshot(etree.fromstring("""
+            <crm_mon>
+                <resources>
+                    <resource id="A" role="Started">
+                        <node name="node1" id="1"/>
+                    </resource>
+                    <resource id="A" role="Master">
+                        <node name="node2" id="2"/>
+                    </resource>
+                    <resource id="A" role="Slave">
+                        <node name="node4" id="4"/>
+                    </resource>
+                    <resource id="A" role="Slave">
+                        <node name="node3" id="3"/>
+                    </resource>
+                    <resource id="A" role="Stopped">
+                    </resource>
+                    <resource id="A" role="Started">
+                        <node name="node5" id="5"/>
+                    </resource>
+                </resources>
+            </crm_mon>
+        """))
 
         self.assertEqual(
-            state._get_primitive_roles_with_nodes(primitives),
+            state._get_primitive_roles_with_nodes(
+                snapshot.get_primitives("A")
+            ),
             {
                 "Started": ["node1", "node5"],
                 "Master": ["node2"],
@@ -344,14 +428,26 @@ class GetPrimitivesForStateCheck(TestCase):
     def assert_primitives(self, resource_id, primitive_ids, expected_running):
         self.assertEqual(
             [
-                elem.attrib["id"]
-                for elem in state._get_primitives_for_state_check(
+                primitive.id
+                for primitive in state._get_primitives_for_state_check(
                     self.status, resource_id, expected_running
                 )
             ],
             primitive_ids
         )
 
+    def test_snapshot_accepted(self):
+        snapshot = state.ClusterStateSnapshot(self.status)
+        self.assertEqual(
+            ["R20:0", "R20:1"],
+            [
+                primitive.id
+                for primitive in state._get_primitives_for_state_check(
+                    snapshot, "G6-clone", True
+                )
+            ]
+        )
+
     def test_missing(self):
         self.assert_primitives("Rxx", [], True)
         self.assert_primitives("Rxx", [], False)
@@ -835,6 +931,12 @@ class IsResourceManaged(TestCase):
             managed,
             state.is_resource_managed(self.status, resource)
         )
+        self.assertEqual(
+            managed,
+            state.is_resource_managed(
+                state.ClusterStateSnapshot(self.status), resource
+            )
+        )
 
     def test_missing(self):
         self.assertRaises(
@@ -956,3 +1058,107 @@ class IsResourceManaged(TestCase):
         self.assert_managed("R46", False)
         self.assert_managed("R47", False)
         self.assert_managed("R48", False)
+
+
+class ClusterStateSnapshotTest(TestCase):
+    def setUp(self):
+        self.snapshot = state.ClusterStateSnapshot(etree.fromstring("""
+            <crm_mon>
+                <nodes>
+                    <node name="node1" id="1" type="member" online="true"
+                        standby="false" maintenance="false" is_dc="true"
+                    />
+                    <node name="node2" id="2" type="member" online="false"
+                        standby="true" maintenance="false" is_dc="false"
+                    />
+                </nodes>
+                <resources>
+                    <resource id="A" role="Started" active="true"
+                        managed="false"
+                    >
+                        <node name="node1" id="1"/>
+                    </resource>
+                    <clone id="G-clone">
+                        <group id="G:0">
+                            <resource id="B:0" role="Started">
+                                <node name="node1" id="1"/>
+                            </resource>
+                        </group>
+                        <group id="G:1">
+                            <resource id="B:1" role="Started">
+                                <node name="node2" id="2"/>
+                            </resource>
+                        </group>
+                    </clone>
+                    <bundle id="C">
+                        <replica id="0">
+                            <resource id="C-ip" role="Started">
+                                <node name="node2" id="2"/>
+                            </resource>
+                        </replica>
+                    </bundle>
+                </resources>
+            </crm_mon>
+        """))
+
+    def test_nodes(self):
+        self.assertEqual(
+            ["node1", "node2"], [node.name for node in self.snapshot.nodes]
+        )
+        node = self.snapshot.get_node_by_name("node2")
+        self.assertEqual("2", node.id)
+        self.assertFalse(node.online)
+        self.assertTrue(node.standby)
+        self.assertIs(node, self.snapshot.get_node_by_id("2"))
+        self.assertIsNone(self.snapshot.get_node_by_name("node3"))
+
+    def test_primitives_on_node(self):
+        self.assertEqual(
+            ["A", "B:0"],
+            [
+                primitive.id
+                for primitive in self.snapshot.get_primitives_on_node("node1")
+            ]
+        )
+        self.assertEqual([], self.snapshot.get_primitives_on_node("node3"))
+
+    def test_primitive(self):
+        primitive_list = self.snapshot.get_primitives("A")
+        self.assertEqual(1, len(primitive_list))
+        self.assertEqual("Started", primitive_list[0].role)
+        self.assertTrue(primitive_list[0].active)
+        self.assertFalse(primitive_list[0].managed)
+        self.assertIsNone(primitive_list[0].parent)
+        self.assertFalse(self.snapshot.get_primitives("C-ip")[0].active)
+
+    def test_instances(self):
+        self.assertEqual(
+            ["B:0", "B:1"],
+            [primitive.id for primitive in self.snapshot.get_primitives("B")]
+        )
+        self.assertEqual(
+            ["B:1"],
+            [primitive.id for primitive in self.snapshot.get_primitives("B:1")]
+        )
+        self.assertEqual(
+            ["G:0", "G:1"],
+            [group.id for group in self.snapshot.get_groups("G")]
+        )
+
+    def test_containers(self):
+        clone = self.snapshot.get_clones("G-clone")[0]
+        self.assertEqual(
+            ["B:0", "B:1"],
+            [primitive.id for primitive in clone.iter_all_primitives()]
+        )
+        self.assertIs(
+            clone,
+            self.snapshot.get_primitives("B:0")[0].parent.find_parent(
+                ["clone"]
+            )
+        )
+        self.assertEqual([], self.snapshot.get_clones("G"))
+        bundle = self.snapshot.get_bundles("C")[0]
+        self.assertEqual(
+            ["0"], [replica.id for replica in bundle.get_containers("replica")]
+        )
@@ -2150,6 +2150,14 @@ def service_disable_success(service, node=None, instance=None):
     )
 
 
+def agent_metadata_cache_disabled():
+    """
+    The agent metadata cache cannot be used as it has been disabled
+    """
+    return ReportItem.error(
+        report_codes.AGENT_METADATA_CACHE_DISABLED,
+    )
+
 def unable_to_get_agent_metadata(
     agent, reason, severity=ReportItemSeverity.ERROR, forceable=None
 ):
@@ -8,6 +8,8 @@ from pcs.common import report_codes
 from pcs.common.tools import xml_fromstring
 from pcs.lib import reports
 from pcs.lib.errors import LibraryError, ReportItemSeverity
+from pcs.lib.external import iter_parallel_run
+from pcs.lib.metadata_cache import MetadataCache
 from pcs.lib.pacemaker.values import is_true
 
 
@@ -37,6 +39,110 @@ DEFAULT_INTERVALS = {
 
 _STONITH_ACTION_REPLACED_BY = ("pcmk_off_action", "pcmk_reboot_action")
 
+# Metadata are cached on disk in settings.agent_metadata_cache_dir. The cache
+# is set up when metadata are loaded for the first time, so commands which do
+# not work with agents do not need it. set_metadata_cache overrides it.
+_metadata_cache = None
+_is_metadata_cache_set = False
+
+def set_metadata_cache(cache):
+    """
+    Set a cache to load agents' metadata from, None disables caching
+
+    MetadataCache cache -- the cache
+    """
+    global _metadata_cache, _is_metadata_cache_set
+    _metadata_cache = cache
+    _is_metadata_cache_set = True
+
+def get_metadata_cache():
+    """
+    Return the cache of agents' metadata or None if caching is disabled
+    """
+    if not _is_metadata_cache_set:
+        set_metadata_cache(
+            MetadataCache(settings.agent_metadata_cache_dir)
+            if settings.agent_metadata_cache_dir
+            else None
+        )
+    return _metadata_cache
+
+def _load_cached_metadata(name, source_path_list, loader):
+    """
+    Return metadata from the cache if possible, otherwise get them by the loader
+
+    string name -- name of the agent
+    list source_path_list -- files the metadata are produced from, empty list
+        means the metadata cannot be cached
+    callable loader -- returns the metadata
+    """
+    if not source_path_list:
+        return loader()
+    cache = get_metadata_cache()
+    if cache is None:
+        return loader()
+    return cache.load(name, source_path_list, loader)
+
+# Lists of agents and agents' validity are cached along with the metadata as
+# an index of agents. The prefix keeps the entries apart from agents' names.
+_AGENT_INDEX_PREFIX = "agent-index:"
+
+class _ListingNotCacheable(Exception):
+    def __init__(self, stdout, retval):
+        super().__init__()
+        self.stdout = stdout
+        self.retval = retval
+
+def _get_standard_dir_list(standard_provider):
+    """
+    Return directories holding agents of a standard, None if not known
+
+    string standard_provider -- standard[:provider], e.g. lsb, ocf:pacemaker
+    """
+    # Systemd units (and so the service standard) are not listed here. Units
+    # may be loaded from many directories including runtime generated ones,
+    # so there is no reliable way to tell whether the list of units changed.
+    standard, dummy_separator, provider = standard_provider.partition(":")
+    if standard == "ocf" and provider:
+        return [os.path.join(settings.ocf_root, "resource.d", provider)]
+    if standard == "lsb":
+        return [settings.lsb_agents_dir]
+    if standard == "stonith":
+        return [settings.fence_agent_binaries]
+    return None
+
+def _run_listing_cached(runner, index_name, source_path_list, args):
+    """
+    Return stdout and retval of a crm_resource listing. The output is cached
+    until crm_resource or any of the sources changes. Only a successful
+    listing which found something is cached.
+
+    CommandRunner runner
+    string index_name -- name of the listing in the index of agents
+    list source_path_list -- files or directories the listing is produced
+        from besides crm_resource, None means the listing cannot be cached
+    list args -- crm_resource arguments
+    """
+    def loader():
+        stdout, dummy_stderr, retval = runner.run([_crm_resource] + args)
+        if retval != 0 or not stdout.strip():
+            raise _ListingNotCacheable(stdout, retval)
+        return stdout
+    try:
+        return (
+            _load_cached_metadata(
+                _AGENT_INDEX_PREFIX + index_name,
+                (
+                    [_crm_resource] + source_path_list
+                    if source_path_list is not None else []
+                ),
+                loader
+            ),
+            0
+        )
+    except _ListingNotCacheable as e:
+        return e.stdout, e.retval
+
 
 def get_default_interval(operation_name):
     """
@@ -129,10 +235,12 @@ def list_resource_agents_standards(runner):
     Return list of resource agents standards (ocf, lsb, ... ) on the local host
     CommandRunner runner
     """
-    # retval is number of standards found
-    stdout, dummy_stderr, dummy_retval = runner.run([
-        _crm_resource, "--list-standards"
-    ])
+    # The standards are built in pacemaker, so they change only when it is
+    # upgraded. Older pacemaker returns the number of standards found as
+    # retval, the output is used but not cached then.
+    stdout, dummy_retval = _run_listing_cached(
+        runner, "standards", [], ["--list-standards"]
+    )
     ignored_standards = frozenset([
         # we are only interested in RESOURCE agents
         "stonith",
@@ -145,10 +253,14 @@ def list_resource_agents_ocf_providers(runner):
     Return list of resource agents ocf providers on the local host
     CommandRunner runner
     """
-    # retval is number of providers found
-    stdout, dummy_stderr, dummy_retval = runner.run([
-        _crm_resource, "--list-ocf-providers"
-    ])
+    # Older pacemaker returns the number of providers found as retval, the
+    # output is used but not cached then.
+    stdout, dummy_retval = _run_listing_cached(
+        runner,
+        "ocf-providers",
+        [os.path.join(settings.ocf_root, "resource.d")],
+        ["--list-ocf-providers"]
+    )
     return _prepare_agent_list(stdout)
 
 
@@ -184,9 +296,12 @@ def list_resource_agents(runner, standard_provider):
     string standard_provider standard[:provider], e.g. lsb, ocf, ocf:pacemaker
     """
     # retval is 0 on success, anything else when no agents found
-    stdout, dummy_stderr, retval = runner.run([
-        _crm_resource, "--list-agents", standard_provider
-    ])
+    stdout, retval = _run_listing_cached(
+        runner,
+        "agents:{0}".format(standard_provider),
+        _get_standard_dir_list(standard_provider),
+        ["--list-agents", standard_provider]
+    )
     if retval != 0:
         return []
     return _prepare_agent_list(stdout)
@@ -198,9 +313,12 @@ def list_stonith_agents(runner):
     CommandRunner runner
     """
     # retval is 0 on success, anything else when no agents found
-    stdout, dummy_stderr, retval = runner.run([
-        _crm_resource, "--list-agents", "stonith"
-    ])
+    stdout, retval = _run_listing_cached(
+        runner,
+        "agents:stonith",
+        _get_standard_dir_list("stonith"),
+        ["--list-agents", "stonith"]
+    )
     if retval != 0:
         return []
     ignored_agents = frozenset([
@@ -242,20 +360,43 @@ def guess_resource_agent_full_name(runner, search_agent_name):
     search_lower = search_agent_name.lower()
     # list all possible names
     possible_names = []
-    for std in list_resource_agents_standards_and_providers(runner):
-        for agent in list_resource_agents(runner, std):
+    std_list = list_resource_agents_standards_and_providers(runner)
+    std_agents_list = iter_parallel_run(
+        runner,
+        list_resource_agents,
+        std_list,
+        settings.agent_metadata_parallel_jobs
+    )
+    for std, agent_list in zip(std_list, std_agents_list):
+        for agent in agent_list:
             if search_lower == agent.lower():
                 possible_names.append("{0}:{1}".format(std, agent))
-    # construct agent wrappers
-    agent_candidates = [
-        ResourceAgent(runner, agent) for agent in possible_names
-    ]
     # check if the agent is valid
+    valid_list = iter_parallel_run(
+        runner,
+        _is_valid_agent,
+        possible_names,
+        settings.agent_metadata_parallel_jobs
+    )
+    # construct agent wrappers, they must use the original runner as the ones
+    # of the workers do not process their reports
     return [
-        agent for agent in agent_candidates if agent.is_valid_metadata()
+        ResourceAgent(runner, agent)
+        for agent, valid in zip(possible_names, valid_list) if valid
     ]
 
 
+def _is_valid_agent(runner, agent_name):
+    agent = ResourceAgent(runner, agent_name)
+    # pylint: disable=protected-access
+    executable = agent._get_agent_executable()
+    return _load_cached_metadata(
+        _AGENT_INDEX_PREFIX + "valid:" + agent.get_name(),
+        [executable, _crm_resource] if executable else [],
+        agent.is_valid_metadata
+    )
+
+
 def guess_exactly_one_resource_agent_full_name(runner, search_agent_name):
     """
     Get one resource agent matching specified search term
@@ -658,6 +799,14 @@ class FencedMetadata(FakeAgentMetadata):
 
 
     def _load_metadata(self):
+        return _load_cached_metadata(
+            self.get_name(),
+            [settings.pacemaker_fenced],
+            self._load_metadata_from_fenced
+        )
+
+
+    def _load_metadata_from_fenced(self):
         stdout, stderr, dummy_retval = self._runner.run(
             [settings.pacemaker_fenced, "metadata"]
         )
@@ -710,7 +859,23 @@ class CrmAgent(Agent):
         self._get_metadata()
         return self
 
+    def _get_agent_executable(self):
+        """
+        Return path to the agent's executable or None if it is not known
+        """
+        return None
+
     def _load_metadata(self):
+        executable = self._get_agent_executable()
+        return _load_cached_metadata(
+            self._get_full_name(),
+            # The metadata are produced by the agent and processed by
+            # pacemaker, so they change when either is upgraded.
+            [executable, _crm_resource] if executable else [],
+            self._load_metadata_from_pacemaker
+        )
+
+    def _load_metadata_from_pacemaker(self):
         env_path = ":".join([
             # otherwise pacemaker cannot run RHEL fence agents to get their
             # metadata
@@ -741,6 +906,16 @@ class ResourceAgent(CrmAgent):
     def get_name(self):
         return self._get_full_name()
 
+    def _get_agent_executable(self):
+        if self.get_standard() == "ocf" and self.get_provider():
+            return os.path.join(
+                settings.ocf_root,
+                "resource.d",
+                self.get_provider(),
+                self.get_type()
+            )
+        return None
+
     def get_parameters(self):
         parameters = super(ResourceAgent, self).get_parameters()
         if (
@@ -843,6 +1018,9 @@ class StonithAgent(CrmAgent):
     def get_name(self):
         return self.get_type()
 
+    def _get_agent_executable(self):
+        return os.path.join(settings.fence_agent_binaries, self.get_type())
+
     def get_parameters(self):
         return (
             self._filter_parameters(
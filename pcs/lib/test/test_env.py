@@ -57,6 +57,25 @@ class LibraryEnvironmentTest(TestCase):
         env = LibraryEnvironment(self.mock_logger, self.mock_reporter)
         self.assertEqual([], env.user_groups)
 
+    @patch_env("NodeCommunicatorFactory")
+    def test_communication_debug_not_captured(self, mock_factory):
+        self.mock_logger.isEnabledFor.return_value = False
+        LibraryEnvironment(self.mock_logger, self.mock_reporter)
+        self.assertFalse(mock_factory.call_args[1]["debug"])
+
+    @patch_env("NodeCommunicatorFactory")
+    def test_communication_debug_requested(self, mock_factory):
+        self.mock_logger.isEnabledFor.return_value = False
+        LibraryEnvironment(self.mock_logger, self.mock_reporter, debug=True)
+        self.assertTrue(mock_factory.call_args[1]["debug"])
+
+    @patch_env("NodeCommunicatorFactory")
+    def test_communication_debug_needed_by_logger(self, mock_factory):
+        self.mock_logger.isEnabledFor.return_value = True
+        LibraryEnvironment(self.mock_logger, self.mock_reporter)
+        self.assertTrue(mock_factory.call_args[1]["debug"])
+        self.mock_logger.isEnabledFor.assert_called_once_with(logging.DEBUG)
+
     @patch_env("is_cman_cluster")
     def test_is_cman_cluster(self, mock_is_cman):
         mock_is_cman.return_value = True
@@ -4,7 +4,9 @@ from unittest import mock, TestCase
 
 from pcs.common import report_codes
 from pcs.common.tools import Version
+from pcs.lib.cib import journal
 from pcs.lib.env import LibraryEnvironment
+from pcs.lib.pacemaker.live import get_cib
 from pcs.test.tools import fixture
 from pcs.test.tools.assertions import  assert_xml_equal
 from pcs.test.tools.command_env import get_env_tools
@@ -119,6 +121,24 @@ class GetCib(TestCase, ManageCibAssertionMixin):
             open(rc(cib_filename)).read()
         )
 
+    def test_sections(self):
+        self.config.runner.cib.load(sections=["configuration"])
+        cib = etree.fromstring(open(rc("cib-empty.xml")).read())
+        cib.remove(cib.find("status"))
+        assert_xml_equal(
+            etree_to_str(cib),
+            etree_to_str(self.env_assist.get_env().get_cib(
+                sections=["configuration"]
+            ))
+        )
+
+    def test_unknown_section(self):
+        env = self.env_assist.get_env()
+        self.assert_raises_cib_error(
+            lambda: env.get_cib(sections=["configuration", "resources"]),
+            "Unknown CIB sections: resources"
+        )
+
     def test_get_and_property(self):
         self.config.runner.cib.load()
         env = self.env_assist.get_env()
@@ -149,9 +169,36 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
         ]
         self.cib_can_diff = "cib-empty-2.0.xml"
         self.cib_cannot_diff = "cib-empty-1.2.xml"
+        self.cib_diff = """
+            <diff format="2">
+                <change operation="create"
+                    path="/cib/configuration/resources" position="0"
+                >
+                    <primitive id="R"/>
+                </change>
+            </diff>
+        """
         self.env_assist, self.config = get_env_tools(test_case=self)
 
+    @staticmethod
+    def modify_cib(cib):
+        cib.find("configuration/resources").append(
+            etree.Element("primitive", id="R")
+        )
+
+    @staticmethod
+    def modify_cib_unsupported_by_pcs_diff(cib):
+        # comments are not supported by pcs diff, crm_diff is used for them
+        cib.find("configuration").append(etree.Comment("comment"))
+        return etree_to_str(cib)
+
     def config_load_and_push_diff(self):
+        (self.config
+            .runner.cib.load(filename=self.cib_can_diff)
+            .runner.cib.push_diff(cib_diff=self.cib_diff)
+        )
+
+    def config_load_and_push_crm_diff(self):
         (self.config
             .runner.cib.load(filename=self.cib_can_diff)
             .runner.cib.diff(self.tmpfile_old.name, self.tmpfile_new.name)
@@ -194,9 +241,62 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
         self.config_load_and_push_diff()
         env = self.env_assist.get_env()
 
-        env.get_cib()
+        self.modify_cib(env.get_cib())
         env.push_cib()
-        self.env_assist.assert_reports(self.push_reports())
+
+    def test_get_and_push_original_not_parsed_again(self):
+        self.config_load_and_push_diff()
+        env = self.env_assist.get_env()
+
+        with mock.patch(
+            "pcs.lib.env.get_cib", wraps=get_cib
+        ) as mock_get_cib:
+            self.modify_cib(env.get_cib())
+            env.push_cib()
+        self.assertEqual(1, mock_get_cib.call_count)
+
+    def test_get_sections_and_push(self):
+        (self.config
+            .runner.cib.load(
+                filename=self.cib_can_diff, sections=["configuration"]
+            )
+            .runner.cib.push_diff(cib_diff=self.cib_diff)
+        )
+        env = self.env_assist.get_env()
+
+        self.modify_cib(env.get_cib(sections=["configuration"]))
+        env.push_cib()
+
+    def test_get_and_push_tracked_changes(self):
+        self.config_load_and_push_diff()
+        env = self.env_assist.get_env()
+
+        self.modify_cib(env.get_cib(track_changes=True))
+        journal.record_added(env.cib.find("configuration/resources/primitive"))
+        env.push_cib()
+
+    def test_get_and_push_tracked_changes_not_recorded(self):
+        # nothing has been recorded, the whole CIBs are compared
+        self.config_load_and_push_diff()
+        env = self.env_assist.get_env()
+
+        self.modify_cib(env.get_cib(track_changes=True))
+        env.push_cib()
+
+    def test_get_and_push_tracked_no_changes(self):
+        self.config.runner.cib.load(filename=self.cib_can_diff)
+        env = self.env_assist.get_env()
+
+        env.get_cib(track_changes=True)
+        env.push_cib()
+
+    def test_get_and_push_crm_diff(self):
+        self.config_load_and_push_crm_diff()
+        env = self.env_assist.get_env()
+
+        cib_new = self.modify_cib_unsupported_by_pcs_diff(env.get_cib())
+        env.push_cib()
+        self.env_assist.assert_reports(self.push_reports(cib_new=cib_new))
 
     def test_get_and_push_cannot_diff(self):
         self.config_load_and_push()
@@ -209,18 +309,34 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
         )
 
     def test_modified_cib_features_do_not_matter(self):
-        self.config_load_and_push_diff()
+        (self.config
+            .runner.cib.load(filename=self.cib_can_diff)
+            .runner.cib.push_diff(cib_diff="""
+                <diff format="2">
+                    <change operation="modify" path="/cib">
+                        <change-list>
+                            <change-attr name="crm_feature_set"
+                                operation="set" value="3.0.8"
+                            />
+                        </change-list>
+                        <change-result>
+                            <cib admin_epoch="0" epoch="557"
+                                num_updates="122" validate-with="pacemaker-2.0"
+                                crm_feature_set="3.0.8" update-origin="rh7-3"
+                                update-client="crmd"
+                                cib-last-written="Thu Aug 23 16:49:17 2012"
+                                have-quorum="0" dc-uuid="2"
+                            />
+                        </change-result>
+                    </change>
+                </diff>
+            """)
+        )
         env = self.env_assist.get_env()
 
         cib = env.get_cib()
         cib.set("crm_feature_set", "3.0.8")
         env.push_cib()
-        self.env_assist.assert_reports(self.push_reports(
-            cib_new=self.config.calls.get("runner.cib.load").stdout.replace(
-                "3.0.9",
-                "3.0.8"
-            )
-        ))
 
     def test_push_no_features_goes_with_full(self):
         (self.config
@@ -243,12 +359,11 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
         )
         env = self.env_assist.get_env()
 
-        env.get_cib()
+        self.modify_cib(env.get_cib())
         env.push_cib()
         # need to use lambda because env.cib is a property
         self.assert_raises_cib_not_loaded(lambda: env.cib)
         env.get_cib()
-        self.env_assist.assert_reports(self.push_reports())
 
     def test_can_get_after_push_cannot_diff(self):
         self.config_load_and_push()
@@ -276,7 +391,7 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
         self.mock_write_tmpfile.side_effect = EnvironmentError("test error")
         env = self.env_assist.get_env()
 
-        env.get_cib()
+        self.modify_cib_unsupported_by_pcs_diff(env.get_cib())
         self.env_assist.assert_raise_library_error(
             env.push_cib,
             [
@@ -289,6 +404,12 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
         )
 
     def test_diff_is_empty(self):
+        self.config.runner.cib.load(filename=self.cib_can_diff)
+        env = self.env_assist.get_env()
+        env.get_cib()
+        env.push_cib()
+
+    def test_crm_diff_is_empty(self):
         (self.config
             .runner.cib.load(filename=self.cib_can_diff)
             .runner.cib.diff(
@@ -300,9 +421,9 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
             )
         )
         env = self.env_assist.get_env()
-        env.get_cib()
+        cib_new = self.modify_cib_unsupported_by_pcs_diff(env.get_cib())
         env.push_cib()
-        self.env_assist.assert_reports(self.push_reports())
+        self.env_assist.assert_reports(self.push_reports(cib_new=cib_new))
 
     def test_diff_fails(self):
         (self.config
@@ -315,7 +436,7 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
             )
         )
         env = self.env_assist.get_env()
-        env.get_cib()
+        cib_new = self.modify_cib_unsupported_by_pcs_diff(env.get_cib())
         self.env_assist.assert_raise_library_error(
             env.push_cib,
             [
@@ -326,16 +447,17 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
             ],
             expected_in_processor=False
         )
-        self.env_assist.assert_reports(self.push_reports())
+        self.env_assist.assert_reports(self.push_reports(cib_new=cib_new))
 
     def test_push_diff_fails(self):
         (self.config
             .runner.cib.load(filename=self.cib_can_diff)
-            .runner.cib.diff(self.tmpfile_old.name, self.tmpfile_new.name)
-            .runner.cib.push_diff(stderr="invalid cib", returncode=1)
+            .runner.cib.push_diff(
+                cib_diff=self.cib_diff, stderr="invalid cib", returncode=1
+            )
         )
         env = self.env_assist.get_env()
-        env.get_cib()
+        self.modify_cib(env.get_cib())
         self.env_assist.assert_raise_library_error(
             env.push_cib,
             [
@@ -346,7 +468,6 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
             ],
             expected_in_processor=False
         )
-        self.env_assist.assert_reports(self.push_reports())
 
     def test_push_fails(self):
         (self.config
@@ -373,15 +494,13 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
         (self.config
             .runner.cib.load(filename=self.cib_can_diff)
             .runner.pcmk.can_wait()
-            .runner.cib.diff(self.tmpfile_old.name, self.tmpfile_new.name)
-            .runner.cib.push_diff()
+            .runner.cib.push_diff(cib_diff=self.cib_diff)
             .runner.pcmk.wait(timeout=self.wait_timeout)
         )
         env = self.env_assist.get_env()
 
-        env.get_cib()
+        self.modify_cib(env.get_cib())
         env.push_cib(wait=self.wait_timeout)
-        self.env_assist.assert_reports(self.push_reports())
 
     def test_wait_cannot_diff(self):
         (self.config
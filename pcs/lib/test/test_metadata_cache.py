@@ -0,0 +1,110 @@
+import os
+import shutil
+import tempfile
+from unittest import mock, TestCase
+
+from pcs.lib.metadata_cache import MetadataCache
+
+
+class MetadataCacheTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.cache_dir = os.path.join(self.tmp_dir, "cache")
+        self.cache = MetadataCache(self.cache_dir)
+        self.source = os.path.join(self.tmp_dir, "agent")
+        self.write_source("agent v1")
+
+    def write_source(self, content, mtime=1000):
+        with open(self.source, "w") as source_file:
+            source_file.write(content)
+        os.utime(self.source, (mtime, mtime))
+
+    def test_not_cached(self):
+        self.assertIsNone(self.cache.get("agent", [self.source]))
+
+    def test_put_and_get(self):
+        self.assertTrue(self.cache.put("agent", [self.source], "metadata"))
+        self.assertEqual(
+            "metadata", self.cache.get("agent", [self.source])
+        )
+        self.assertIsNone(self.cache.get("other", [self.source]))
+
+    def test_source_mtime_changed(self):
+        self.cache.put("agent", [self.source], "metadata")
+        self.write_source("agent v1", mtime=2000)
+        self.assertIsNone(self.cache.get("agent", [self.source]))
+
+    def test_source_size_changed(self):
+        self.cache.put("agent", [self.source], "metadata")
+        self.write_source("agent v1.1")
+        self.assertIsNone(self.cache.get("agent", [self.source]))
+
+    def test_source_missing(self):
+        missing = os.path.join(self.tmp_dir, "missing")
+        self.assertFalse(self.cache.put("agent", [missing], "metadata"))
+        self.assertIsNone(self.cache.get("agent", [missing]))
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_corrupted_entry(self):
+        self.cache.put("agent", [self.source], "metadata")
+        for file_name in os.listdir(self.cache_dir):
+            with open(os.path.join(self.cache_dir, file_name), "w") as entry:
+                entry.write('{"name": "agent", "sour')
+        self.assertIsNone(self.cache.get("agent", [self.source]))
+
+    def test_cache_dir_not_writable(self):
+        with open(self.cache_dir, "w"):
+            pass
+        self.assertFalse(self.cache.put("agent", [self.source], "metadata"))
+        self.assertIsNone(self.cache.get("agent", [self.source]))
+
+    def test_load_cached(self):
+        self.cache.put("agent", [self.source], "metadata")
+        loader = mock.Mock()
+        self.assertEqual(
+            "metadata", self.cache.load("agent", [self.source], loader)
+        )
+        loader.assert_not_called()
+
+    def test_load_not_cached(self):
+        loader = mock.Mock(return_value="metadata")
+        self.assertEqual(
+            "metadata", self.cache.load("agent", [self.source], loader)
+        )
+        self.assertEqual(
+            "metadata", self.cache.load("agent", [self.source], loader)
+        )
+        loader.assert_called_once_with()
+
+    def test_load_source_changed_while_loading(self):
+        def loader():
+            self.write_source("agent v2", mtime=2000)
+            return "metadata v1"
+        self.cache.load("agent", [self.source], loader)
+        self.assertIsNone(self.cache.get("agent", [self.source]))
+
+    def test_load_error_not_cached(self):
+        loader = mock.Mock(side_effect=ValueError())
+        self.assertRaises(
+            ValueError, self.cache.load, "agent", [self.source], loader
+        )
+        self.assertIsNone(self.cache.get("agent", [self.source]))
+
+    def test_clear(self):
+        self.cache.put("agent", [self.source], "metadata")
+        other_file = os.path.join(self.cache_dir, "other")
+        with open(other_file, "w"):
+            pass
+        self.cache.clear()
+        self.assertIsNone(self.cache.get("agent", [self.source]))
+        self.assertEqual(["other"], os.listdir(self.cache_dir))
+
+    def test_clear_creates_cache_dir(self):
+        self.cache.clear()
+        self.assertTrue(os.path.isdir(self.cache_dir))
+
+    def test_clear_error(self):
+        with open(self.cache_dir, "w"):
+            pass
+        self.assertRaises(EnvironmentError, self.cache.clear)
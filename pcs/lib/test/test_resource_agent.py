@@ -1,5 +1,7 @@
 from functools import partial
 from lxml import etree
+import os
+import tempfile
 from unittest import mock, TestCase
 
 from pcs.test.tools.assertions import (
@@ -16,6 +18,7 @@ from pcs.common import report_codes
 from pcs.lib import resource_agent as lib_ra
 from pcs.lib.errors import ReportItemSeverity as severity, LibraryError
 from pcs.lib.external import CommandRunner
+from pcs.lib.metadata_cache import MetadataCache
 
 patch_agent = create_patcher("pcs.lib.resource_agent")
 patch_agent_object = partial(mock.patch.object, lib_ra.Agent)
@@ -510,6 +513,8 @@ class ListStonithAgentsTest(TestCase):
         ])
 
 
+# the mocked runner returns its outputs in the order it is called
+@mock.patch("pcs.settings.agent_metadata_parallel_jobs", 1)
 class GuessResourceAgentFullNameTest(TestCase):
     def setUp(self):
         self.mock_runner_side_effect = [
@@ -668,6 +673,36 @@ class GuessResourceAgentFullNameTest(TestCase):
         )
 
 
+@mock.patch("pcs.settings.agent_metadata_parallel_jobs", 4)
+class GuessResourceAgentFullNameParallelTest(TestCase):
+    def setUp(self):
+        output_map = {
+            "--list-ocf-providers": "heartbeat\npacemaker\ntest\n",
+            "ocf:heartbeat": "Delay\nDummy\n",
+            "ocf:pacemaker": "Dummy\nStateful\n",
+            "ocf:test": "Dummy\n",
+            "ocf:heartbeat:Dummy": "<resource-agent />",
+            "ocf:pacemaker:Dummy": "invalid metadata",
+            "ocf:test:Dummy": "<resource-agent />",
+        }
+        def run(args, env_extend=None):
+            if args[1] == "--list-standards":
+                return "ocf\n", "", 0
+            return output_map.get(args[-1], ""), "", 0
+        self.mock_runner = mock.MagicMock(spec_set=CommandRunner)
+        self.mock_runner.run.side_effect = run
+        self.mock_runner.with_reporter.return_value = self.mock_runner
+
+    def test_keep_order_of_agents(self):
+        self.assertEqual(
+            [
+                agent.get_name() for agent in
+                lib_ra.guess_resource_agent_full_name(self.mock_runner, "dummy")
+            ],
+            ["ocf:heartbeat:Dummy", "ocf:test:Dummy"]
+        )
+
+
 @patch_agent_object("_get_metadata")
 class AgentMetadataGetShortdescTest(TestCase):
     def setUp(self):
@@ -1676,6 +1711,247 @@ class CrmAgentMetadataIsValidAgentTest(TestCase):
         self.assertFalse(self.agent.is_valid_metadata())
 
 
+class AgentMetadataCacheTest(TestCase):
+    def setUp(self):
+        self.mock_runner = mock.MagicMock(spec_set=CommandRunner)
+        self.mock_runner.run.return_value = ("<resource-agent/>", "", 0)
+        self.cache = mock.Mock(spec_set=["load"])
+        self.cache.load.side_effect = lambda name, sources, loader: loader()
+        lib_ra.set_metadata_cache(self.cache)
+        self.addCleanup(lib_ra.set_metadata_cache, None)
+
+    def assert_cached(self, agent, name, source_list):
+        agent._get_metadata()
+        self.cache.load.assert_called_once_with(
+            name, source_list, mock.ANY
+        )
+        self.mock_runner.run.assert_called_once_with(
+            mock.ANY, env_extend=mock.ANY
+        )
+
+    def test_ocf_agent(self):
+        self.assert_cached(
+            lib_ra.ResourceAgent(self.mock_runner, "ocf:heartbeat:Dummy"),
+            "ocf:heartbeat:Dummy",
+            [
+                "/usr/lib/ocf/resource.d/heartbeat/Dummy",
+                "/usr/sbin/crm_resource",
+            ]
+        )
+
+    def test_stonith_agent(self):
+        self.assert_cached(
+            lib_ra.StonithAgent(self.mock_runner, "fence_dummy"),
+            "stonith:fence_dummy",
+            ["/usr/sbin/fence_dummy", "/usr/sbin/crm_resource"]
+        )
+
+    def test_fenced(self):
+        lib_ra.FencedMetadata(self.mock_runner)._get_metadata()
+        self.cache.load.assert_called_once_with(
+            "pacemaker-fenced",
+            ["/usr/libexec/pacemaker/pacemaker-fenced"],
+            mock.ANY
+        )
+        self.mock_runner.run.assert_called_once_with(
+            ["/usr/libexec/pacemaker/pacemaker-fenced", "metadata"]
+        )
+
+    def test_agent_without_executable(self):
+        lib_ra.ResourceAgent(self.mock_runner, "systemd:chronyd")._get_metadata()
+        self.cache.load.assert_not_called()
+        self.mock_runner.run.assert_called_once_with(
+            mock.ANY, env_extend=mock.ANY
+        )
+
+    def test_absent_agent(self):
+        lib_ra.AbsentResourceAgent(
+            self.mock_runner, "ocf:heartbeat:Dummy"
+        )._get_metadata()
+        self.cache.load.assert_not_called()
+        self.mock_runner.run.assert_not_called()
+
+
+class GetMetadataCacheTest(TestCase):
+    def setUp(self):
+        for name, value in (
+            ("_metadata_cache", None),
+            ("_is_metadata_cache_set", False),
+        ):
+            patcher = mock.patch.object(lib_ra, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @mock.patch.object(lib_ra.settings, "agent_metadata_cache_dir", "/cache")
+    def test_set_up_from_settings(self):
+        cache = lib_ra.get_metadata_cache()
+        self.assertEqual("/cache", cache.cache_dir)
+        self.assertIs(cache, lib_ra.get_metadata_cache())
+
+    @mock.patch.object(lib_ra.settings, "agent_metadata_cache_dir", None)
+    def test_disabled_in_settings(self):
+        self.assertIsNone(lib_ra.get_metadata_cache())
+
+    @mock.patch.object(lib_ra.settings, "agent_metadata_cache_dir", "/cache")
+    def test_set_cache_overrides_settings(self):
+        lib_ra.set_metadata_cache(None)
+        self.assertIsNone(lib_ra.get_metadata_cache())
+
+
+class AgentIndexTest(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+        self.crm_resource = os.path.join(self.tmp_dir, "crm_resource")
+        self.ocf_root = os.path.join(self.tmp_dir, "ocf")
+        self.provider_dir = os.path.join(self.ocf_root, "resource.d", "test")
+        self.lsb_dir = os.path.join(self.tmp_dir, "init.d")
+        os.makedirs(self.provider_dir)
+        os.makedirs(self.lsb_dir)
+        for path in (
+            self.crm_resource,
+            os.path.join(self.provider_dir, "Dummy"),
+        ):
+            with open(path, "w"):
+                pass
+
+        for name, value in (
+            ("_crm_resource", self.crm_resource),
+            ("settings.ocf_root", self.ocf_root),
+            ("settings.lsb_agents_dir", self.lsb_dir),
+        ):
+            patcher = mock.patch(
+                "pcs.lib.resource_agent.{0}".format(name), value
+            )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        lib_ra.set_metadata_cache(
+            MetadataCache(os.path.join(self.tmp_dir, "cache"))
+        )
+        self.addCleanup(lib_ra.set_metadata_cache, None)
+
+        self.output_map = {
+            "--list-standards": ("ocf\nlsb\n", 0),
+            "--list-ocf-providers": ("test\n", 0),
+            "ocf:test": ("Dummy\n", 0),
+            "lsb": ("network\n", 0),
+            "systemd": ("sshd\n", 0),
+            "service": ("network\nsshd\n", 0),
+            "nagios": ("", 1),
+            "ocf:test:Dummy": ("<resource-agent />", 0),
+        }
+        self.mock_runner = mock.MagicMock(spec_set=CommandRunner)
+        self.mock_runner.run.side_effect = self.run_command
+        self.mock_runner.with_reporter.return_value = self.mock_runner
+
+    def run_command(self, args, env_extend=None):
+        # pylint: disable=unused-argument
+        stdout, retval = self.output_map[args[-1]]
+        return stdout, "", retval
+
+    def assert_runs(self, expected_count, func, *args):
+        self.mock_runner.run.reset_mock()
+        result = func(self.mock_runner, *args)
+        self.assertEqual(expected_count, self.mock_runner.run.call_count)
+        return result
+
+    def touch_provider_dir(self):
+        os.utime(self.provider_dir, ns=(1, 1))
+
+    def test_standards_and_providers(self):
+        for run_count in (2, 0):
+            self.assertEqual(
+                ["lsb", "ocf:test"],
+                self.assert_runs(
+                    run_count,
+                    lib_ra.list_resource_agents_standards_and_providers
+                )
+            )
+
+    def test_agents(self):
+        for run_count in (1, 0, 0):
+            self.assertEqual(
+                ["Dummy"],
+                self.assert_runs(
+                    run_count, lib_ra.list_resource_agents, "ocf:test"
+                )
+            )
+        self.touch_provider_dir()
+        self.assert_runs(1, lib_ra.list_resource_agents, "ocf:test")
+
+    def test_agents_unknown_directory(self):
+        for dummy_i in range(2):
+            self.assertEqual(
+                [],
+                self.assert_runs(1, lib_ra.list_resource_agents, "nagios")
+            )
+
+    def test_failed_listing_not_cached(self):
+        self.output_map["ocf:test"] = ("", 1)
+        self.assertEqual(
+            [], self.assert_runs(1, lib_ra.list_resource_agents, "ocf:test")
+        )
+        self.output_map["ocf:test"] = ("Dummy\n", 0)
+        self.assertEqual(
+            ["Dummy"],
+            self.assert_runs(1, lib_ra.list_resource_agents, "ocf:test")
+        )
+
+    def test_standards_retval_not_zero_not_cached(self):
+        self.output_map["--list-standards"] = ("ocf\nlsb\n", 2)
+        for dummy_i in range(2):
+            self.assertEqual(
+                ["lsb", "ocf"],
+                self.assert_runs(1, lib_ra.list_resource_agents_standards)
+            )
+
+    def test_empty_listing_not_cached(self):
+        self.output_map["ocf:test"] = ("", 0)
+        self.assertEqual(
+            [], self.assert_runs(1, lib_ra.list_resource_agents, "ocf:test")
+        )
+        self.output_map["ocf:test"] = ("Dummy\n", 0)
+        self.assertEqual(
+            ["Dummy"],
+            self.assert_runs(1, lib_ra.list_resource_agents, "ocf:test")
+        )
+
+    def test_systemd_agents_not_cached(self):
+        for standard, agent_list in (
+            ("systemd", ["sshd"]),
+            ("service", ["network", "sshd"]),
+        ):
+            for dummy_i in range(2):
+                self.assertEqual(
+                    agent_list,
+                    self.assert_runs(1, lib_ra.list_resource_agents, standard)
+                )
+
+    def test_guess_agent(self):
+        for run_count in (5, 0):
+            self.assertEqual(
+                ["ocf:test:Dummy"],
+                [
+                    agent.get_name() for agent in self.assert_runs(
+                        run_count,
+                        lib_ra.guess_resource_agent_full_name,
+                        "dummy"
+                    )
+                ]
+            )
+
+    def test_guess_agent_invalid(self):
+        self.output_map["ocf:test:Dummy"] = ("", 1)
+        for run_count in (5, 0):
+            self.assertEqual(
+                [],
+                self.assert_runs(
+                    run_count, lib_ra.guess_resource_agent_full_name, "dummy"
+                )
+            )
+
+
 class StonithAgentMetadataGetNameTest(TestCase, ExtendedAssertionsMixin):
     def test_success(self):
         mock_runner = mock.MagicMock(spec_set=CommandRunner)
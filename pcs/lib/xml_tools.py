@@ -1,5 +1,31 @@
 from lxml import etree
 
+def _ignore_change(element):
+    # pylint: disable=unused-argument
+    pass
+
+# Functions to be notified about changes made to trees by the functions of
+# this module. Layers tracking changes of trees set them by calling
+# set_change_recorders.
+_change_recorders = {
+    "added": _ignore_change,
+    "removed": _ignore_change,
+    "attributes_modified": _ignore_change,
+}
+
+def set_change_recorders(added, removed, attributes_modified):
+    """
+    Set functions to be notified about changes made to trees by this module
+
+    callable added -- called with an element after it has been inserted
+    callable removed -- called with an element before it is removed
+    callable attributes_modified -- called with an element before its
+        attributes are changed
+    """
+    _change_recorders["added"] = added
+    _change_recorders["removed"] = removed
+    _change_recorders["attributes_modified"] = attributes_modified
+
 def get_root(tree):
     # ElementTree has getroot, Elemet has getroottree
     return tree.getroot() if hasattr(tree, "getroot") else tree.getroottree()
@@ -37,6 +63,7 @@ def get_sub_element(element, sub_element_tag, new_id=None, new_index=None):
             element.append(sub_element)
         else:
             element.insert(new_index, sub_element)
+        _change_recorders["added"](sub_element)
     return sub_element
 
 def export_attributes(element):
@@ -52,8 +79,10 @@ def update_attribute_remove_empty(element, name, value):
     """
     if len(value) < 1:
         if name in element.attrib:
+            _change_recorders["attributes_modified"](element)
             del element.attrib[name]
         return
+    _change_recorders["attributes_modified"](element)
     element.set(name, value)
 
 def update_attributes_remove_empty(element, attributtes):
@@ -117,4 +146,5 @@ def remove_when_pointless(element, attribs_important=True):
     )
 
     if not is_element_useful:
+        _change_recorders["removed"](element)
         element.getparent().remove(element)
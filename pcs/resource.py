@@ -92,6 +92,8 @@ def resource_cmd(lib, argv, modifiers):
             resource_providers(lib, argv_next, modifiers)
         elif sub_cmd == "agents":
             resource_agents(lib, argv_next, modifiers)
+        elif sub_cmd == "agent-cache":
+            resource_agent_cache(lib, argv_next, modifiers)
         elif sub_cmd == "update":
             resource_update(lib, argv_next, modifiers)
         elif sub_cmd == "add_operation":
@@ -280,8 +282,12 @@ def resource_list_available(lib, argv, modifiers):
         raise CmdLineInputError()
 
     search = argv[0] if argv else None
+    # print the agents as soon as they are loaded, loading descriptions of all
+    # of them takes a while
     agent_list = lib.resource_agent.list_agents(
-        not modifiers.get("--nodesc"), search
+        not modifiers.get("--nodesc"),
+        search,
+        on_agent_loaded=print_agent_info,
     )
 
     if not agent_list:
@@ -292,16 +298,25 @@ def resource_list_available(lib, argv, modifiers):
             "Do you have resource agents installed?"
         )
 
-    for agent_info in agent_list:
-        name = agent_info["name"]
-        shortdesc = agent_info["shortdesc"]
-        if shortdesc:
-            print("{0} - {1}".format(
-                name,
-                _format_desc(len(name + " - "), shortdesc.replace("\n", " "))
-            ))
-        else:
-            print(name)
+
+def print_agent_info(agent_info):
+    """
+    Print an agent as a line of resource and stonith agent lists
+
+    dict agent_info -- agent name and shortdesc as provided by list_agents
+    Commandline options: no options
+    """
+    name = agent_info["name"]
+    shortdesc = agent_info["shortdesc"]
+    if shortdesc:
+        print("{0} - {1}".format(
+            name,
+            _format_desc(len(name + " - "), shortdesc.replace("\n", " "))
+        ))
+    else:
+        print(name)
+    # the agents are printed while others are being loaded
+    sys.stdout.flush()
 
 
 def resource_list_options(lib, argv, modifiers):
@@ -792,6 +807,20 @@ def resource_agents(lib, argv, modifiers):
             " for {0}".format(argv[0]) if argv else ""
         ))
 
+def resource_agent_cache(lib, argv, modifiers):
+    """
+    Options: no options
+    """
+    modifiers.ensure_only_supported()
+    if len(argv) != 1:
+        raise CmdLineInputError()
+    if argv[0] == "clear":
+        lib.resource_agent.clear_metadata_cache()
+    elif argv[0] == "rebuild":
+        lib.resource_agent.rebuild_metadata_cache()
+    else:
+        raise CmdLineInputError()
+
 # Update a resource, removing any args that are empty and adding/updating
 # args that are not empty
 def resource_update(dummy_lib, args, modifiers, deal_with_guest_change=True):
@@ -1742,6 +1771,7 @@ def resource_remove(resource_id, output=True, is_remove_remote_context=False):
                     res_stopped = False
                     for _ in range(15):
                         time.sleep(1)
+                        utils.invalidate_cib_snapshot()
                         if not utils.resource_running_on(res_id)["is_running"]:
                             res_stopped = True
                             break
@@ -1799,6 +1829,7 @@ def resource_remove(resource_id, output=True, is_remove_remote_context=False):
             retval = 0
             for _ in range(15):
                 time.sleep(1)
+                utils.invalidate_cib_snapshot()
                 if not utils.resource_running_on(resource_id)["is_running"]:
                     break
         if utils.resource_running_on(resource_id)["is_running"]:
@@ -25,6 +25,13 @@ pacemaker_authkey_file = "/etc/pacemaker/authkey"
 booth_authkey_file_mode = 0o600
 cluster_conf_file = "/etc/cluster/cluster.conf"
 fence_agent_binaries = "/usr/sbin/"
+ocf_root = "/usr/lib/ocf"
+# Directory holding lsb agents. The cached list of lsb agents is refreshed when
+# the directory changes.
+lsb_agents_dir = "/etc/init.d"
+# Maximal number of agents' metadata loaded in parallel when listing or
+# searching agents. 1 means the metadata are loaded one by one.
+agent_metadata_parallel_jobs = 8
 pacemaker_schedulerd = "/usr/libexec/pacemaker/pacemaker-schedulerd"
 pacemaker_controld = "/usr/libexec/pacemaker/pacemaker-controld"
 pacemaker_based = "/usr/libexec/pacemaker/pacemaker-based"
@@ -34,11 +41,21 @@ crm_report = os.path.join(pacemaker_binaries, "crm_report")
 crm_verify = os.path.join(pacemaker_binaries, "crm_verify")
 cibadmin = os.path.join(pacemaker_binaries, "cibadmin")
 crm_mon_schema = '/usr/share/pacemaker/crm_mon.rng'
+# Status documents parsed with sampled validation are validated against
+# crm_mon_schema once in this number of parses (the first one is always
+# validated). 1 means each document is validated.
+crm_mon_schema_validation_sample_rate = 10
+# Input and output of external processes put to debug reports are cut to this
+# number of characters, so that big CIBs are not copied to the reports. None
+# means they are never cut. Full input and output are logged at debug level.
+external_process_report_output_limit = 256 * 1024
 agent_metadata_schema = "/usr/share/resource-agents/ra-api-1.dtd"
 pcsd_cert_location = "/var/lib/pcsd/pcsd.crt"
 pcsd_key_location = "/var/lib/pcsd/pcsd.key"
 pcsd_users_conf_location = "/var/lib/pcsd/pcs_users.conf"
 pcsd_settings_conf_location = "/var/lib/pcsd/pcs_settings.conf"
+# Agents' metadata are cached in this directory. None disables the cache.
+agent_metadata_cache_dir = "/var/lib/pcsd/agent_metadata"
 pcsd_exec_location = "/usr/lib/pcsd/"
 pcsd_log_location = "/var/log/pcsd/pcsd.log"
 pcsd_default_port = 2224
@@ -56,8 +73,29 @@ pacemaker_wait_timeout_status = 124
 booth_config_dir = "/etc/booth"
 booth_binary = "/usr/sbin/booth"
 default_request_timeout = 60
+# Open connections to other nodes are kept and reused by later requests. These
+# limit the number of kept connections and their idle time in seconds.
+communicator_max_cached_connections = 32
+communicator_connection_max_idle = 60
+# Max number of bytes of debug output captured for each request to other nodes
+# when running with --debug. None means no limit.
+communicator_debug_limit = None
+# Max number of requests to other nodes running at once in total and against
+# one node. Other requests wait in a queue. None means no limit.
+communicator_max_parallel_requests = 64
+communicator_max_parallel_requests_per_host = 8
+# If a node has more addresses, try the next address when the previous one does
+# not respond in this number of seconds instead of waiting for the previous one
+# to fail. None means addresses are tried one by one.
+communicator_address_race_delay = None
 pcs_bundled_dir = "/usr/lib/pcs/bundled/"
 pcs_bundled_pacakges_dir = os.path.join(pcs_bundled_dir, "packages")
+# Bash completion suggestions are generated from the usage when pcs is
+# installed and stored in this file. They are generated on each completion if
+# the file is not available.
+completion_tree_file = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "completion_tree.json"
+)
 
 default_ssl_ciphers = "DEFAULT:!RC4:!3DES:@STRENGTH"
 
@@ -76,5 +114,18 @@ default_ssl_options = ",".join([
 ])
 pcsd_gem_path = "vendor/bundle/ruby"
 ruby_executable = "/usr/bin/ruby"
+# Number of long running ruby processes serving requests for pcsd. Value 0
+# means that a new ruby process is started for each request.
+pcsd_ruby_workers = 4
+# A ruby worker is replaced by a fresh one after serving this number of
+# requests. Value 0 means that workers are never replaced.
+pcsd_ruby_worker_max_requests = 500
+# Number of processes running PAM authentication and user groups lookups.
+pcsd_auth_workers = 2
+# Authentication processes are replaced by new ones after running this number
+# of tasks. Value 0 means that they are never replaced.
+pcsd_auth_worker_max_tasks = 1000
+# How long (in seconds) are groups of a logged in user kept in memory.
+pcsd_user_groups_cache_ttl = 10
 
 gui_session_lifetime_seconds=60 * 60
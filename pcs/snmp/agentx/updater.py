@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from pyagentx import Updater
 
 
@@ -9,11 +11,24 @@ class AgentxUpdaterBase(Updater):
 
     # this has to be set by the descendants
     _oid_tree = None
+    # string oid -> (number form of oid, Oid), see _get_oid_map
+    _oid_map = None
+    # rows set by set_table in the previous update and their values,
+    # {table oid: {row id: (row, {value oid: value data})}}
+    _table_row_cache = None
 
     @property
     def oid_tree(self):
         return self._oid_tree
 
+    @classmethod
+    def _get_oid_map(cls):
+        # The tree is compiled once for each class, so that string oids are not
+        # searched for in the tree on each update.
+        if cls.__dict__.get("_oid_map") is None:
+            cls._oid_map = _compile_oid_tree(cls._oid_tree)
+        return cls._oid_map
+
     def _set_val(self, data_type, oid, value):
         self._data[oid] = {'name': oid, 'type': data_type, 'value': value}
 
@@ -40,52 +55,98 @@ class AgentxUpdaterBase(Updater):
         value primitive value or list of primitive values -- value to be set on
           specified str_oid
         """
-        oid, oid_cls = _str_oid_to_oid(self.oid_tree, str_oid)
+        oid, oid_cls = self._get_oid_map_item(str_oid)
+        if not oid_cls.data_type:
+            raise AssertionError(
+                "oid '{0}' does not hold a value".format(str_oid)
+            )
         self.set_typed_value(oid, oid_cls.data_type(value))
 
+    def get_oid(self, str_oid):
+        """
+        Return number form of an oid, e.g. to be passed to set_table
+
+        str_oid string -- string form of oid
+        """
+        return self._get_oid_map_item(str_oid)[0]
+
+    def _get_oid_map_item(self, str_oid):
+        try:
+            return self._get_oid_map()[str_oid]
+        except KeyError:
+            raise AssertionError(
+                "oid '{0}' not found in the oid tree".format(str_oid)
+            )
+
     def set_table(self, oid, table):
         """
         oid string -- number form of oid
         table list of list of BaseType -- members of outer list represent rows
           of table and members of inner list are columns.
+
+        Values of rows which have not changed since the previous update of the
+        table are reused, only new and changed rows are converted to oids.
         """
+        if self._table_row_cache is None:
+            self._table_row_cache = {}
+        previous_rows = self._table_row_cache.get(oid, {})
+        current_rows = {}
         for row in table:
             if not row:
                 continue
-            row_id = _str_to_oid(str(row[0].value))
-            for index, col in enumerate(row[1:], start=2):
-                value_oid = "{base_oid}.{index}.{row_id}".format(
-                    base_oid=oid, index=index, row_id=row_id
-                )
-                self._set_val(col.data_type, value_oid, col.value)
+            row = tuple(row)
+            row_key = str(row[0].value)
+            cached_row = previous_rows.get(row_key)
+            if cached_row is not None and cached_row[0] == row:
+                row_values = cached_row[1]
+            else:
+                row_values = _get_row_values(oid, row_key, row)
+            self._data.update(row_values)
+            current_rows[row_key] = (row, row_values)
+        self._table_row_cache[oid] = current_rows
 
 
-def _find_oid_in_sub_tree(sub_tree, section_name):
-    if sub_tree.member_list is None:
-        return None
-    for oid in sub_tree.member_list:
-        if oid.str_oid == section_name:
-            return oid
-    return None
+def _get_row_values(oid, row_key, row):
+    row_id = _str_to_oid(row_key)
+    row_values = {}
+    for index, col in enumerate(row[1:], start=2):
+        value_oid = "{base_oid}.{index}.{row_id}".format(
+            base_oid=oid, index=index, row_id=row_id
+        )
+        row_values[value_oid] = {
+            'name': value_oid, 'type': col.data_type, 'value': col.value
+        }
+    return row_values
 
 
-def _str_oid_to_oid(sub_tree, str_oid):
-    sections = str_oid.split(".")
-    oid_list = []
-    for section in sections:
-        sub_tree = _find_oid_in_sub_tree(sub_tree, section)
-        if sub_tree is None:
-            raise AssertionError(
-                "oid section '{0}' ({1}) not found in section '{2}'".format(
-                    section, str_oid, oid_list[-1] if len(oid_list) else "."
-                )
+def _compile_oid_tree(oid_tree):
+    """
+    Return a dict mapping string oids to tuples (number form of oid, Oid)
+
+    Oid oid_tree -- root of the tree, it is not a part of the oids
+    """
+    oid_map = {}
+    _add_sub_tree_to_map(oid_map, oid_tree, [], [])
+    return oid_map
+
+
+def _add_sub_tree_to_map(oid_map, sub_tree, str_oid_list, oid_list):
+    if sub_tree.member_list is None:
+        return
+    for oid in sub_tree.member_list:
+        member_str_oid_list = str_oid_list + [oid.str_oid]
+        member_oid_list = oid_list + [str(oid.oid)]
+        oid_map[".".join(member_str_oid_list)] = (
+            ".".join(member_oid_list), oid
+        )
+        if not oid.data_type:
+            _add_sub_tree_to_map(
+                oid_map, oid, member_str_oid_list, member_oid_list
             )
-        oid_list.append(str(sub_tree.oid))
-        if sub_tree.data_type:
-            oid = ".".join(oid_list)
-            return (oid, sub_tree)
 
 
+# Row ids are the same in each update, so they are not encoded repeatedly.
+@lru_cache(maxsize=4096)
 def _str_to_oid(data):
     length = len(data)
     oid_int = [str(ord(i)) for i in data]
@@ -0,0 +1,321 @@
+"""
+Status of the local cluster provided by the SNMP agent. It is collected by
+running pacemaker and corosync tools directly, which is much cheaper than
+asking pcsd for the status of the node.
+"""
+from collections import namedtuple
+from io import BytesIO
+import os
+import re
+
+from lxml import etree
+
+from pcs import settings
+from pcs.common.tools import xml_fromstring
+from pcs.lib.cib.status import get_resources_failcounts
+from pcs.lib.corosync import live as corosync_live
+from pcs.lib.corosync.config_facade import ConfigFacade
+from pcs.lib.errors import LibraryError
+from pcs.lib.pacemaker.live import (
+    get_cib_xml_bytes,
+    get_cluster_status_xml_bytes,
+)
+from pcs.lib.pacemaker.state import (
+    ClusterStateSnapshot,
+    get_cluster_state_dom,
+    VALIDATE_SAMPLED,
+)
+from pcs.lib.pacemaker.values import is_true
+
+
+RESOURCE_RUNNING = "running"
+RESOURCE_DISABLED = "disabled"
+RESOURCE_FAILED = "failed"
+
+# pacemaker's INFINITY, fail counts are not reported higher than this
+FAIL_COUNT_INFINITY = 1000000
+# the most significant role of instances of a resource is reported
+_ROLE_PRIORITY = ("Master", "Started", "Slave")
+
+# crm_mon puts the time of its run to its output, it must not be taken as a
+# change of the status
+_LAST_UPDATE_RE = re.compile(br"<last_update\b[^>]*>")
+_CIB_VERSION_ATTRIBUTES = ("admin_epoch", "epoch", "num_updates")
+
+ClusterStatus = namedtuple(
+    "ClusterStatus",
+    [
+        "cluster_name",
+        "quorate",
+        "corosync_nodes_online",
+        "corosync_nodes_offline",
+        "pcmk_nodes_online",
+        "pcmk_nodes_standby",
+        "pcmk_nodes_offline",
+        "node_list",
+        "resource_list",
+    ]
+)
+
+NodeStatus = namedtuple(
+    "NodeStatus",
+    [
+        "name",
+        "type",
+        "online",
+        "standby",
+        "maintenance",
+        "is_dc",
+        "resources_running",
+    ]
+)
+
+ResourceStatus = namedtuple(
+    "ResourceStatus",
+    ["id", "status", "role", "managed", "fail_count", "node_names"]
+)
+
+
+class ClusterStatusCollector(object):
+    """
+    Collects the status of the cluster repeatedly, parses it only if it has
+    changed since the previous collection
+    """
+    def __init__(self, runner):
+        """
+        CommandRunner runner
+        """
+        self._runner = runner
+        self._status_key = None
+        self._corosync_conf_key = None
+        self._corosync_conf = None
+
+    def get_status(self):
+        """
+        Return ClusterStatus or None if the status has not changed since the
+        previous call. Raise LibraryError if the status cannot be obtained.
+        """
+        crm_mon_xml = get_cluster_status_xml_bytes(self._runner)
+        cib_xml = get_cib_xml_bytes(self._runner)
+        corosync_conf_key = _get_corosync_conf_key()
+        # Changes of the corosync membership are recorded in the CIB status
+        # section, so the membership does not have to be read on each call.
+        # Nodes and the cluster name are read from corosync.conf which may
+        # change without the CIB being changed.
+        status_key = (
+            _get_cib_version(cib_xml),
+            _LAST_UPDATE_RE.sub(b"", crm_mon_xml),
+            corosync_conf_key,
+        )
+        if status_key == self._status_key:
+            return None
+        status = self._build_status(crm_mon_xml, cib_xml, corosync_conf_key)
+        self._status_key = status_key
+        return status
+
+    def _build_status(self, crm_mon_xml, cib_xml, corosync_conf_key):
+        crm_mon_dom = get_cluster_state_dom(crm_mon_xml, VALIDATE_SAMPLED)
+        state = ClusterStateSnapshot(crm_mon_dom)
+        cib = xml_fromstring(cib_xml)
+        corosync_conf = self._get_corosync_conf(corosync_conf_key)
+
+        cluster_name = ""
+        corosync_nodes = []
+        corosync_nodes_online = []
+        if corosync_conf is not None:
+            cluster_name = corosync_conf.get_cluster_name()
+            corosync_nodes = corosync_conf.get_nodes_names()
+            corosync_nodes_online = self._get_corosync_members()
+        if not cluster_name:
+            # there is no corosync.conf on remote nodes
+            cluster_name = _get_cluster_name_property(cib)
+
+        pcmk_nodes_online = []
+        pcmk_nodes_standby = []
+        pcmk_nodes_offline = []
+        node_list = []
+        for node in state.nodes:
+            node_list.append(NodeStatus(
+                name=node.name,
+                type=node.type,
+                online=node.online,
+                standby=node.standby,
+                maintenance=node.maintenance,
+                is_dc=node.is_dc,
+                resources_running=len([
+                    primitive
+                    for primitive in state.get_primitives_on_node(node.name)
+                    if primitive.active
+                ]),
+            ))
+            if node.type == "remote":
+                continue
+            if not node.online:
+                pcmk_nodes_offline.append(node.name)
+            elif node.standby:
+                pcmk_nodes_standby.append(node.name)
+            else:
+                pcmk_nodes_online.append(node.name)
+
+        current_dc = crm_mon_dom.find("summary/current_dc")
+        return ClusterStatus(
+            cluster_name=cluster_name,
+            quorate=(
+                current_dc is not None
+                and
+                is_true(current_dc.get("with_quorum", ""))
+            ),
+            corosync_nodes_online=sorted(
+                node for node in corosync_nodes_online
+                if node in corosync_nodes
+            ),
+            corosync_nodes_offline=sorted(
+                node for node in corosync_nodes
+                if node not in corosync_nodes_online
+            ),
+            pcmk_nodes_online=pcmk_nodes_online,
+            pcmk_nodes_standby=pcmk_nodes_standby,
+            pcmk_nodes_offline=pcmk_nodes_offline,
+            node_list=node_list,
+            resource_list=_get_resource_status_list(cib, state),
+        )
+
+    def _get_corosync_conf(self, conf_key):
+        # corosync.conf is parsed again only when it changes
+        if conf_key is None:
+            self._corosync_conf_key = None
+            self._corosync_conf = None
+            return None
+        if conf_key != self._corosync_conf_key:
+            try:
+                with open(conf_key[0]) as conf_file:
+                    self._corosync_conf = ConfigFacade.from_string(
+                        conf_file.read()
+                    )
+            except (EnvironmentError, LibraryError):
+                self._corosync_conf = None
+            self._corosync_conf_key = conf_key
+        return self._corosync_conf
+
+    def _get_corosync_members(self):
+        try:
+            return corosync_live.QuorumStatus.from_string(
+                corosync_live.get_quorum_status_text(self._runner)
+            ).node_names
+        except corosync_live.QuorumStatusException:
+            return []
+
+
+def _get_corosync_conf_key():
+    """
+    Return path, mtime and size of corosync.conf, None if it does not exist
+    """
+    path = settings.corosync_conf_file
+    try:
+        stat = os.stat(path)
+    except EnvironmentError:
+        return None
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+
+def _get_cib_version(cib_xml):
+    # only the root element is parsed, the rest of the CIB is not needed
+    for dummy_event, element in etree.iterparse(
+        BytesIO(cib_xml), events=("start",), huge_tree=True
+    ):
+        return tuple(element.get(name) for name in _CIB_VERSION_ATTRIBUTES)
+    return None
+
+
+def _get_cluster_name_property(cib):
+    for nvpair in cib.iterfind(
+        "configuration/crm_config/cluster_property_set/nvpair"
+    ):
+        if nvpair.get("name") == "cluster-name":
+            return nvpair.get("value", "")
+    return ""
+
+
+def _get_resource_status_list(cib, state):
+    resources = cib.find("configuration/resources")
+    if resources is None:
+        return []
+    fail_counts = _get_fail_counts(cib)
+    resource_list = []
+    # resources are listed in the same order as pcsd lists them
+    for tag in ("primitive", "group", "clone", "master"):
+        for element in resources.iterfind(tag):
+            for primitive, disabled in _iter_primitives(element, False):
+                resource_list.append(
+                    _get_resource_status(
+                        primitive, disabled, state, fail_counts
+                    )
+                )
+    return resource_list
+
+
+def _get_fail_counts(cib):
+    status = cib.find("status")
+    if status is None:
+        return {}
+    fail_counts = {}
+    for failure in get_resources_failcounts(status):
+        fail_count = failure["fail_count"]
+        if fail_count == "INFINITY":
+            fail_count = FAIL_COUNT_INFINITY
+        fail_counts[failure["resource"]] = min(
+            FAIL_COUNT_INFINITY,
+            fail_counts.get(failure["resource"], 0) + fail_count
+        )
+    return fail_counts
+
+
+def _get_resource_status(primitive, disabled, state, fail_counts):
+    resource_id = primitive.get("id")
+    instance_list = state.get_primitives(resource_id)
+    active_list = [instance for instance in instance_list if instance.active]
+    # stonith resources are not disabled by their target-role
+    if disabled and primitive.get("class") != "stonith":
+        status = RESOURCE_DISABLED
+    elif active_list:
+        status = RESOURCE_RUNNING
+    else:
+        status = RESOURCE_FAILED
+    return ResourceStatus(
+        id=resource_id,
+        status=status,
+        role=_get_role(instance_list),
+        managed=all(instance.managed for instance in instance_list),
+        fail_count=fail_counts.get(resource_id, 0),
+        node_names=sorted(set(
+            node_name
+            for instance in active_list
+            for node_name in instance.node_names
+        )),
+    )
+
+
+def _get_role(instance_list):
+    role_set = set(instance.role for instance in instance_list)
+    for role in _ROLE_PRIORITY:
+        if role in role_set:
+            return role
+    return "Stopped"
+
+
+def _iter_primitives(element, parent_disabled):
+    disabled = parent_disabled or _is_disabled(element)
+    if element.tag == "primitive":
+        yield element, disabled
+        return
+    for child in element:
+        if child.tag in ("primitive", "group"):
+            for primitive in _iter_primitives(child, disabled):
+                yield primitive
+
+
+def _is_disabled(element):
+    for nvpair in element.iterfind("meta_attributes/nvpair"):
+        if nvpair.get("name") == "target-role":
+            return nvpair.get("value", "").lower() == "stopped"
+    return False
@@ -0,0 +1,187 @@
+from unittest import mock, TestCase
+
+import pyagentx
+
+from pcs.snmp.agentx import updater
+from pcs.snmp.agentx.types import IntegerType, Oid, StringType
+from pcs.snmp.agentx.updater import AgentxUpdaterBase
+
+
+class Updater(AgentxUpdaterBase):
+    _oid_tree = Oid(0, "root", member_list=[
+        Oid(1, "a", member_list=[
+            Oid(1, "x", IntegerType),
+            Oid(5, "b", member_list=[
+                Oid(2, "y", StringType),
+                Oid(3, "z", IntegerType),
+            ]),
+        ]),
+        Oid(3, "c", StringType),
+    ])
+
+
+class OtherUpdater(AgentxUpdaterBase):
+    _oid_tree = Oid(0, "root", member_list=[
+        Oid(7, "a", member_list=[
+            Oid(1, "x", IntegerType),
+        ]),
+    ])
+
+
+def fixture_value(oid, data_type, value):
+    return {oid: {"name": oid, "type": data_type, "value": value}}
+
+
+class SetValueTest(TestCase):
+    def setUp(self):
+        self.updater = Updater()
+        self.updater.agent_setup(None, "1.3.6.1.4.1.32723.100", 10)
+
+    def test_nested_oids(self):
+        self.updater.set_value("a.b.y", "value")
+        self.updater.set_value("a.b.z", 5)
+        self.updater.set_value("a.x", 1)
+        self.updater.set_value("c", "top")
+        expected = {}
+        expected.update(
+            fixture_value("1.5.2.0", pyagentx.TYPE_OCTETSTRING, "value")
+        )
+        expected.update(fixture_value("1.5.3.0", pyagentx.TYPE_INTEGER, 5))
+        expected.update(fixture_value("1.1.0", pyagentx.TYPE_INTEGER, 1))
+        expected.update(fixture_value("3.0", pyagentx.TYPE_OCTETSTRING, "top"))
+        self.assertEqual(expected, self.updater._data)
+
+    def test_value_list(self):
+        self.updater.set_value("a.b.y", ["first", "second"])
+        expected = {}
+        expected.update(
+            fixture_value("1.5.2.0", pyagentx.TYPE_OCTETSTRING, "first")
+        )
+        expected.update(
+            fixture_value("1.5.2.1", pyagentx.TYPE_OCTETSTRING, "second")
+        )
+        self.assertEqual(expected, self.updater._data)
+
+    def test_get_oid(self):
+        self.assertEqual("1.5", self.updater.get_oid("a.b"))
+        self.assertEqual("1.5.3", self.updater.get_oid("a.b.z"))
+
+    def test_unknown_oid(self):
+        for str_oid in ("d", "a.d", "a.b.y.d", "root.a"):
+            with self.subTest(str_oid=str_oid):
+                with self.assertRaises(AssertionError) as cm:
+                    self.updater.set_value(str_oid, 1)
+                self.assertEqual(
+                    "oid '{0}' not found in the oid tree".format(str_oid),
+                    str(cm.exception)
+                )
+        self.assertEqual({}, self.updater._data)
+
+    def test_oid_without_value(self):
+        for str_oid in ("a", "a.b"):
+            with self.subTest(str_oid=str_oid):
+                with self.assertRaises(AssertionError) as cm:
+                    self.updater.set_value(str_oid, 1)
+                self.assertEqual(
+                    "oid '{0}' does not hold a value".format(str_oid),
+                    str(cm.exception)
+                )
+        self.assertEqual({}, self.updater._data)
+
+    def test_map_per_class(self):
+        other_updater = OtherUpdater()
+        other_updater.agent_setup(None, "1.3.6.1.4.1.32723.101", 10)
+        self.updater.set_value("a.x", 1)
+        other_updater.set_value("a.x", 2)
+        self.assertEqual(
+            fixture_value("1.1.0", pyagentx.TYPE_INTEGER, 1),
+            self.updater._data
+        )
+        self.assertEqual(
+            fixture_value("7.1.0", pyagentx.TYPE_INTEGER, 2),
+            other_updater._data
+        )
+        self.assertIs(
+            Updater._get_oid_map(), Updater()._get_oid_map()
+        )
+
+
+class SetTableTest(TestCase):
+    table_oid = "1.5"
+
+    def setUp(self):
+        self.updater = Updater()
+        self.updater.agent_setup(None, "1.3.6.1.4.1.32723.100", 10)
+        self.table = [
+            [StringType("r1"), StringType("value1"), IntegerType(1)],
+            [StringType("r2"), StringType("value2"), IntegerType(2)],
+        ]
+
+    def set_table(self):
+        # pyagentx clears the data before each update
+        self.updater._data = {}
+        with mock.patch(
+            "pcs.snmp.agentx.updater._get_row_values",
+            wraps=updater._get_row_values
+        ) as mock_get_row_values:
+            self.updater.set_table(self.table_oid, self.table)
+        return [call[1][1] for call in mock_get_row_values.mock_calls]
+
+    @staticmethod
+    def fixture_row(row_id, value_str, value_int):
+        # row ids are encoded as their length followed by their characters
+        row_oid = "2.114.{0}".format(ord(row_id[-1]))
+        data = {}
+        data.update(fixture_value(
+            "1.5.2.{0}".format(row_oid), pyagentx.TYPE_OCTETSTRING, value_str
+        ))
+        data.update(fixture_value(
+            "1.5.3.{0}".format(row_oid), pyagentx.TYPE_INTEGER, value_int
+        ))
+        return data
+
+    def assert_data(self, *row_list):
+        expected = {}
+        for row in row_list:
+            expected.update(self.fixture_row(*row))
+        self.assertEqual(expected, self.updater._data)
+
+    def test_initial_fill(self):
+        self.assertEqual(["r1", "r2"], self.set_table())
+        self.assert_data(("r1", "value1", 1), ("r2", "value2", 2))
+
+    def test_unchanged_rows_reused(self):
+        self.set_table()
+        cached_values = self.updater._table_row_cache[self.table_oid]["r1"][1]
+        self.assertEqual([], self.set_table())
+        self.assert_data(("r1", "value1", 1), ("r2", "value2", 2))
+        self.assertIs(
+            cached_values,
+            self.updater._table_row_cache[self.table_oid]["r1"][1]
+        )
+
+    def test_changed_row_encoded(self):
+        self.set_table()
+        self.table[1][2] = IntegerType(3)
+        self.assertEqual(["r2"], self.set_table())
+        self.assert_data(("r1", "value1", 1), ("r2", "value2", 3))
+
+    def test_removed_row_not_set(self):
+        self.set_table()
+        del self.table[0]
+        self.assertEqual([], self.set_table())
+        self.assert_data(("r2", "value2", 2))
+        self.assertEqual(
+            ["r2"], list(self.updater._table_row_cache[self.table_oid])
+        )
+        # the row is encoded again when it is added back
+        self.table.insert(
+            0, [StringType("r1"), StringType("value1"), IntegerType(1)]
+        )
+        self.assertEqual(["r1"], self.set_table())
+        self.assert_data(("r1", "value1", 1), ("r2", "value2", 2))
+
+    def test_tables_cached_separately(self):
+        self.set_table()
+        self.table_oid = "1.6"
+        self.assertEqual(["r1", "r2"], self.set_table())
@@ -0,0 +1,268 @@
+import os.path
+import shutil
+import tempfile
+from textwrap import dedent
+from unittest import mock, TestCase
+
+from pcs.test.tools.misc import get_test_resource as rc
+
+from pcs.lib.errors import LibraryError
+from pcs.snmp import status
+
+
+CRM_MON = """
+<crm_mon version="2.0.0">
+    <summary>
+        <last_update time="{last_update}"/>
+        <current_dc present="true" name="rh7-1" with_quorum="true"/>
+    </summary>
+    <nodes>
+        <node name="rh7-1" id="1" type="member" online="true"
+            standby="false" maintenance="false" is_dc="true"
+        />
+        <node name="rh7-2" id="2" type="member" online="true"
+            standby="true" maintenance="false" is_dc="false"
+        />
+        <node name="rh7-3" id="3" type="member" online="false"
+            standby="false" maintenance="false" is_dc="false"
+        />
+        <node name="remote" id="remote" type="remote" online="true"
+            standby="false" maintenance="true" is_dc="false"
+        />
+    </nodes>
+    <resources>
+        <resource id="A" role="Started" active="true" failed="false">
+            <node name="rh7-1" id="1"/>
+        </resource>
+        <resource id="B" role="Stopped" active="false" failed="false"/>
+        <resource id="S" role="Stopped" active="false" failed="false"/>
+        <group id="G">
+            <resource id="C" role="Started" active="true" failed="false">
+                <node name="rh7-1" id="1"/>
+            </resource>
+        </group>
+        <clone id="D-clone">
+            <resource id="D" role="Stopped" active="false" failed="false"/>
+            <resource id="D" role="Started" active="true" failed="false"
+                managed="false"
+            >
+                <node name="rh7-1" id="1"/>
+            </resource>
+        </clone>
+        <clone id="E-clone">
+            <resource id="E:0" role="Stopped" active="false" failed="true"/>
+        </clone>
+    </resources>
+</crm_mon>
+"""
+
+CIB = """
+<cib admin_epoch="0" epoch="{epoch}" num_updates="1">
+    <configuration>
+        <crm_config/>
+        <resources>
+            <clone id="D-clone">
+                <primitive id="D" class="ocf" provider="pacemaker"
+                    type="Dummy"
+                />
+            </clone>
+            <clone id="E-clone">
+                <meta_attributes id="E-clone-meta">
+                    <nvpair id="E-clone-meta-target-role" name="target-role"
+                        value="Stopped"
+                    />
+                </meta_attributes>
+                <primitive id="E" class="ocf" provider="pacemaker"
+                    type="Dummy"
+                />
+            </clone>
+            <group id="G">
+                <primitive id="C" class="ocf" provider="pacemaker"
+                    type="Dummy"
+                />
+            </group>
+            <primitive id="A" class="ocf" provider="pacemaker" type="Dummy"/>
+            <primitive id="B" class="ocf" provider="pacemaker" type="Dummy"/>
+            <primitive id="S" class="stonith" type="fence_xvm">
+                <meta_attributes id="S-meta">
+                    <nvpair id="S-meta-target-role" name="target-role"
+                        value="Stopped"
+                    />
+                </meta_attributes>
+            </primitive>
+        </resources>
+    </configuration>
+    <status>
+        <node_state id="1" uname="rh7-1">
+            <transient_attributes id="1">
+                <instance_attributes id="status-1">
+                    <nvpair id="status-1-fail-count-B.start_0"
+                        name="fail-count-B#start_0" value="INFINITY"
+                    />
+                    <nvpair id="status-1-fail-count-D.monitor_10000"
+                        name="fail-count-D#monitor_10000" value="2"
+                    />
+                </instance_attributes>
+            </transient_attributes>
+        </node_state>
+        <node_state id="2" uname="rh7-2">
+            <transient_attributes id="2">
+                <instance_attributes id="status-2">
+                    <nvpair id="status-2-fail-count-D.monitor_10000"
+                        name="fail-count-D#monitor_10000" value="1"
+                    />
+                </instance_attributes>
+            </transient_attributes>
+        </node_state>
+    </status>
+</cib>
+"""
+
+QUORUM_STATUS = dedent("""\
+    Quorum information
+    ------------------
+    Quorate:          Yes
+
+    Votequorum information
+    ----------------------
+    Quorum:           1
+
+    Membership information
+    ----------------------
+        Nodeid      Votes    Qdevice Name
+             1          1         NR rh7-1 (local)
+""")
+
+
+@mock.patch("pcs.settings.corosync_conf_file", rc("corosync.conf"))
+class ClusterStatusCollectorTest(TestCase):
+    def setUp(self):
+        self.runner = mock.Mock(spec_set=["run"])
+        self.runner.run.side_effect = self.run_command
+        self.crm_mon = CRM_MON.format(last_update="1")
+        self.cib = CIB.format(epoch="1")
+        self.collector = status.ClusterStatusCollector(self.runner)
+
+    def run_command(self, args, binary_output=False):
+        if args[0].endswith("crm_mon"):
+            self.assertTrue(binary_output)
+            return self.crm_mon.encode("utf-8"), b"", 0
+        if args[0].endswith("cibadmin"):
+            self.assertTrue(binary_output)
+            return self.cib.encode("utf-8"), b"", 0
+        if args[0].endswith("corosync-quorumtool"):
+            return QUORUM_STATUS, "", 0
+        raise AssertionError("Unexpected command {0}".format(args))
+
+    def test_status(self):
+        self.assertEqual(
+            status.ClusterStatus(
+                cluster_name="test99",
+                quorate=True,
+                corosync_nodes_online=["rh7-1"],
+                corosync_nodes_offline=["rh7-2"],
+                pcmk_nodes_online=["rh7-1"],
+                pcmk_nodes_standby=["rh7-2"],
+                pcmk_nodes_offline=["rh7-3"],
+                node_list=[
+                    status.NodeStatus(
+                        "rh7-1", "member", True, False, False, True, 3
+                    ),
+                    status.NodeStatus(
+                        "rh7-2", "member", True, True, False, False, 0
+                    ),
+                    status.NodeStatus(
+                        "rh7-3", "member", False, False, False, False, 0
+                    ),
+                    status.NodeStatus(
+                        "remote", "remote", True, False, True, False, 0
+                    ),
+                ],
+                resource_list=[
+                    status.ResourceStatus(
+                        "A", status.RESOURCE_RUNNING, "Started", True, 0,
+                        ["rh7-1"]
+                    ),
+                    status.ResourceStatus(
+                        "B", status.RESOURCE_FAILED, "Stopped", True,
+                        status.FAIL_COUNT_INFINITY, []
+                    ),
+                    status.ResourceStatus(
+                        "S", status.RESOURCE_FAILED, "Stopped", True, 0, []
+                    ),
+                    status.ResourceStatus(
+                        "C", status.RESOURCE_RUNNING, "Started", True, 0,
+                        ["rh7-1"]
+                    ),
+                    status.ResourceStatus(
+                        "D", status.RESOURCE_RUNNING, "Started", False, 3,
+                        ["rh7-1"]
+                    ),
+                    status.ResourceStatus(
+                        "E", status.RESOURCE_DISABLED, "Stopped", True, 0, []
+                    ),
+                ],
+            ),
+            self.collector.get_status()
+        )
+
+    def test_unchanged_status(self):
+        self.assertIsNotNone(self.collector.get_status())
+        self.crm_mon = CRM_MON.format(last_update="2")
+        self.assertIsNone(self.collector.get_status())
+        # crm_mon and cibadmin twice, corosync-quorumtool once
+        self.assertEqual(5, self.runner.run.call_count)
+
+    def test_changed_cib(self):
+        self.assertIsNotNone(self.collector.get_status())
+        self.cib = CIB.format(epoch="2")
+        self.assertIsNotNone(self.collector.get_status())
+
+    def test_changed_crm_mon(self):
+        self.assertIsNotNone(self.collector.get_status())
+        self.crm_mon = self.crm_mon.replace('with_quorum="true"', "")
+        self.assertFalse(self.collector.get_status().quorate)
+
+    def test_changed_corosync_conf(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            conf_path = os.path.join(tmp_dir, "corosync.conf")
+            shutil.copy(rc("corosync.conf"), conf_path)
+            with mock.patch("pcs.settings.corosync_conf_file", conf_path):
+                self.assertEqual(
+                    "test99", self.collector.get_status().cluster_name
+                )
+                with open(conf_path) as conf_file:
+                    conf = conf_file.read()
+                with open(conf_path, "w") as conf_file:
+                    conf_file.write(conf.replace("test99", "test100"))
+                self.assertEqual(
+                    "test100", self.collector.get_status().cluster_name
+                )
+                self.assertIsNone(self.collector.get_status())
+
+    def test_crm_mon_error(self):
+        self.runner.run.side_effect = (
+            lambda args, binary_output=False: (b"", b"error", 1)
+        )
+        self.assertRaises(LibraryError, self.collector.get_status)
+
+    def test_no_corosync_conf(self):
+        self.cib = self.cib.replace(
+            "<crm_config/>",
+            """
+            <crm_config>
+                <cluster_property_set id="cib-bootstrap-options">
+                    <nvpair id="cluster-name" name="cluster-name"
+                        value="remote-cluster"
+                    />
+                </cluster_property_set>
+            </crm_config>
+            """
+        )
+        with mock.patch(
+            "pcs.settings.corosync_conf_file", rc("corosync.conf.none")
+        ):
+            cluster_status = self.collector.get_status()
+        self.assertEqual("remote-cluster", cluster_status.cluster_name)
+        self.assertEqual([], cluster_status.corosync_nodes_online)
+        self.assertEqual([], cluster_status.corosync_nodes_offline)
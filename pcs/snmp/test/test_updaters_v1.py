@@ -0,0 +1,101 @@
+from unittest import mock, TestCase
+
+from pcs.lib.errors import LibraryError
+from pcs.snmp import status
+from pcs.snmp.updaters import v1
+
+
+def fixture_status(cluster_name="test99", resource_role="Started"):
+    return status.ClusterStatus(
+        cluster_name=cluster_name,
+        quorate=True,
+        corosync_nodes_online=["node1"],
+        corosync_nodes_offline=[],
+        pcmk_nodes_online=["node1"],
+        pcmk_nodes_standby=[],
+        pcmk_nodes_offline=[],
+        node_list=[
+            status.NodeStatus("node1", "member", True, False, False, True, 1),
+        ],
+        resource_list=[
+            status.ResourceStatus(
+                "A", status.RESOURCE_RUNNING, resource_role, True, 0,
+                ["node1"]
+            ),
+        ],
+    )
+
+
+class ClusterPcsV1UpdaterTest(TestCase):
+    def setUp(self):
+        self.updater = v1.ClusterPcsV1Updater()
+        self.updater.agent_setup(None, "1.3.6.1.4.1.32723.100", 10)
+        self.collector = mock.Mock(spec_set=["get_status"])
+        self.updater._status_collector = self.collector
+
+    def update(self, cluster_status):
+        # pyagentx clears the data before each update
+        self.updater._data = {}
+        self.collector.get_status.return_value = cluster_status
+        with mock.patch.object(
+            self.updater, "_set_status", wraps=self.updater._set_status
+        ) as mock_set_status:
+            self.updater.update()
+        return mock_set_status.call_count
+
+    def get_value(self, str_oid):
+        return self.updater._data[
+            self.updater.get_oid("pcmkPcsV1Cluster." + str_oid) + ".0"
+        ]["value"]
+
+    def test_unchanged_status_reused(self):
+        self.assertEqual(1, self.update(fixture_status()))
+        data = self.updater._data
+        self.assertEqual(0, self.update(None))
+        self.assertEqual(data, self.updater._data)
+        self.assertIsNot(data, self.updater._data)
+        self.assertEqual(0, self.update(None))
+        self.assertEqual(data, self.updater._data)
+
+    def test_changed_status_set(self):
+        self.update(fixture_status())
+        self.assertEqual(1, self.update(fixture_status(cluster_name="new")))
+        self.assertEqual("new", self.get_value("pcmkPcsV1ClusterName"))
+        self.update(None)
+        self.assertEqual("new", self.get_value("pcmkPcsV1ClusterName"))
+
+    def test_changed_table_row_set(self):
+        self.update(fixture_status())
+        role_oid = "{0}.3.{1}".format(
+            self.updater.get_oid(
+                "pcmkPcsV1Cluster.pcmkPcsV1ClusterResourceTable"
+                ".pcmkPcsV1ClusterResourceEntry"
+            ),
+            # row id "A"
+            "1.65"
+        )
+        self.assertEqual("Started", self.updater._data[role_oid]["value"])
+        self.update(fixture_status(resource_role="Master"))
+        self.assertEqual("Master", self.updater._data[role_oid]["value"])
+        self.update(None)
+        self.assertEqual("Master", self.updater._data[role_oid]["value"])
+
+    def test_no_status_before_first_update(self):
+        self.assertEqual(0, self.update(None))
+        self.assertEqual({}, self.updater._data)
+
+    @mock.patch("pcs.snmp.updaters.v1.cmd_runner")
+    def test_status_error(self, mock_cmd_runner):
+        self.update(fixture_status())
+        self.collector.get_status.side_effect = LibraryError()
+        self.assertEqual(0, self.update(None))
+        self.assertEqual({}, self.updater._data)
+        # the collector is created again and the status is set once available
+        self.assertIsNone(self.updater._status_collector)
+        with mock.patch(
+            "pcs.snmp.updaters.v1.ClusterStatusCollector"
+        ) as mock_collector:
+            mock_collector.return_value = self.collector
+            self.collector.get_status.side_effect = None
+            self.assertEqual(1, self.update(fixture_status()))
+        mock_collector.assert_called_once_with(mock_cmd_runner.return_value)
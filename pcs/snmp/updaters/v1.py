@@ -1,12 +1,19 @@
 import logging
 
-from pcs.utils import run_pcsdcli
+from pcs.utils import cmd_runner
+from pcs.cli.common.reports import build_report_message
+from pcs.lib.errors import LibraryError
 from pcs.snmp.agentx.updater import AgentxUpdaterBase
 from pcs.snmp.agentx.types import (
     IntegerType,
     StringType,
     Oid,
 )
+from pcs.snmp.status import (
+    ClusterStatusCollector,
+    RESOURCE_DISABLED,
+    RESOURCE_RUNNING,
+)
 
 logger = logging.getLogger("pcs.snmp.updaters.v1")
 logger.addHandler(logging.NullHandler())
@@ -35,143 +42,177 @@ _cluster_v1_oid_tree = Oid(
         Oid(20, "pcmkPcsV1ClusterStoppedResourcesIds", StringType),
         Oid(21, "pcmkPcsV1ClusterFailedResourcesNum", IntegerType),
         Oid(22, "pcmkPcsV1ClusterFailedResourcesIds", StringType),
+        Oid(23, "pcmkPcsV1ClusterResourceTable", member_list=[
+            Oid(1, "pcmkPcsV1ClusterResourceEntry", member_list=[
+                Oid(1, "pcmkPcsV1ClusterResourceId", StringType),
+                Oid(2, "pcmkPcsV1ClusterResourceStatus", StringType),
+                Oid(3, "pcmkPcsV1ClusterResourceRole", StringType),
+                Oid(4, "pcmkPcsV1ClusterResourceManaged", IntegerType),
+                Oid(5, "pcmkPcsV1ClusterResourceFailCount", IntegerType),
+                Oid(6, "pcmkPcsV1ClusterResourceNodes", StringType),
+            ]),
+        ]),
+        Oid(24, "pcmkPcsV1ClusterNodeTable", member_list=[
+            Oid(1, "pcmkPcsV1ClusterNodeEntry", member_list=[
+                Oid(1, "pcmkPcsV1ClusterNodeName", StringType),
+                Oid(2, "pcmkPcsV1ClusterNodeType", StringType),
+                Oid(3, "pcmkPcsV1ClusterNodeOnline", IntegerType),
+                Oid(4, "pcmkPcsV1ClusterNodeStandby", IntegerType),
+                Oid(5, "pcmkPcsV1ClusterNodeMaintenance", IntegerType),
+                Oid(6, "pcmkPcsV1ClusterNodeIsDc", IntegerType),
+                Oid(7, "pcmkPcsV1ClusterNodeResourcesRunningNum", IntegerType),
+            ]),
+        ]),
     ]
 )
 
 
 class ClusterPcsV1Updater(AgentxUpdaterBase):
     _oid_tree = Oid(0, "pcs_v1", member_list=[_cluster_v1_oid_tree])
+    _status_collector = None
+    _last_data = None
+
     def update(self):
-        output, ret_val = run_pcsdcli("node_status")
-        if ret_val != 0 or output["status"] != "ok":
+        if self._status_collector is None:
+            self._status_collector = ClusterStatusCollector(cmd_runner())
+        try:
+            status = self._status_collector.get_status()
+        except LibraryError as e:
             logger.error(
-                "Unable to obtain cluster status.\nPCSD return code: %s\n"
-                "PCSD output: %s\n",
-                ret_val,
-                output
+                "Unable to obtain cluster status.\n%s",
+                "\n".join([build_report_message(report) for report in e.args])
             )
+            # make sure the values are set again once the status is available
+            self._status_collector = None
             return
-        data = output["data"]
+        if status is not None:
+            self._set_status(status)
+            self._last_data = dict(self._data)
+        elif self._last_data is not None:
+            # The status has not changed since the last update. The data are
+            # cleared before each update, so they must be set again.
+            self._data.update(self._last_data)
+
+    def _set_status(self, status):
         self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterName",
-            data.get("cluster_name", "")
+            "pcmkPcsV1Cluster.pcmkPcsV1ClusterName", status.cluster_name
         )
         self.set_value(
             "pcmkPcsV1Cluster.pcmkPcsV1ClusterQuorate",
-            _bool_to_int(data.get("node", {}).get("quorum"))
+            _bool_to_int(status.quorate)
         )
 
         # nodes
-        known_nodes = data.get("known_nodes", [])
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterNodesNum",
-            len(known_nodes)
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterNodesNames",
-            known_nodes
-        )
-
-        corosync_nodes_online = data.get("corosync_online")
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterCorosyncNodesOnlineNum",
-            len(corosync_nodes_online)
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterCorosyncNodesOnlineNames",
-            corosync_nodes_online
-        )
-
-        corosync_nodes_offline = data.get("corosync_offline")
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterCorosyncNodesOfflineNum",
-            len(corosync_nodes_offline)
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterCorosyncNodesOfflineNames",
-            corosync_nodes_offline
-        )
-
-        pcmk_nodes_online = data.get("pacemaker_online")
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterPcmkNodesOnlineNum",
-            len(pcmk_nodes_online)
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterPcmkNodesOnlineNames",
-            pcmk_nodes_online
-        )
-
-        pcmk_nodes_standby = data.get("pacemaker_standby")
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterPcmkNodesStandbyNum",
-            len(pcmk_nodes_standby)
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterPcmkNodesStandbyNames",
-            pcmk_nodes_standby
-        )
-
-        pcmk_nodes_offline = data.get("pacemaker_offline")
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterPcmkNodesOfflineNum",
-            len(pcmk_nodes_offline)
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterPcmkNodesOfflineNames",
-            pcmk_nodes_offline
+        known_nodes = _unique(
+            status.corosync_nodes_online
+            + status.corosync_nodes_offline
+            + status.pcmk_nodes_online
+            + status.pcmk_nodes_offline
+            + status.pcmk_nodes_standby
+        )
+        self._set_name_list("NodesNum", "NodesNames", known_nodes)
+        self._set_name_list(
+            "CorosyncNodesOnlineNum",
+            "CorosyncNodesOnlineNames",
+            status.corosync_nodes_online
+        )
+        self._set_name_list(
+            "CorosyncNodesOfflineNum",
+            "CorosyncNodesOfflineNames",
+            status.corosync_nodes_offline
+        )
+        self._set_name_list(
+            "PcmkNodesOnlineNum",
+            "PcmkNodesOnlineNames",
+            status.pcmk_nodes_online
+        )
+        self._set_name_list(
+            "PcmkNodesStandbyNum",
+            "PcmkNodesStandbyNames",
+            status.pcmk_nodes_standby
+        )
+        self._set_name_list(
+            "PcmkNodesOfflineNum",
+            "PcmkNodesOfflineNames",
+            status.pcmk_nodes_offline
         )
 
         # resources
-        primitive_list = []
-        for resource in data.get("resource_list", []):
-            primitive_list.extend(_get_primitives(resource))
-
-        primitive_id_list = _get_resource_id_list(primitive_list)
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterAllResourcesNum",
-            len(primitive_id_list)
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterAllResourcesIds",
-            primitive_id_list
-        )
-        running_primitive_id_list = _get_resource_id_list(
-            primitive_list, _res_in_status(["running"])
-        )
-
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterRunningResourcesNum",
-            len(running_primitive_id_list)
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterRunningResourcesIds",
-            running_primitive_id_list
-        )
-
-        disabled_primitive_id_list = _get_resource_id_list(
-            primitive_list, _res_in_status(["disabled"])
+        resource_list = status.resource_list
+        self._set_name_list(
+            "AllResourcesNum",
+            "AllResourcesIds",
+            _get_resource_id_list(resource_list)
+        )
+        self._set_name_list(
+            "RunningResourcesNum",
+            "RunningResourcesIds",
+            _get_resource_id_list(
+                resource_list, _res_in_status([RESOURCE_RUNNING])
+            )
         )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterStoppedResourcesNum",
-            len(disabled_primitive_id_list)
+        self._set_name_list(
+            "StoppedResourcesNum",
+            "StoppedResourcesIds",
+            _get_resource_id_list(
+                resource_list, _res_in_status([RESOURCE_DISABLED])
+            )
         )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterStoppedResourcesIds",
-            disabled_primitive_id_list
+        self._set_name_list(
+            "FailedResourcesNum",
+            "FailedResourcesIds",
+            _get_resource_id_list(
+                resource_list,
+                lambda res: not _res_in_status(
+                    [RESOURCE_RUNNING, RESOURCE_DISABLED]
+                )(res)
+            )
         )
 
-        failed_primitive_id_list = _get_resource_id_list(
-            primitive_list,
-            lambda res: not _res_in_status(["running", "disabled"])(res)
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterFailedResourcesNum",
-            len(failed_primitive_id_list)
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterFailedResourcesIds",
-            failed_primitive_id_list
+        self.set_table(
+            self.get_oid(
+                "pcmkPcsV1Cluster.pcmkPcsV1ClusterResourceTable"
+                ".pcmkPcsV1ClusterResourceEntry"
+            ),
+            [
+                [
+                    StringType(resource.id),
+                    StringType(resource.status),
+                    StringType(resource.role),
+                    IntegerType(_bool_to_int(resource.managed)),
+                    IntegerType(resource.fail_count),
+                    StringType(" ".join(resource.node_names)),
+                ]
+                for resource in resource_list
+            ]
+        )
+        self.set_table(
+            self.get_oid(
+                "pcmkPcsV1Cluster.pcmkPcsV1ClusterNodeTable"
+                ".pcmkPcsV1ClusterNodeEntry"
+            ),
+            [
+                [
+                    StringType(node.name),
+                    StringType(node.type),
+                    IntegerType(_bool_to_int(node.online)),
+                    IntegerType(_bool_to_int(node.standby)),
+                    IntegerType(_bool_to_int(node.maintenance)),
+                    IntegerType(_bool_to_int(node.is_dc)),
+                    IntegerType(node.resources_running),
+                ]
+                for node in status.node_list
+            ]
+        )
+
+    def _set_name_list(self, num_oid, names_oid, name_list):
+        self.set_value(
+            "pcmkPcsV1Cluster.pcmkPcsV1Cluster{0}".format(num_oid),
+            len(name_list)
+        )
+        self.set_value(
+            "pcmkPcsV1Cluster.pcmkPcsV1Cluster{0}".format(names_oid),
+            name_list
         )
 
 
@@ -179,25 +220,19 @@ def _bool_to_int(value):
     return 1 if value else 0
 
 
-def _get_primitives(resource):
-    res_type = resource["class_type"]
-    if res_type == "primitive":
-        return [resource]
-    if res_type == "group":
-        primitive_list = []
-        for primitive in resource["members"]:
-            primitive_list.extend(_get_primitives(primitive))
-        return primitive_list
-    # check master-slave type
-    if res_type in ["clone", "master"]:
-        return _get_primitives(resource["member"])
+def _unique(item_list):
+    unique_list = []
+    for item in item_list:
+        if item not in unique_list:
+            unique_list.append(item)
+    return unique_list
 
 
 def _get_resource_id_list(resource_list, predicate=None):
     if predicate is None:
         predicate = lambda _: True
-    return [resource["id"] for resource in resource_list if predicate(resource)]
+    return [resource.id for resource in resource_list if predicate(resource)]
 
 
 def _res_in_status(status_list):
-    return lambda res: res["status"] in status_list
+    return lambda res: res.status in status_list
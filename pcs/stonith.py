@@ -105,9 +105,12 @@ def stonith_list_available(lib, argv, modifiers):
         raise CmdLineInputError()
 
     search = argv[0] if argv else None
+    # print the agents as soon as they are loaded, loading descriptions of all
+    # of them takes a while
     agent_list = lib.stonith_agent.list_agents(
         describe=not modifiers.get("--nodesc"),
         search=search,
+        on_agent_loaded=resource.print_agent_info,
     )
 
     if not agent_list:
@@ -118,19 +121,6 @@ def stonith_list_available(lib, argv, modifiers):
             "Do you have fence agents installed?"
         )
 
-    for agent_info in agent_list:
-        name = agent_info["name"]
-        shortdesc = agent_info["shortdesc"]
-        if shortdesc:
-            print("{0} - {1}".format(
-                name,
-                resource._format_desc(
-                    len(name + " - "), shortdesc.replace("\n", " ")
-                )
-            ))
-        else:
-            print(name)
-
 
 def stonith_list_options(lib, argv, modifiers):
     """
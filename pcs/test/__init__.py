@@ -0,0 +1,6 @@
+from pcs import settings
+
+# Tests must not read or write the system-wide cache of agents' metadata. It
+# is set up from the settings on the first use, so it is disabled here before
+# any test runs.
+settings.agent_metadata_cache_dir = None
@@ -0,0 +1,94 @@
+# CIB diff time, pcs vs crm_diff: python3 -m pcs.test.cib_diff_benchmark [cib]
+
+from copy import deepcopy
+import logging
+import os.path
+import sys
+import time
+
+from pcs import settings
+from pcs.lib.cib.diff import diff_cibs
+from pcs.lib.external import CommandRunner
+from pcs.lib.pacemaker.live import diff_cibs_xml, get_cib
+from pcs.lib.tools import write_tmpfile
+from pcs.lib.xml_tools import etree_to_str
+
+DEFAULT_CIB = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "resources", "cib-largefile.xml"
+)
+DEFAULT_RUNS = 20
+
+class NullReportProcessor(object):
+    def process(self, report_item):
+        pass
+
+def modify(cib):
+    nvpair = cib.find(".//nvpair")
+    nvpair.set("value", nvpair.get("value", "") + "-modified")
+
+def diff_kept_original(cib_xml):
+    cib = get_cib(cib_xml)
+    cib_original = deepcopy(cib)
+    modify(cib)
+    return diff_cibs(cib_original, cib)
+
+def diff_parsed_original(cib_xml):
+    cib = get_cib(cib_xml)
+    modify(cib)
+    return diff_cibs(get_cib(cib_xml), cib)
+
+def diff_crm_diff(cib_xml):
+    cib = get_cib(cib_xml)
+    modify(cib)
+    return diff_cibs_xml(
+        CommandRunner(
+            logging.getLogger("pcs.benchmark"), NullReportProcessor()
+        ),
+        NullReportProcessor(),
+        cib_xml,
+        etree_to_str(cib),
+    )
+
+def crm_diff_files_only(cib_xml):
+    cib = get_cib(cib_xml)
+    modify(cib)
+    old_file = write_tmpfile(cib_xml.decode("utf-8"))
+    new_file = write_tmpfile(etree_to_str(cib))
+    old_file.close()
+    new_file.close()
+
+def measure(function, cib_xml, runs):
+    result_list = []
+    for dummy_i in range(runs):
+        start = time.perf_counter()
+        function(cib_xml)
+        result_list.append(time.perf_counter() - start)
+    return sorted(result_list)[len(result_list) // 2]
+
+def main(argv):
+    cib_path = argv[0] if argv else DEFAULT_CIB
+    runs = int(argv[1]) if len(argv) > 1 else DEFAULT_RUNS
+    with open(cib_path, "rb") as cib_file:
+        cib_xml = cib_file.read()
+    case_list = [
+        ("pcs diff, original kept", diff_kept_original),
+        ("pcs diff, original parsed again", diff_parsed_original),
+    ]
+    if os.path.exists(os.path.join(settings.pacemaker_binaries, "crm_diff")):
+        case_list.append(("crm_diff", diff_crm_diff))
+    else:
+        case_list.append(
+            ("crm_diff not installed, temporary files only", crm_diff_files_only)
+        )
+    print("CIB size: {0} kB, load and parse not included".format(
+        len(cib_xml) // 1024
+    ))
+    base = measure(get_cib, cib_xml, runs)
+    for name, function in case_list:
+        print("{0}: {1:.1f} ms".format(
+            name, (measure(function, cib_xml, runs) - base) * 1000
+        ))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
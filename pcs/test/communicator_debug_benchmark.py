@@ -0,0 +1,113 @@
+# Debug capture cost: python3 -m pcs.test.communicator_debug_benchmark [MB]
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+import os.path
+import ssl
+import sys
+import tempfile
+import threading
+import time
+
+from pcs.common.host import Destination
+from pcs.common.node_communicator import (
+    Communicator,
+    CommunicatorLoggerInterface,
+    Request,
+    RequestData,
+    RequestTarget,
+)
+from pcs.daemon.ssl import regenerate_cert_key
+
+DEFAULT_SIZE_MB = 8
+DEFAULT_REQUESTS = 10
+ROUNDS = 3
+
+class NullCommunicatorLogger(CommunicatorLoggerInterface):
+    def log_request_start(self, request):
+        pass
+
+    def log_response(self, response):
+        pass
+
+    def log_retry(self, response, previous_dest):
+        pass
+
+    def log_no_more_addresses(self, response):
+        pass
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+def start_server(cert_dir, body):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self.do_GET()
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    cert_path = os.path.join(cert_dir, "cert.pem")
+    key_path = os.path.join(cert_dir, "key.pem")
+    regenerate_cert_key("localhost", cert_path, key_path)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_path, key_path)
+    server = ThreadingHTTPServer(("localhost", 0), Handler)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def run_requests(port, requests, debug, debug_limit):
+    communicator = Communicator(
+        NullCommunicatorLogger(), None, None,
+        debug=debug, debug_limit=debug_limit,
+    )
+    communicator.add_requests([
+        Request(
+            RequestTarget(
+                "localhost", dest_list=[Destination("localhost", port)]
+            ),
+            RequestData("remote/benchmark"),
+        )
+        for dummy_i in range(requests)
+    ])
+    start = time.perf_counter()
+    captured = 0
+    for response in communicator.start_loop():
+        if not response.was_connected:
+            raise AssertionError(response.error_msg)
+        captured += len(response.handle.debug_buffer.getvalue())
+    return time.perf_counter() - start, captured
+
+def main(argv):
+    size_mb = int(argv[0]) if argv else DEFAULT_SIZE_MB
+    requests = int(argv[1]) if len(argv) > 1 else DEFAULT_REQUESTS
+    with tempfile.TemporaryDirectory() as cert_dir:
+        server = start_server(cert_dir, os.urandom(size_mb * 1024 * 1024))
+        port = server.server_address[1]
+        for name, debug, debug_limit in [
+            ("capture all", True, None),
+            ("capture 1 MB", True, 1024 * 1024),
+            ("no capture", False, None),
+        ]:
+            duration, captured = min(
+                run_requests(port, requests, debug, debug_limit)
+                for dummy_i in range(ROUNDS)
+            )
+            print("{0}: {1:.2f} s, {2} MB captured".format(
+                name, duration, captured // 2**20
+            ))
+        server.shutdown()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,118 @@
+# crm_mon status validation time: python3 -m pcs.test.crm_mon_schema_benchmark
+
+import os.path
+import sys
+import time
+
+from pcs import settings
+from pcs.lib.pacemaker import state
+
+DEFAULT_RUNS = 50
+RESOURCE_COUNT = 200
+NODE_COUNT = 3
+
+def build_status(resource_count=RESOURCE_COUNT, node_count=NODE_COUNT):
+    node_list = [
+        """
+        <node name="node{0}" id="{0}" online="true" standby="false"
+            standby_onfail="false" maintenance="false" pending="false"
+            unclean="false" shutdown="false" expected_up="true"
+            is_dc="{1}" resources_running="{2}" type="member"
+        />
+        """.format(
+            i,
+            "true" if i == 1 else "false",
+            len(range(i - 1, resource_count, node_count)),
+        )
+        for i in range(1, node_count + 1)
+    ]
+    resource_list = [
+        """
+        <resource id="R{0}" resource_agent="ocf::heartbeat:Dummy"
+            role="Started" active="true" orphaned="false" blocked="false"
+            managed="true" failed="false" failure_ignored="false"
+            nodes_running_on="1"
+        >
+            <node name="node{1}" id="{1}" cached="false"/>
+        </resource>
+        """.format(i, i % node_count + 1)
+        for i in range(resource_count)
+    ]
+    return """
+        <crm_mon version="1.1.18">
+            <summary>
+                <stack type="corosync"/>
+                <current_dc present="true" version="1.1.18" name="node1"
+                    id="1" with_quorum="true"
+                />
+                <last_update time="Thu Jan  1 00:00:00 2018"/>
+                <last_change time="Thu Jan  1 00:00:00 2018" user="root"
+                    client="cibadmin" origin="node1"
+                />
+                <nodes_configured number="{0}"/>
+                <resources_configured number="{1}" disabled="0" blocked="0"/>
+                <cluster_options stonith-enabled="false"
+                    symmetric-cluster="true" no-quorum-policy="stop"
+                    maintenance-mode="false"
+                />
+            </summary>
+            <nodes>{2}</nodes>
+            <resources>{3}</resources>
+        </crm_mon>
+    """.format(
+        node_count, resource_count, "".join(node_list), "".join(resource_list)
+    ).encode("utf-8")
+
+def parse_cold_schema(status_xml):
+    state._crm_mon_schema_cache.clear()
+    state.get_cluster_state_dom(status_xml, state.VALIDATE_ALWAYS)
+
+def parse_cached_schema(status_xml):
+    state.get_cluster_state_dom(status_xml, state.VALIDATE_ALWAYS)
+
+def parse_sampled(status_xml):
+    state.get_cluster_state_dom(status_xml, state.VALIDATE_SAMPLED)
+
+def parse_not_validated(status_xml):
+    state.get_cluster_state_dom(status_xml, state.VALIDATE_NEVER)
+
+def measure(function, status_xml, runs):
+    # warm up, the schema is compiled in the first run
+    function(status_xml)
+    start = time.perf_counter()
+    for dummy_i in range(runs):
+        function(status_xml)
+    return (time.perf_counter() - start) / runs
+
+def main(argv):
+    settings.crm_mon_schema = argv[0] if argv else settings.crm_mon_schema
+    runs = int(argv[1]) if len(argv) > 1 else DEFAULT_RUNS
+    if not os.path.isfile(settings.crm_mon_schema):
+        print("crm_mon schema '{0}' does not exist".format(
+            settings.crm_mon_schema
+        ))
+        return 1
+    status_xml = build_status()
+    print(
+        "Status size: {0} kB, {1} resources, validated against '{2}'".format(
+            len(status_xml) // 1024, RESOURCE_COUNT, settings.crm_mon_schema
+        )
+    )
+    for label, function in [
+        ("not validated (VALIDATE_NEVER)", parse_not_validated),
+        ("schema compiled for each parse", parse_cold_schema),
+        ("schema cached (VALIDATE_ALWAYS)", parse_cached_schema),
+        (
+            "sampled validation, 1 of {0} (VALIDATE_SAMPLED)".format(
+                settings.crm_mon_schema_validation_sample_rate
+            ),
+            parse_sampled
+        ),
+    ]:
+        print("{0}: {1:.2f} ms".format(
+            label, measure(function, status_xml, runs) * 1000
+        ))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,78 @@
+# Memory used to run cibadmin: python3 -m pcs.test.external_memory_benchmark
+
+import logging
+import os.path
+import sys
+import tempfile
+import tracemalloc
+
+from pcs.lib.external import CommandRunner
+
+CIB_SAMPLE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "resources", "cib-large.xml"
+)
+DEFAULT_SIZE_MB = 5
+# peak of allocated memory divided by the size of the CIB
+DEFAULT_BUDGET = 4
+
+class KeepingReportProcessor(object):
+    # keeps all reports like a library environment does
+    def __init__(self):
+        self.report_item_list = []
+
+    def process(self, report_item):
+        self.report_item_list.append(report_item)
+
+def create_cib_file(size_mb):
+    with open(CIB_SAMPLE) as cib_file:
+        cib = cib_file.read()
+    cib_tmp_file = tempfile.NamedTemporaryFile("w", suffix=".xml")
+    for dummy_i in range(max(1, (size_mb * 1024 * 1024) // len(cib))):
+        cib_tmp_file.write(cib)
+    cib_tmp_file.flush()
+    return cib_tmp_file
+
+def measure(cib_path, log_level, binary_output):
+    logger = logging.getLogger("pcs.benchmark")
+    logger.setLevel(log_level)
+    reporter = KeepingReportProcessor()
+    runner = CommandRunner(logger, reporter)
+    tracemalloc.start()
+    stdout, dummy_stderr, dummy_retval = runner.run(
+        ["/bin/cat", cib_path], binary_output=binary_output
+    )
+    dummy_current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, len(stdout)
+
+def main(argv):
+    size_mb = int(argv[0]) if argv else DEFAULT_SIZE_MB
+    budget = float(argv[1]) if len(argv) > 1 else DEFAULT_BUDGET
+    # log records are formatted but thrown away
+    logging.getLogger("pcs.benchmark").addHandler(logging.NullHandler())
+    over_budget = False
+    with create_cib_file(size_mb) as cib_file:
+        for log_level, binary_output in [
+            (logging.WARNING, False),
+            (logging.WARNING, True),
+            (logging.DEBUG, False),
+        ]:
+            peak, output_size = measure(cib_file.name, log_level, binary_output)
+            ratio = peak / output_size
+            case_over_budget = (
+                log_level != logging.DEBUG and ratio > budget
+            )
+            over_budget = over_budget or case_over_budget
+            print("log level {0}, {1} output: {2:.1f} MB peak, {3:.1f}x output"
+                "{4}".format(
+                    logging.getLevelName(log_level),
+                    "binary" if binary_output else "text",
+                    peak / 1024 / 1024,
+                    ratio,
+                    " (over budget)" if case_over_budget else "",
+                )
+            )
+    return 1 if over_budget else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,60 @@
+# Process spawning time: python3 -m pcs.test.spawn_benchmark [MB] [runs]
+
+import logging
+import os.path
+import signal
+import subprocess
+import sys
+import time
+
+from pcs.lib.external import CommandRunner
+
+COMMAND = ["/bin/true"]
+DEFAULT_FOOTPRINT_MB = 200
+DEFAULT_RUNS = 200
+
+class NullReportProcessor(object):
+    def process(self, report_item):
+        pass
+
+def run_preexec_fn(env_vars):
+    process = subprocess.Popen(
+        COMMAND,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        preexec_fn=lambda: signal.signal(signal.SIGPIPE, signal.SIG_DFL),
+        close_fds=True,
+        env=env_vars.copy(),
+        universal_newlines=True,
+    )
+    process.communicate()
+
+def measure(function, runs):
+    result_list = []
+    for dummy_i in range(runs):
+        start = time.perf_counter()
+        function()
+        result_list.append(time.perf_counter() - start)
+    return sorted(result_list)[len(result_list) // 2]
+
+def main(argv):
+    footprint_mb = int(argv[0]) if argv else DEFAULT_FOOTPRINT_MB
+    runs = int(argv[1]) if len(argv) > 1 else DEFAULT_RUNS
+    # touched memory is what makes forking slow
+    footprint = bytearray(os.urandom(1024 * 1024)) * footprint_mb
+    env_vars = dict(os.environ, LC_ALL="C")
+    runner = CommandRunner(
+        logging.getLogger("pcs.benchmark"), NullReportProcessor(), env_vars
+    )
+    for name, function in [
+        ("preexec_fn", lambda: run_preexec_fn(env_vars)),
+        ("CommandRunner", lambda: runner.run(COMMAND)),
+    ]:
+        print("{0}: {1:.0f} us per process, {2} MB footprint".format(
+            name, measure(function, runs) * 1000000, len(footprint) // 2**20
+        ))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
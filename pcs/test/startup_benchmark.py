@@ -0,0 +1,61 @@
+# pcs startup import time: python3 -m pcs.test.startup_benchmark [ms] [runs]
+
+import subprocess
+import sys
+
+# commands run by pcsd and scripts most often
+COMMAND_LIST = [
+    ["status"],
+    ["resource", "config"],
+    ["property", "set"],
+    ["stonith", "config"],
+    ["constraint"],
+]
+DEFAULT_BUDGET_MS = 500
+MODULE_BUDGET = 300
+DEFAULT_RUNS = 10
+
+MEASURE_CODE = """
+import sys
+import time
+start = time.perf_counter()
+from pcs import app
+# pcs.usage and pcs.utils import most of pcs, a command must be looked up
+# without them
+eagerly_imported = [
+    name for name in ("pcs.usage", "pcs.utils") if name in sys.modules
+]
+assert not eagerly_imported, "Imported by pcs.app: " + str(eagerly_imported)
+app._get_command(sys.argv[1])
+print(int((time.perf_counter() - start) * 1000), len(sys.modules))
+"""
+
+def measure(command):
+    output = subprocess.check_output(
+        [sys.executable, "-c", MEASURE_CODE, command[0]],
+        universal_newlines=True,
+    )
+    time_ms, module_count = output.split()
+    return int(time_ms), int(module_count)
+
+def main(argv):
+    budget_ms = int(argv[0]) if argv else DEFAULT_BUDGET_MS
+    runs = int(argv[1]) if len(argv) > 1 else DEFAULT_RUNS
+    over_budget = False
+    for command in COMMAND_LIST:
+        result_list = sorted(measure(command) for dummy_i in range(runs))
+        time_ms, module_count = result_list[len(result_list) // 2]
+        command_over_budget = (
+            time_ms > budget_ms or module_count > MODULE_BUDGET
+        )
+        over_budget = over_budget or command_over_budget
+        print("pcs {0}: {1} ms, {2} modules{3}".format(
+            " ".join(command),
+            time_ms,
+            module_count,
+            " (over budget)" if command_over_budget else "",
+        ))
+    return 1 if over_budget else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,60 @@
+import os.path
+import subprocess
+import sys
+from unittest import TestCase
+
+from pcs import app
+
+
+PACKAGE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+
+def get_imported_modules(code):
+    return subprocess.check_output(
+        [
+            sys.executable,
+            "-c",
+            code + "\nimport sys\nprint('\\n'.join(sorted(sys.modules)))",
+        ],
+        cwd=PACKAGE_DIR,
+        universal_newlines=True,
+    ).splitlines()
+
+
+class GetCommand(TestCase):
+    def test_all_commands(self):
+        for command, (module_name, function_name) in app._COMMAND_MAP.items():
+            with self.subTest(command=command):
+                function = app._get_command(command)
+                self.assertEqual(module_name, function.__module__)
+                self.assertEqual(function_name, function.__name__)
+
+
+class LazyImports(TestCase):
+    def test_commands_not_imported(self):
+        module_list = get_imported_modules("from pcs import app")
+        for module_name, dummy_function in app._COMMAND_MAP.values():
+            self.assertNotIn(module_name, module_list)
+        self.assertEqual(
+            [],
+            [
+                name for name in module_list
+                if name.startswith("pcs.lib.commands")
+            ]
+        )
+
+    def test_usage_and_utils_not_imported(self):
+        module_list = get_imported_modules("from pcs import app")
+        self.assertNotIn("pcs.usage", module_list)
+        self.assertNotIn("pcs.utils", module_list)
+
+    def test_only_used_lib_commands_imported(self):
+        module_list = get_imported_modules(
+            "from pcs import app, utils\n"
+            "utils.get_library_wrapper().resource_agent"
+        )
+        self.assertIn("pcs.lib.commands.resource_agent", module_list)
+        self.assertNotIn("pcs.lib.commands.resource", module_list)
+        self.assertNotIn("pcs.resource", module_list)
@@ -26,6 +26,50 @@ class RunParallelTestCase(TestCase):
         self.assertTrue(elapsed_time < sum([i + 1 for i in range(x)]))
 
 
+class IterParallelTestCase(TestCase):
+    def test_keep_order(self):
+        # later items finish sooner
+        def worker(i):
+            time.sleep((5 - i) * 0.05)
+            return i * 10
+        self.assertEqual(
+            list(tools.iter_parallel(worker, range(5), 5)),
+            [0, 10, 20, 30, 40]
+        )
+
+    def test_one_worker(self):
+        self.assertEqual(
+            list(tools.iter_parallel(lambda i: i * 10, range(3), 1)),
+            [0, 10, 20]
+        )
+
+    def test_parallelism(self):
+        start_time = time.time()
+        list(tools.iter_parallel(time.sleep, [0.5] * 4, 4))
+        self.assertTrue(time.time() - start_time < 1.5)
+
+    def test_exception(self):
+        def worker(i):
+            if i == 2:
+                raise TestException()
+            return i
+        result = tools.iter_parallel(worker, range(5), 3)
+        self.assertEqual(next(result), 0)
+        self.assertEqual(next(result), 1)
+        self.assertRaises(TestException, next, result)
+
+    def test_stop_iterating(self):
+        called = []
+        def worker(i):
+            called.append(i)
+            return i
+        result = tools.iter_parallel(worker, range(100), 2)
+        self.assertEqual(next(result), 0)
+        result.close()
+        # only a limited number of items is queued ahead
+        self.assertTrue(len(called) <= 4)
+
+
 class JoinMultilinesTest(TestCase):
     def test_empty_input(self):
         self.assertEqual(
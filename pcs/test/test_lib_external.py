@@ -1,6 +1,7 @@
 import logging
 import os.path
 from subprocess import DEVNULL
+import threading
 from unittest import mock, TestCase
 
 from pcs.test.tools.assertions import (
@@ -392,6 +393,166 @@ class CommandRunnerTest(TestCase):
             ]
         )
 
+    def test_debug_not_logged(self, mock_popen):
+        mock_process = mock.MagicMock(spec_set=["communicate", "returncode"])
+        mock_process.communicate.return_value = ("stdout", "stderr")
+        mock_process.returncode = 0
+        mock_popen.return_value = mock_process
+        self.mock_logger.isEnabledFor.return_value = False
+
+        runner = lib.CommandRunner(self.mock_logger, self.mock_reporter)
+        runner.run(["a_command"], stdin_string="stdin")
+
+        self.mock_logger.isEnabledFor.assert_called_once_with(logging.DEBUG)
+        self.mock_logger.debug.assert_not_called()
+        self.assertEqual(len(self.mock_reporter.report_item_list), 2)
+
+    @mock.patch.object(settings, "external_process_report_output_limit", 5)
+    def test_report_output_cut(self, mock_popen):
+        mock_process = mock.MagicMock(spec_set=["communicate", "returncode"])
+        mock_process.communicate.return_value = (b"0123456789", b"err")
+        mock_process.returncode = 0
+        mock_popen.return_value = mock_process
+
+        runner = lib.CommandRunner(self.mock_logger, self.mock_reporter)
+        real_stdout, dummy_stderr, dummy_retval = runner.run(
+            ["a_command"], stdin_string="abcdefgh", binary_output=True
+        )
+
+        self.assertEqual(real_stdout, b"0123456789")
+        assert_report_item_list_equal(
+            self.mock_reporter.report_item_list,
+            [
+                (
+                    severity.DEBUG,
+                    report_codes.RUN_EXTERNAL_PROCESS_STARTED,
+                    {
+                        "command": "a_command",
+                        "stdin": (
+                            "abcde\n--Debug Output Cut, 3 more characters "
+                            "not shown--"
+                        ),
+                        "environment": dict(),
+                    }
+                ),
+                (
+                    severity.DEBUG,
+                    report_codes.RUN_EXTERNAL_PROCESS_FINISHED,
+                    {
+                        "command": "a_command",
+                        "return_value": 0,
+                        "stdout": (
+                            b"01234\n--Debug Output Cut, 5 more bytes not "
+                            b"shown--"
+                        ),
+                        "stderr": b"err",
+                    }
+                )
+            ]
+        )
+
+class ThreadRecordingReportProcessor(MockLibraryReportProcessor):
+    def __init__(self):
+        super().__init__()
+        self.thread_list = []
+
+    def process(self, report_item):
+        self.thread_list.append(threading.get_ident())
+        return super().process(report_item)
+
+@mock.patch("subprocess.Popen", autospec=True)
+class IterParallelRunTest(TestCase):
+    def setUp(self):
+        self.reporter = ThreadRecordingReportProcessor()
+        self.runner = lib.CommandRunner(
+            mock.MagicMock(logging.Logger), self.reporter, {"a": "b"}
+        )
+
+    @staticmethod
+    def worker(runner, arg):
+        return runner.run([arg])[0], runner.env_vars
+
+    @staticmethod
+    def fixture_popen(mock_popen):
+        def popen(args, **kwargs):
+            mock_process = mock.MagicMock(
+                spec_set=["communicate", "returncode"]
+            )
+            mock_process.communicate.return_value = (args[0] + " out", "")
+            mock_process.returncode = 0
+            return mock_process
+        mock_popen.side_effect = popen
+
+    def assert_reports(self, command_list):
+        report_list = []
+        for command in command_list:
+            report_list.extend([
+                (
+                    severity.DEBUG,
+                    report_codes.RUN_EXTERNAL_PROCESS_STARTED,
+                    {
+                        "command": command,
+                        "stdin": None,
+                        "environment": {"a": "b"},
+                    }
+                ),
+                (
+                    severity.DEBUG,
+                    report_codes.RUN_EXTERNAL_PROCESS_FINISHED,
+                    {
+                        "command": command,
+                        "return_value": 0,
+                        "stdout": command + " out",
+                        "stderr": "",
+                    }
+                ),
+            ])
+        assert_report_item_list_equal(
+            self.reporter.report_item_list, report_list
+        )
+        self.assertEqual(
+            set(self.reporter.thread_list), {threading.get_ident()}
+        )
+
+    def test_sequential(self, mock_popen):
+        self.fixture_popen(mock_popen)
+        self.assertEqual(
+            list(lib.iter_parallel_run(
+                self.runner, self.worker, ["cmd1", "cmd2"], 1
+            )),
+            [("cmd1 out", {"a": "b"}), ("cmd2 out", {"a": "b"})]
+        )
+        self.assert_reports(["cmd1", "cmd2"])
+
+    def test_reports_processed_in_calling_thread(self, mock_popen):
+        self.fixture_popen(mock_popen)
+        command_list = ["cmd{0}".format(i) for i in range(6)]
+        self.assertEqual(
+            list(lib.iter_parallel_run(
+                self.runner, self.worker, command_list, 3
+            )),
+            [
+                ("{0} out".format(command), {"a": "b"})
+                for command in command_list
+            ]
+        )
+        self.assert_reports(command_list)
+
+    def test_runner_class_kept(self, mock_popen):
+        class MyRunner(lib.CommandRunner):
+            pass
+        runner = MyRunner(mock.MagicMock(logging.Logger), self.reporter)
+        self.assertEqual(
+            list(lib.iter_parallel_run(
+                runner,
+                lambda worker_runner, arg: type(worker_runner),
+                range(3),
+                3
+            )),
+            [MyRunner] * 3
+        )
+        mock_popen.assert_not_called()
+
 @mock.patch(
     "pcs.lib.external.pycurl.Curl",
     autospec=True
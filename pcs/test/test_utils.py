@@ -1884,3 +1884,266 @@ class TouchCibFile(TestCase):
         err.assert_called_once_with(
             "Unable to write to file: '/fake/filename': 'some message'"
         )
+
+
+@mock.patch("pcs.utils.get_metadata_cache", lambda: None)
+@mock.patch("pcs.utils.cmd_runner")
+class GetClusterPropertiesDefinition(TestCase):
+    def setUp(self):
+        self.output_map = {
+            "/usr/libexec/pacemaker/pacemaker-schedulerd": """
+                <resource-agent><parameters>
+                    <parameter name="batch-limit">
+                        <content type="integer" default="0"/>
+                    </parameter>
+                    <parameter name="dc-version">
+                        <content type="string"/>
+                    </parameter>
+                </parameters></resource-agent>
+            """,
+            "/usr/libexec/pacemaker/pacemaker-controld": """
+                <resource-agent><parameters>
+                    <parameter name="cluster-delay">
+                        <content type="time" default="60s"/>
+                    </parameter>
+                </parameters></resource-agent>
+            """,
+            "/usr/libexec/pacemaker/pacemaker-based": """
+                <resource-agent><parameters>
+                    <parameter name="enable-acl">
+                        <content type="boolean" default="false"/>
+                    </parameter>
+                </parameters></resource-agent>
+            """,
+        }
+
+    def run_command(self, args):
+        if args[0] not in self.output_map:
+            return "", "error", 1
+        return self.output_map[args[0]], "", 0
+
+    @staticmethod
+    def fixture_runner(mock_runner, run):
+        runner = mock_runner.return_value
+        runner.run.side_effect = run
+        runner.with_reporter.return_value = runner
+
+    def test_success(self, mock_runner):
+        self.fixture_runner(mock_runner, self.run_command)
+        definition = utils.get_cluster_properties_definition()
+        self.assertEqual(
+            ["batch-limit", "cluster-delay", "enable-acl"],
+            sorted(definition.keys())
+        )
+        self.assertEqual(
+            "pacemaker-controld", definition["cluster-delay"]["source"]
+        )
+        self.assertEqual(3, mock_runner.return_value.run.call_count)
+
+    @mock.patch("pcs.utils.err")
+    def test_failure(self, mock_err, mock_runner):
+        del self.output_map["/usr/libexec/pacemaker/pacemaker-controld"]
+        self.fixture_runner(mock_runner, self.run_command)
+        mock_err.side_effect = SystemExit(1)
+        self.assertRaises(SystemExit, utils.get_cluster_properties_definition)
+        mock_err.assert_called_once_with(
+            "unable to run pacemaker-controld\nerror"
+        )
+
+
+class LoadDaemonMetadata(TestCase):
+    def setUp(self):
+        self.runner = mock.Mock(spec_set=["run"])
+        self.cache = mock.Mock(spec_set=["load"])
+        self.cache.load.side_effect = lambda name, sources, loader: loader()
+
+    def test_cached(self):
+        self.runner.run.return_value = ("metadata", "", 0)
+        with mock.patch("pcs.utils.get_metadata_cache", lambda: self.cache):
+            self.assertEqual(
+                ("metadata", None),
+                utils._load_daemon_metadata(self.runner, "daemon", "/daemon")
+            )
+        self.cache.load.assert_called_once_with(
+            "daemon", ["/daemon"], mock.ANY
+        )
+        self.runner.run.assert_called_once_with(["/daemon", "metadata"])
+
+    def test_error(self):
+        self.runner.run.return_value = ("", "error", 1)
+        with mock.patch("pcs.utils.get_metadata_cache", lambda: self.cache):
+            self.assertEqual(
+                (None, "error"),
+                utils._load_daemon_metadata(self.runner, "daemon", "/daemon")
+            )
+
+
+CIB_SNAPSHOT = """<cib epoch="1">
+  <configuration>
+    <crm_config/>
+    <resources>
+      <primitive id="A" class="ocf" provider="heartbeat" type="Dummy"/>
+      <group id="G">
+        <primitive id="B" class="ocf" provider="heartbeat" type="Dummy"/>
+      </group>
+    </resources>
+  </configuration>
+  <status/>
+</cib>
+"""
+
+@mock.patch("pcs.utils.usefile", False)
+@mock.patch("pcs.utils.run")
+class CibSnapshot(TestCase):
+    def setUp(self):
+        utils.invalidate_cib_snapshot()
+        self.addCleanup(utils.invalidate_cib_snapshot)
+
+    def run_command(self, args):
+        if args == ["cibadmin", "-l", "-Q"]:
+            return CIB_SNAPSHOT, 0
+        if args[0] == "crm_mon":
+            return "<crm_mon/>", 0
+        return "", 1
+
+    def test_cib_read_once(self, mock_run):
+        mock_run.side_effect = self.run_command
+        self.assertEqual(CIB_SNAPSHOT, utils.get_cib())
+        self.assertTrue(utils.does_exist("//primitive[@id='A']"))
+        self.assertFalse(utils.does_exist("//primitive[@id='C']"))
+        self.assertEqual("", utils.get_cib_xpath("//primitive[@id='C']"))
+        self.assertEqual(
+            "A",
+            utils.get_cib_dom().getElementsByTagName("primitive")[0]
+                .getAttribute("id")
+        )
+        mock_run.assert_called_once_with(["cibadmin", "-l", "-Q"])
+
+    def test_xpath_single_match(self, mock_run):
+        mock_run.side_effect = self.run_command
+        group = xml.dom.minidom.parseString(
+            utils.get_cib_xpath("//group/primitive[@id='B']/..")
+        )
+        self.assertEqual("group", group.documentElement.tagName)
+        self.assertEqual("G", group.documentElement.getAttribute("id"))
+
+    def test_xpath_multiple_matches(self, mock_run):
+        mock_run.side_effect = self.run_command
+        result = xml.dom.minidom.parseString(
+            utils.get_cib_xpath("//primitive")
+        )
+        self.assertEqual("xpath-query", result.documentElement.tagName)
+        self.assertEqual(
+            ["A", "B"],
+            [
+                primitive.getAttribute("id") for primitive
+                in result.getElementsByTagName("primitive")
+            ]
+        )
+
+    def test_xpath_not_answered_from_snapshot(self, mock_run):
+        mock_run.side_effect = self.run_command
+        self.assertEqual("", utils.get_cib_xpath("//primitive/@id"))
+        self.assertEqual(
+            [
+                mock.call(["cibadmin", "-l", "-Q"]),
+                mock.call(["cibadmin", "-Q", "--xpath", "//primitive/@id"]),
+            ],
+            mock_run.mock_calls
+        )
+
+    def test_cib_not_available(self, mock_run):
+        mock_run.side_effect = lambda args: ("", 1)
+        self.assertFalse(utils.does_exist("//primitive[@id='A']"))
+        self.assertEqual(
+            [
+                mock.call(["cibadmin", "-l", "-Q"]),
+                mock.call(
+                    ["cibadmin", "-Q", "--xpath", "//primitive[@id='A']"]
+                ),
+            ],
+            mock_run.mock_calls
+        )
+
+    def test_scope(self, mock_run):
+        mock_run.side_effect = self.run_command
+        resources = xml.dom.minidom.parseString(utils.get_cib("resources"))
+        self.assertEqual("resources", resources.documentElement.tagName)
+        self.assertEqual(
+            "crm_config",
+            xml.dom.minidom.parseString(
+                utils.get_cib("crm_config")
+            ).documentElement.tagName
+        )
+        mock_run.assert_called_once_with(["cibadmin", "-l", "-Q"])
+
+    def test_scope_indented_from_column_0(self, mock_run):
+        mock_run.side_effect = self.run_command
+        snapshot_lines = CIB_SNAPSHOT.splitlines()
+        # the elements as they are in the CIB moved to column 0
+        self.assertEqual(
+            "".join([line[4:] + "\n" for line in snapshot_lines[3:9]]),
+            utils.get_cib("resources")
+        )
+        self.assertEqual(
+            "".join([line[6:] + "\n" for line in snapshot_lines[5:8]]),
+            utils.get_cib_xpath("//group")
+        )
+        self.assertEqual(CIB_SNAPSHOT, utils.get_cib())
+
+    @mock.patch("pcs.utils.err")
+    def test_scope_missing(self, mock_err, mock_run):
+        mock_run.side_effect = self.run_command
+        mock_err.side_effect = SystemExit(1)
+        self.assertRaises(SystemExit, utils.get_cib, "constraints")
+        mock_err.assert_called_once_with(
+            "unable to get cib, scope 'constraints' not present in cib"
+        )
+
+    def test_cluster_state_read_once(self, mock_run):
+        mock_run.side_effect = self.run_command
+        self.assertEqual("<crm_mon/>", utils.getClusterStateXml())
+        self.assertEqual(
+            "crm_mon", utils.getClusterState().documentElement.tagName
+        )
+        mock_run.assert_called_once_with(
+            ["crm_mon", "--one-shot", "--as-xml", "--inactive"]
+        )
+
+    def test_invalidate(self, mock_run):
+        mock_run.side_effect = self.run_command
+        utils.get_cib()
+        utils.getClusterStateXml()
+        utils.invalidate_cib_snapshot()
+        utils.get_cib()
+        utils.getClusterStateXml()
+        self.assertEqual(4, mock_run.call_count)
+
+    def test_cib_file_changed(self, mock_run):
+        mock_run.side_effect = self.run_command
+        utils.get_cib()
+        with mock.patch("pcs.utils.usefile", True):
+            utils.get_cib()
+        self.assertEqual(2, mock_run.call_count)
+
+
+class IsReadOnlyCommand(TestCase):
+    def test_read_only(self):
+        for args in [
+            ["/usr/sbin/cibadmin", "-l", "-Q"],
+            ["cibadmin", "--query", "--xpath", "//primitive"],
+            ["/usr/sbin/crm_mon", "--one-shot", "--as-xml"],
+            ["crm_verify", "-L"],
+        ]:
+            with self.subTest(args=args):
+                self.assertTrue(utils._is_read_only_command(args))
+
+    def test_not_read_only(self):
+        for args in [
+            ["/usr/sbin/cibadmin", "--replace", "--xml-pipe"],
+            ["cibadmin", "-M", "--xml-text", "<nodes/>"],
+            ["crm_resource", "--wait"],
+            ["crm_attribute", "--name", "a", "--update", "b"],
+        ]:
+            with self.subTest(args=args):
+                self.assertFalse(utils._is_read_only_command(args))
@@ -1,11 +1,15 @@
+from lxml import etree
+
 from pcs.test.tools.command_env.mock_push_cib import Call as PushCibCall
 from pcs.test.tools.command_env.mock_push_corosync_conf import (
     Call as PushCorosyncConfCall,
 )
 from pcs.test.tools.fixture_cib import modify_cib
+from pcs.test.tools.xml import etree_to_str
 
 from pcs import settings
 from pcs.common.host import PcsKnownHost, Destination
+from pcs.lib.pacemaker.live import CIB_SECTIONS
 
 
 class EnvConfig(object):
@@ -103,7 +107,7 @@ class EnvConfig(object):
             here)
         """
         cib_xml = modify_cib(
-            self.__calls.get(load_key).stdout,
+            self.__get_loaded_cib(load_key),
             modifiers,
             **modifier_shortcuts
         )
@@ -113,6 +117,23 @@ class EnvConfig(object):
             instead=instead
         )
 
+    def __get_loaded_cib(self, load_key):
+        # A cib loaded by sections consists of the root element loaded by the
+        # call load_key and the sections loaded by the calls load_key.<section>
+        cib_xml = self.__calls.get(load_key).stdout
+        section_key_list = [
+            name for name in self.__calls.names
+            if name in [
+                "{0}.{1}".format(load_key, section) for section in CIB_SECTIONS
+            ]
+        ]
+        if not section_key_list:
+            return cib_xml
+        cib = etree.fromstring(cib_xml)
+        for section_key in section_key_list:
+            cib.append(etree.fromstring(self.__calls.get(section_key).stdout))
+        return etree_to_str(cib)
+
     def push_cib_custom(
         self, name="env.push_cib_custom", custom_cib=None, wait=False,
         exception=None, instead=None
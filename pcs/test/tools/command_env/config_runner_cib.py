@@ -1,9 +1,14 @@
+from lxml import etree
+
 from pcs.test.tools.command_env.mock_runner import(
     Call as RunnerCall,
     create_check_stdin_xml,
 )
 from pcs.test.tools.fixture_cib import modify_cib
 from pcs.test.tools.misc import get_test_resource as rc
+from pcs.test.tools.xml import etree_to_str
+
+from pcs.lib.pacemaker.live import CIB_SECTIONS
 
 
 CIB_FILENAME = "cib-empty.xml"
@@ -25,6 +30,7 @@ class CibShortcuts(object):
         before=None,
         returncode=0,
         stderr=None,
+        sections=None,
         **modifier_shortcuts
     ):
         """
@@ -35,6 +41,11 @@ class CibShortcuts(object):
             returns new etree.Element with desired modification.
         string filename -- points to file with cib in the content
         string before -- key of call before which this new call is to be placed
+        list sections -- only these top level sections of the cib are loaded,
+            the root element is loaded by the call 'name', the sections by
+            calls 'name.<section>' and the root element is loaded again to
+            check the version of the cib by the call 'name.version'. If all
+            the sections are requested, the whole cib is loaded by one call.
         dict modifier_shortcuts -- a new modifier is generated from each
             modifier shortcut.
             As key there can be keys of MODIFIER_GENERATORS.
@@ -64,10 +75,43 @@ class CibShortcuts(object):
                 modifiers,
                 **modifier_shortcuts
             )
+            if (
+                sections is not None
+                and
+                not set(CIB_SECTIONS).issubset(sections)
+            ):
+                self.__load_sections(name, cib, sections, before)
+                return
             call = RunnerCall(command, stdout=cib)
 
         self.__calls.place(name, call, before=before)
 
+    def __load_sections(self, name, cib, sections, before):
+        cib_root = etree.fromstring(cib)
+        section_list = [
+            (section, etree_to_str(cib_root.find(section)))
+            for section in sections
+        ]
+        for child in list(cib_root):
+            cib_root.remove(child)
+        root_call = RunnerCall(
+            "cibadmin --local --query --xpath=/cib --no-children",
+            stdout=etree_to_str(cib_root)
+        )
+        self.__calls.place(name, root_call, before=before)
+        for section, section_xml in section_list:
+            self.__calls.place(
+                "{0}.{1}".format(name, section),
+                RunnerCall(
+                    "cibadmin --local --query --scope={0}".format(section),
+                    stdout=section_xml
+                ),
+                before=before
+            )
+        self.__calls.place(
+            "{0}.version".format(name), root_call, before=before
+        )
+
     def load_content(
         self,
         cib,
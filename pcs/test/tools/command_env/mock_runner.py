@@ -63,6 +63,9 @@ def complete_command(command):
             return full_path + command[len(shortcut):]
     return command
 
+def _to_bytes(output):
+    return output.encode("utf-8") if isinstance(output, str) else output
+
 def bad_call(order_num, expected_command, entered_command):
     return (
         "As {0}. command expected\n    '{1}'\nbut was\n    '{2}'"
@@ -115,4 +118,10 @@ class Runner(object):
             )
 
         call.check_stdin(stdin_string, command, i)
+        if binary_output:
+            return (
+                _to_bytes(call.stdout),
+                _to_bytes(call.stderr),
+                call.returncode
+            )
         return  call.stdout, call.stderr, call.returncode
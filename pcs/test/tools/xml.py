@@ -1,3 +1,4 @@
+from copy import deepcopy
 import xml.dom.minidom
 from lxml import etree
 
@@ -43,3 +44,37 @@ class XmlManipulation(object):
 
 def get_xml_manipulation_creator_from_file(file_name):
     return lambda: XmlManipulation.from_file(file_name)
+
+def apply_patchset(cib, diff):
+    """
+    Apply a patchset the same way pacemaker applies patchsets of the format 2
+    """
+    for change in diff:
+        operation = change.get("operation")
+        target_list = cib.getroottree().xpath(change.get("path"))
+        if operation == "delete":
+            for target in target_list:
+                target.getparent().remove(target)
+            continue
+        if len(target_list) != 1:
+            raise AssertionError(
+                "Path '{0}' matches {1} elements".format(
+                    change.get("path"), len(target_list)
+                )
+            )
+        target = target_list[0]
+        if operation == "create":
+            target.insert(int(change.get("position")), deepcopy(change[0]))
+        elif operation == "modify":
+            for change_attr in change.find("change-list"):
+                if change_attr.get("operation") == "set":
+                    target.set(
+                        change_attr.get("name"), change_attr.get("value")
+                    )
+                else:
+                    del target.attrib[change_attr.get("name")]
+        else:
+            raise AssertionError(
+                "Unexpected operation '{0}'".format(operation)
+            )
+    return cib
@@ -343,6 +343,14 @@ Commands:
     agents [standard[:provider]]
         List available agents optionally filtered by standard and provider.
 
+    agent-cache clear|rebuild
+        Remove all resource and stonith agents' metadata and lists of agents
+        cached on the local node (clear), optionally cache metadata of all
+        agents installed on the local node (rebuild). Cached metadata of an
+        agent are refreshed automatically when the agent or pacemaker is
+        updated, lists of agents are refreshed when agents are installed or
+        removed.
+
     update <resource id> [resource options] [op [<operation action>
            <operation options>]...] [meta <meta operations>...] [--wait[=n]]
         Add/Change options to specified resource, clone or multi-state
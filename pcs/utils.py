@@ -7,16 +7,18 @@ import xml.etree.ElementTree as ET
 import re
 import json
 import tempfile
-import signal
 import time
 from io import BytesIO
 import tarfile
 import getpass
 import base64
+from copy import deepcopy
 import threading
 import logging
 from functools import lru_cache
 
+from lxml import etree
+
 from pcs import settings, usage
 
 from pcs.common import (
@@ -41,6 +43,7 @@ from pcs.cli.common.reports import (
 import pcs.cli.booth.env
 
 from pcs.lib import reports, sbd
+from pcs.lib.resource_agent import get_metadata_cache
 from pcs.lib.env import LibraryEnvironment
 from pcs.lib.errors import LibraryError
 from pcs.lib.external import (
@@ -53,6 +56,7 @@ from pcs.lib.external import (
     is_service_enabled,
     is_service_running,
     is_systemctl,
+    iter_parallel_run,
     _service,
     _systemctl,
 )
@@ -75,6 +79,17 @@ usefile = False
 filename = ""
 pcs_options = {}
 
+# Snapshots of the CIB and the cluster status taken during a run of pcs. They
+# are dropped once pcs runs a command which may change the CIB.
+_cib_snapshot = None
+_cib_snapshot_tree = None
+_cluster_state_snapshot = None
+# CIB file the snapshots come from, None stands for the live cluster
+_snapshot_source = None
+
+# Commands which never change the CIB or the cluster status
+_READ_ONLY_COMMANDS = frozenset(["crm_mon", "crm_verify", "iso8601"])
+
 
 class UnknownPropertyException(Exception):
     pass
@@ -702,10 +717,6 @@ def parse_multiring_node(node):
             % node
         )
 
-# Restore default behavior before starting subprocesses
-def subprocess_setup():
-    signal.signal(signal.SIGPIPE, signal.SIG_DFL)
-
 def touch_cib_file(filename):
     if not os.path.isfile(filename):
         try:
@@ -726,13 +737,11 @@ def run(
       * -f - CIB file (effective only for some pacemaker tools)
       * --debug
     """
-    if not env_extend:
-        env_extend = dict()
-    env_var = env_extend
-    env_var.update(dict(os.environ))
-    env_var["LC_ALL"] = "C"
+    env_var = _get_run_env(filename if usefile else None)
+    if env_extend:
+        # variables from the environment take precedence
+        env_var = dict(env_extend, **env_var)
     if usefile:
-        env_var["CIB_file"] = filename
         touch_cib_file(filename)
 
     command = args[0]
@@ -761,7 +770,9 @@ def run(
             stdin=stdin_pipe,
             stdout=subprocess.PIPE,
             stderr=(subprocess.PIPE if ignore_stderr else subprocess.STDOUT),
-            preexec_fn=subprocess_setup,
+            # restores the default SIGPIPE action without running python code
+            # in the child process, see pcs.app.main
+            restore_signals=True,
             close_fds=True,
             env=env_var,
             # decodes newlines and in python3 also converts bytes to str
@@ -777,9 +788,30 @@ def run(
     except OSError as e:
         print(e.strerror)
         err("unable to locate command: " + args[0])
+    finally:
+        if not _is_read_only_command(args):
+            invalidate_cib_snapshot()
 
     return output, returnVal
 
+@lru_cache()
+def _get_run_env(cib_file):
+    # The environment is built once and shared by all runs, Popen does not
+    # modify it.
+    env_var = dict(os.environ)
+    env_var["LC_ALL"] = "C"
+    if cib_file:
+        env_var["CIB_file"] = cib_file
+    return env_var
+
+class _SnapshotInvalidatingCommandRunner(CommandRunner):
+    def run(self, args, *other_args, **kwargs):
+        try:
+            return super().run(args, *other_args, **kwargs)
+        finally:
+            if not _is_read_only_command(args):
+                invalidate_cib_snapshot()
+
 @lru_cache()
 def cmd_runner():
     """
@@ -791,12 +823,30 @@ def cmd_runner():
         env_vars["CIB_file"] = filename
     env_vars.update(os.environ)
     env_vars["LC_ALL"] = "C"
-    return CommandRunner(
+    return _SnapshotInvalidatingCommandRunner(
         logging.getLogger("pcs"),
         get_report_processor(),
         env_vars
     )
 
+def invalidate_cib_snapshot():
+    """
+    Drop the CIB and the cluster status read so far, they are read again when
+    they are needed next time
+
+    Commandline options: no options
+    """
+    global _cib_snapshot, _cib_snapshot_tree, _cluster_state_snapshot
+    _cib_snapshot = None
+    _cib_snapshot_tree = None
+    _cluster_state_snapshot = None
+
+def _is_read_only_command(args):
+    command = os.path.basename(args[0]) if args else ""
+    if command in _READ_ONLY_COMMANDS:
+        return True
+    return command == "cibadmin" and ("-Q" in args or "--query" in args)
+
 def run_pcsdcli(command, data=None):
     """
     Commandline options:
@@ -1040,6 +1090,9 @@ def does_exist(xpath_query):
     Commandline options:
       * -f - CIB file
     """
+    element_list = _query_cib_snapshot(xpath_query)
+    if element_list is not None:
+        return len(element_list) > 0
     args = ["cibadmin", "-Q", "--xpath", xpath_query]
     dummy_output,retval = run(args)
     if (retval != 0):
@@ -1514,6 +1567,16 @@ def get_cib_xpath(xpath_query):
     Commandline options:
       * -f - CIB file
     """
+    element_list = _query_cib_snapshot(xpath_query)
+    if element_list is not None:
+        if not element_list:
+            return ""
+        if len(element_list) == 1:
+            return _element_to_str(element_list[0])
+        # cibadmin wraps multiple matches the same way
+        return "<xpath-query>\n{0}</xpath-query>\n".format(
+            "".join([_element_to_str(element) for element in element_list])
+        )
     args = ["cibadmin", "-Q", "--xpath", xpath_query]
     output,retval = run(args)
     if (retval != 0):
@@ -1525,16 +1588,97 @@ def get_cib(scope=None):
     Commandline options:
       * -f - CIB file
     """
-    command = ["cibadmin", "-l", "-Q"]
-    if scope:
-        command.append("--scope=%s" % scope)
-    output, retval = run(command)
-    if retval != 0:
-        if retval == 105 and scope:
-            err("unable to get cib, scope '%s' not present in cib" % scope)
-        else:
+    if scope and scope not in _CIB_SCOPE_PATHS:
+        # let cibadmin report an unknown scope
+        command = ["cibadmin", "-l", "-Q", "--scope=%s" % scope]
+        output, retval = run(command)
+        if retval != 0:
             err("unable to get cib")
-    return output
+        return output
+    cib = _get_cib_snapshot()
+    if cib is None:
+        err("unable to get cib")
+    if not scope:
+        return cib
+    section = _get_cib_snapshot_tree().find(_CIB_SCOPE_PATHS[scope])
+    if section is None:
+        err("unable to get cib, scope '%s' not present in cib" % scope)
+    return _element_to_str(section)
+
+# paths of cibadmin scopes relative to the cib element
+_CIB_SCOPE_PATHS = {
+    "configuration": "configuration",
+    "status": "status",
+    "nodes": "configuration/nodes",
+    "resources": "configuration/resources",
+    "constraints": "configuration/constraints",
+    "crm_config": "configuration/crm_config",
+    "rsc_defaults": "configuration/rsc_defaults",
+    "op_defaults": "configuration/op_defaults",
+    "acls": "configuration/acls",
+    "fencing-topology": "configuration/fencing-topology",
+    "tags": "configuration/tags",
+    "alerts": "configuration/alerts",
+}
+
+def _get_cib_snapshot():
+    """
+    Return the CIB read during this run of pcs or None if it cannot be read
+    """
+    global _cib_snapshot, _snapshot_source
+    if _snapshot_source != _get_cib_source():
+        invalidate_cib_snapshot()
+    if _cib_snapshot is None:
+        output, retval = run(["cibadmin", "-l", "-Q"])
+        if retval != 0:
+            return None
+        _cib_snapshot = output
+        _snapshot_source = _get_cib_source()
+    return _cib_snapshot
+
+def _get_cib_snapshot_tree():
+    global _cib_snapshot_tree
+    if _cib_snapshot_tree is None:
+        _cib_snapshot_tree = etree.fromstring(
+            _get_cib_snapshot().encode("utf-8")
+        )
+    return _cib_snapshot_tree
+
+def _get_cib_source():
+    return filename if usefile else None
+
+def _query_cib_snapshot(xpath_query):
+    """
+    Return a list of elements matching the query or None if the query cannot
+    be answered from the CIB snapshot
+    """
+    if _get_cib_snapshot() is None:
+        return None
+    try:
+        result = _get_cib_snapshot_tree().xpath(xpath_query)
+    except (etree.XMLSyntaxError, etree.XPathError, ValueError):
+        return None
+    if not isinstance(result, list) or not all(
+        [etree.iselement(item) for item in result]
+    ):
+        return None
+    return result
+
+def _element_to_str(element):
+    """
+    Serialize an element cut from the CIB the way cibadmin outputs it
+    """
+    # The element keeps the indentation it has in the whole CIB. Drop it and
+    # let lxml indent the element from column 0 as cibadmin does.
+    element = deepcopy(element)
+    for el in element.iter():
+        if len(el) and el.text is not None and not el.text.strip():
+            el.text = None
+        if el.tail is not None and not el.tail.strip():
+            el.tail = None
+    return etree.tostring(
+        element, encoding="unicode", with_tail=False, pretty_print=True
+    )
 
 def get_cib_dom():
     """
@@ -1850,10 +1994,18 @@ def getClusterStateXml():
     Commandline options:
       * -f - CIB file
     """
-    xml, returncode = run(["crm_mon", "--one-shot", "--as-xml", "--inactive"])
-    if returncode != 0:
-        err("error running crm_mon, is pacemaker running?")
-    return xml
+    global _cluster_state_snapshot, _snapshot_source
+    if _snapshot_source != _get_cib_source():
+        invalidate_cib_snapshot()
+    if _cluster_state_snapshot is None:
+        xml, returncode = run(
+            ["crm_mon", "--one-shot", "--as-xml", "--inactive"]
+        )
+        if returncode != 0:
+            err("error running crm_mon, is pacemaker running?")
+        _cluster_state_snapshot = xml
+        _snapshot_source = _get_cib_source()
+    return _cluster_state_snapshot
 
 def getClusterName():
     """
@@ -2427,9 +2579,17 @@ def get_cluster_properties_definition():
         }
     ]
     definition = {}
-    for source in sources:
-        stdout, stderr, retval = cmd_runner().run([source["path"], "metadata"])
-        if retval != 0:
+    runner = cmd_runner()
+    metadata_list = iter_parallel_run(
+        runner,
+        lambda worker_runner, source: _load_daemon_metadata(
+            worker_runner, source["name"], source["path"]
+        ),
+        sources,
+        len(sources)
+    )
+    for source, (stdout, stderr) in zip(sources, metadata_list):
+        if stdout is None:
             err("unable to run {0}\n{1}".format(source["name"], stderr))
         try:
             etree = ET.fromstring(stdout)
@@ -2456,6 +2616,34 @@ def get_cluster_properties_definition():
     return definition
 
 
+class _DaemonMetadataError(Exception):
+    pass
+
+
+def _load_daemon_metadata(runner, name, path):
+    """
+    Return a tuple (metadata, stderr) of a pacemaker daemon, metadata is None
+    if they cannot be obtained. The metadata are cached on disk along with
+    agents' metadata until the daemon is updated.
+
+    CommandRunner runner
+    string name -- name of the daemon
+    string path -- path to the daemon's executable
+    """
+    def loader():
+        stdout, stderr, retval = runner.run([path, "metadata"])
+        if retval != 0:
+            raise _DaemonMetadataError(stderr)
+        return stdout
+    cache = get_metadata_cache()
+    try:
+        if cache is None:
+            return loader(), None
+        return cache.load(name, [path], loader), None
+    except _DaemonMetadataError as e:
+        return None, e.args[0]
+
+
 def get_cluster_property_from_xml(etree_el):
     """
     Commandline options: no options
@@ -2498,6 +2686,7 @@ def get_lib_env():
       * -f - CIB file
       * --corosync_conf - corosync.conf file
       * --request-timeout - timeout of HTTP requests
+      * --debug - capture debug info of HTTP requests
     """
     user = None
     groups = None
@@ -2531,6 +2720,7 @@ def get_lib_env():
         corosync_conf_data,
         known_hosts_getter=read_known_hosts_file,
         request_timeout=pcs_options.get("--request-timeout"),
+        debug=("--debug" in pcs_options),
     )
 
 def get_cli_env():
@@ -2568,7 +2758,9 @@ def get_middleware_factory():
       * -f
     """
     return middleware.create_middleware_factory(
-        cib=middleware.cib(filename if usefile else None, touch_cib_file),
+        cib=_invalidating_cib_snapshot(
+            middleware.cib(filename if usefile else None, touch_cib_file)
+        ),
         corosync_conf_existing=middleware.corosync_conf_existing(
             pcs_options.get("--corosync_conf", None)
         ),
@@ -2579,6 +2771,15 @@ def get_middleware_factory():
         ),
     )
 
+def _invalidating_cib_snapshot(cib_middleware):
+    # library commands do not use the CIB snapshot, they may change the CIB
+    def apply(next_in_line, env, *args, **kwargs):
+        try:
+            return cib_middleware(next_in_line, env, *args, **kwargs)
+        finally:
+            invalidate_cib_snapshot()
+    return apply
+
 def get_library_wrapper():
     """
     Commandline options:
@@ -0,0 +1,83 @@
+require 'rexml/document'
+require 'thread'
+
+# Cache of CIBs loaded by a pcsd worker, so read-only requests do not need to
+# load and parse the whole CIB each time.
+#
+# An entry is valid as long as the CIB in the cluster has the same version
+# (admin_epoch, epoch, num_updates) as the cached one. The version is checked
+# by loading the cib element without its children, which is much cheaper than
+# loading the whole CIB. CIBs are cached per CIB user and groups, as ACLs may
+# allow users to see different parts of the CIB.
+module CibCache
+
+  VERSION_ATTRIBUTES = ['admin_epoch', 'epoch', 'num_updates']
+  MAX_ENTRIES = 16
+
+  class Entry
+    attr_reader :version, :lines
+
+    def initialize(version, lines)
+      @version = version
+      @lines = lines.freeze
+      @dom = nil
+      @lock = Mutex.new
+    end
+
+    # The document is parsed on the first access and shared by all requests
+    # afterwards, so it must not be modified.
+    def dom()
+      @lock.synchronize {
+        @dom ||= REXML::Document.new(@lines.join(''))
+      }
+      return @dom
+    end
+  end
+
+  @entries = {}
+  @lock = Mutex.new
+
+  # Return the version of a CIB as an array of admin_epoch, epoch and
+  # num_updates or nil if it cannot be determined. Only the cib element is
+  # parsed, the rest of the CIB is not needed.
+  def self.get_version(cib_text)
+    match = /<cib(\s[^>]*)?>/.match(cib_text)
+    return nil if not match
+    root = REXML::Document.new(match[0].sub(/\/?>\z/, '/>')).root
+    version = VERSION_ATTRIBUTES.map { |name| root.attributes[name] }
+    return version.include?(nil) ? nil : version
+  rescue REXML::ParseException
+    return nil
+  end
+
+  # Return a cached entry or nil if there is no entry of the specified version
+  def self.get(key, version)
+    return nil if not version
+    @lock.synchronize {
+      entry = @entries.delete(key)
+      return nil if not entry
+      # keep the most recently used entries at the end
+      @entries[key] = entry
+      return entry.version == version ? entry : nil
+    }
+  end
+
+  # Create an entry from the output of 'cibadmin --query' and cache it if the
+  # version of the CIB can be determined. Return the entry.
+  def self.put(key, lines)
+    entry = Entry.new(self.get_version(lines.join('')), lines)
+    return entry if not entry.version
+    @lock.synchronize {
+      @entries.delete(key)
+      @entries[key] = entry
+      @entries.delete(@entries.keys.first) while @entries.length > MAX_ENTRIES
+    }
+    return entry
+  end
+
+  def self.clear()
+    @lock.synchronize {
+      @entries.clear()
+    }
+  end
+end
@@ -15,6 +15,7 @@ require 'ethon'
 
 require 'config.rb'
 require 'cfgsync.rb'
+require 'cib_cache.rb'
 require 'corosyncconf.rb'
 require 'resource.rb'
 require 'cluster_entity.rb'
@@ -1694,11 +1695,30 @@ def get_crm_mon_dom(auth_user)
   return nil
 end
 
+# Return [CibCache::Entry, stderr, retval], the entry is nil if the CIB cannot
+# be loaded. The CIB is loaded only if it has changed since it was cached.
+def get_cib_cached(auth_user)
+  key = [auth_user[:username], auth_user[:usergroups] || []]
+  stdout, _, retval = run_cmd(
+    auth_user, CIBADMIN, '-Q', '-l', '--xpath=/cib', '--no-children'
+  )
+  if retval == 0
+    entry = CibCache.get(key, CibCache.get_version(stdout.join('')))
+    return entry, [], 0 if entry
+  end
+  stdout, stderr, retval = run_cmd(auth_user, CIBADMIN, '-Q', '-l')
+  if retval != 0
+    return nil, stdout + stderr, retval
+  end
+  return CibCache.put(key, stdout), [], 0
+end
+
+# The returned document is shared by requests, it must not be modified.
 def get_cib_dom(auth_user)
   begin
-    stdout, _, retval = run_cmd(auth_user, CIBADMIN, '-Q', '-l')
-    if retval == 0
-      return REXML::Document.new(stdout.join("\n"))
+    entry, _, _ = get_cib_cached(auth_user)
+    if entry
+      return entry.dom
     end
   rescue
     $logger.error 'Failed to parse cib.'
@@ -433,14 +433,14 @@ def get_cib(params, request, auth_user)
   if not allowed_for_local_cluster(auth_user, Permissions::READ)
     return 403, 'Permission denied'
   end
-  cib, stderr, retval = run_cmd(auth_user, CIBADMIN, "-Ql")
+  cib, stderr, retval = get_cib_cached(auth_user)
   if retval != 0
     if not pacemaker_running?
       return [400, '{"pacemaker_not_running":true}']
     end
-    return [500, "Unable to get CIB: " + cib.to_s + stderr.to_s]
+    return [500, "Unable to get CIB: " + stderr.to_s]
   else
-    return [200, cib]
+    return [200, cib.lines]
   end
 end
 
@@ -60,13 +60,11 @@ def getResourcesGroups(auth_user, get_fence_devices = false, get_all_options = f
   resource_list = resource_list.sort_by{|a| (a.group ? "1" : "0").to_s + a.group.to_s + "-" +  a.id}
 
   if get_all_options or get_operations
-    stdout, stderror, retval = run_cmd(auth_user, CIBADMIN, "-Q", "-l")
-    cib_output = stdout
     resources_inst_attr_map = {}
     resources_meta_attr_map = {}
     resources_operation_map = {}
-    begin
-      doc = REXML::Document.new(cib_output.join("\n"))
+    doc = get_cib_dom(auth_user)
+    if doc
       if get_all_options
         doc.elements.each('//primitive') do |r|
           resources_inst_attr_map[r.attributes["id"]] = {}
@@ -109,8 +107,6 @@ def getResourcesGroups(auth_user, get_fence_devices = false, get_all_options = f
           end
         }
       end
-    rescue REXML::ParseException
-      $logger.info("ERROR: Parse Exception parsing cibadmin -Q")
     end
   end
 
@@ -2,62 +2,105 @@ require "base64"
 require "date"
 require "json"
 
-request_json = ARGF.read()
+# In the worker mode, the wrapper is started once by the python part of pcsd
+# and then serves many requests. Each request is one line containing a json
+# object on stdin, each response is one line containing a json object on
+# stdout.
+worker_mode = ARGV.include?("--worker")
 
-begin
-  request = JSON.parse(request_json)
-rescue => e
-  puts e
-  exit
+def parse_request(request_json)
+  begin
+    request = JSON.parse(request_json)
+  rescue => e
+    return nil, {:error => "Cannot parse request: #{e}", :logs => []}
+  end
+  if !request.include?("type")
+    return nil, {:error => "Type not specified", :logs => []}
+  end
+  return request, nil
 end
 
-if !request.include?("type")
-  result = {:error => "Type not specified"}
-  print result.to_json
-  exit
-end
+def process_request(request)
+  $tornado_logs = []
+  $tornado_username = nil
+  $tornado_groups = nil
+  $tornado_is_authenticated = nil
 
-$tornado_logs = []
+  if ["sinatra_gui", "sinatra_remote"].include?(request["type"])
+    if request["type"] == "sinatra_gui"
+      $tornado_username = request["session"]["username"]
+      $tornado_groups = request["session"]["groups"]
+      $tornado_is_authenticated = request["session"]["is_authenticated"]
+    end
 
-require 'pcsd'
+    app = [Sinatra::Application][0]
+
+    env = request["env"]
+    env["rack.input"] = StringIO.new(env["rack.input"])
+    env["rack.errors"] = StringIO.new()
+
+    status, headers, body = app.call(env)
+    rack_errors = env['rack.errors'].string()
+    if not rack_errors.empty?()
+      $logger.error(rack_errors)
+    end
 
-if ["sinatra_gui", "sinatra_remote"].include?(request["type"])
-  if request["type"] == "sinatra_gui"
-    $tornado_username = request["session"]["username"]
-    $tornado_groups = request["session"]["groups"]
-    $tornado_is_authenticated = request["session"]["is_authenticated"]
+    result = {
+      :status => status,
+      :headers => headers,
+      :body => Base64.encode64(body.join("")),
+    }
+
+  elsif request["type"] == "sync_configs"
+    result = {
+      :next => Time.now.to_i + run_cfgsync()
+    }
+  elsif request["type"] == "ping"
+    result = {:pong => true}
+  else
+    result = {:error => "Unknown type: '#{request["type"]}'"}
   end
 
-  set :logging, true
-  set :run, false
-  # Do not turn exceptions into fancy 100kB HTML pages and print them on stdout.
-  # Instead, rack.errors is logged and therefore returned in result[:log].
-  set :show_exceptions, false
-  app = [Sinatra::Application][0]
-
-  env = request["env"]
-  env["rack.input"] = StringIO.new(env["rack.input"])
-  env["rack.errors"] = StringIO.new()
-
-  status, headers, body = app.call(env)
-  rack_errors = env['rack.errors'].string()
-  if not rack_errors.empty?()
-    $logger.error(rack_errors)
+  result[:logs] = $tornado_logs
+  return result
+end
+
+$tornado_logs = []
+
+if !worker_mode
+  request, error = parse_request(ARGF.read())
+  if error
+    print error.to_json
+    exit
   end
+end
+
+require 'pcsd'
 
-  result = {
-    :status => status,
-    :headers => headers,
-    :body => Base64.encode64(body.join("")),
-  }
-
-elsif request["type"] == "sync_configs"
-  result = {
-    :next => Time.now.to_i + run_cfgsync()
-  }
-else
-  result = {:error => "Unknown type: '#{request["type"]}'"}
+set :logging, true
+set :run, false
+# Do not turn exceptions into fancy 100kB HTML pages and print them on stdout.
+# Instead, rack.errors is logged and therefore returned in result[:log].
+set :show_exceptions, false
+
+if !worker_mode
+  print process_request(request).to_json
+  exit
 end
 
-result[:logs] = $tornado_logs
-print result.to_json
+# Responses are the only thing allowed on stdout in the worker mode. Anything
+# else printed by the handlers would break the framing, so it goes to stderr.
+response_stream = $stdout.dup
+response_stream.sync = true
+$stdout.reopen($stderr)
+
+while (request_json = $stdin.gets)
+  next if request_json.strip().empty?()
+  request, error = parse_request(request_json)
+  begin
+    result = error ? error : process_request(request)
+  rescue => e
+    result = {:error => "#{e.class}: #{e}", :logs => $tornado_logs}
+  end
+  response_stream.write(result.to_json + "\n")
+end
@@ -9,3 +9,4 @@ require 'test_permissions.rb'
 require 'test_config.rb'
 require 'test_cfgsync.rb'
 require 'test_pcs.rb'
+require 'test_cib_cache.rb'
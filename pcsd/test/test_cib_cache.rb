@@ -0,0 +1,99 @@
+require 'test/unit'
+
+require 'cib_cache.rb'
+
+def cib_lines(epoch, num_updates, resource='R1')
+  return [
+    "<cib admin_epoch=\"0\" epoch=\"#{epoch}\" num_updates=\"#{num_updates}\"" +
+      " validate-with=\"pacemaker-2.0\">\n",
+    "  <configuration>\n",
+    "    <resources><primitive id=\"#{resource}\"/></resources>\n",
+    "  </configuration>\n",
+    "</cib>\n",
+  ]
+end
+
+class TestCibCacheGetVersion < Test::Unit::TestCase
+  def test_full_cib
+    assert_equal(
+      ['0', '5', '12'], CibCache.get_version(cib_lines(5, 12).join(''))
+    )
+  end
+
+  def test_cib_element_only
+    cib = '<?xml version="1.0"?>
+<cib num_updates="3" epoch="2" admin_epoch="1" crm_feature_set="3.0.14"/>'
+    assert_equal(['1', '2', '3'], CibCache.get_version(cib))
+  end
+
+  def test_missing_attribute
+    assert_nil(CibCache.get_version('<cib epoch="2" num_updates="3"/>'))
+  end
+
+  def test_not_cib
+    assert_nil(CibCache.get_version('<cibx epoch="2"/>'))
+    assert_nil(CibCache.get_version(''))
+  end
+end
+
+class TestCibCache < Test::Unit::TestCase
+  def setup
+    CibCache.clear()
+  end
+
+  def test_not_cached
+    assert_nil(CibCache.get(['user', []], ['0', '1', '1']))
+  end
+
+  def test_cached
+    key = ['user', ['group']]
+    entry = CibCache.put(key, cib_lines(1, 2))
+    assert_equal(['0', '1', '2'], entry.version)
+    assert_same(entry, CibCache.get(key, ['0', '1', '2']))
+    assert_nil(CibCache.get(key, ['0', '1', '3']))
+    assert_nil(CibCache.get(key, nil))
+  end
+
+  def test_cached_per_key
+    entry1 = CibCache.put(['user1', []], cib_lines(1, 2, 'R1'))
+    entry2 = CibCache.put(['user2', []], cib_lines(1, 2, 'R2'))
+    assert_same(entry1, CibCache.get(['user1', []], ['0', '1', '2']))
+    assert_same(entry2, CibCache.get(['user2', []], ['0', '1', '2']))
+    assert_nil(CibCache.get(['user1', ['group']], ['0', '1', '2']))
+  end
+
+  def test_replaced
+    key = ['user', []]
+    CibCache.put(key, cib_lines(1, 2, 'R1'))
+    entry = CibCache.put(key, cib_lines(1, 3, 'R2'))
+    assert_nil(CibCache.get(key, ['0', '1', '2']))
+    assert_same(entry, CibCache.get(key, ['0', '1', '3']))
+  end
+
+  def test_no_version_not_cached
+    key = ['user', []]
+    entry = CibCache.put(key, ['<cib epoch="1">', '</cib>'])
+    assert_nil(entry.version)
+    assert_equal('cib', entry.dom.root.name)
+    assert_nil(CibCache.get(key, nil))
+  end
+
+  def test_least_recently_used_removed
+    (0..CibCache::MAX_ENTRIES).each { |i|
+      CibCache.put(["user#{i}", []], cib_lines(1, 2))
+      # keep the first entry used
+      assert_not_nil(CibCache.get(['user0', []], ['0', '1', '2']))
+    }
+    assert_not_nil(CibCache.get(['user0', []], ['0', '1', '2']))
+    assert_nil(CibCache.get(['user1', []], ['0', '1', '2']))
+    assert_not_nil(CibCache.get(['user2', []], ['0', '1', '2']))
+  end
+
+  def test_dom_shared
+    entry = CibCache.put(['user', []], cib_lines(1, 2))
+    dom = entry.dom
+    assert_same(dom, entry.dom)
+    primitive = dom.elements['/cib/configuration/resources/primitive']
+    assert_equal('R1', primitive.attributes['id'])
+  end
+end
@@ -35,7 +35,7 @@ setup(
     zip_safe=False,
     entry_points={
         'console_scripts': [
-            'pcs = pcs.app:main',
+            'pcs = pcs.entry_point:main',
             'pcsd = pcs.run:daemon',
             'pcs_snmp_agent = pcs.run:pcs_snmp_agent',
         ],